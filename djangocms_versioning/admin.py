@@ -20,8 +20,7 @@ from django.contrib.admin.options import IncorrectLookupParameters
 from django.contrib.admin.utils import unquote
 from django.contrib.admin.views.main import ChangeList
 from django.contrib.auth import get_permission_codename
-from django.contrib.contenttypes.models import ContentType
-from django.core.exceptions import ImproperlyConfigured, ObjectDoesNotExist, PermissionDenied
+from django.core.exceptions import ImproperlyConfigured, ObjectDoesNotExist, PermissionDenied, ValidationError
 from django.db import IntegrityError, models
 from django.db.models import OuterRef, Prefetch, Subquery, Value
 from django.db.models.functions import Cast, Lower
@@ -29,8 +28,10 @@ from django.forms import MediaDefiningClass
 from django.http import (
     Http404,
     HttpRequest,
+    HttpResponseBadRequest,
     HttpResponseForbidden,
     HttpResponseNotAllowed,
+    JsonResponse,
 )
 from django.shortcuts import redirect
 from django.template.loader import render_to_string, select_template
@@ -50,6 +51,7 @@ from .helpers import (
     content_is_unlocked_for_user,
     create_version_lock,
     get_admin_url,
+    get_content_type_id,
     get_current_site,
     get_editable_url,
     get_latest_admin_viewable_content,
@@ -59,11 +61,12 @@ from .helpers import (
     get_version_for_content,
     proxy_model,
     remove_version_lock,
+    renew_version_lock,
     version_is_locked,
     version_list_url,
 )
 from .indicators import content_indicator, content_indicator_menu
-from .models import Version
+from .models import Version, VersionSummary
 from .versionables import _cms_extension
 
 logger = logging.getLogger(__name__)
@@ -188,10 +191,13 @@ class StateIndicatorMixin(metaclass=MediaDefiningClass):
         def indicator(obj):
             versions = None
             if self._extra_grouping_fields is not None:  # Grouper Model
+                grouping_values = {}
+                for field in self._extra_grouping_fields:
+                    value = getattr(self, field, None)
+                    # Only look up the field's value if the admin does not provide it
+                    grouping_values[field] = self.get_extra_grouping_field(field) if value is None else value
                 content_obj = get_latest_admin_viewable_content(
-                    obj,
-                    include_unpublished_archived=True,
-                    **{field: getattr(self, field) for field in self._extra_grouping_fields},
+                    obj, include_unpublished_archived=True, **grouping_values
                 )
                 if hasattr(obj, "_prefetched_contents"):
                     versions = []
@@ -327,17 +333,28 @@ class ExtendedGrouperVersionAdminMixin(ExtendedListDisplayMixin):
 
     def get_queryset(self, request: HttpRequest) -> models.QuerySet:
         """Annotates the username of the ``created_by`` field, the ``modified`` field (date time),
-        and the ``state`` field of the version object to the grouper queryset."""
-        grouper_content_type = versionables.for_grouper(self.model).content_types
+        and the ``state`` field of the version object to the grouper queryset. They are read
+        from the version summaries if ``DJANGOCMS_VERSIONING_VERSION_SUMMARY`` is set."""
+        versionable = versionables.for_grouper(self.model)
         qs = super().get_queryset(request)
-        versions = Version.objects.filter(object_id=OuterRef("pk"), content_type__in=grouper_content_type)
-        contents = self.content_model.admin_manager.latest_content(
-            **{self.grouper_field_name: OuterRef("pk"), **self.current_content_filters}
-        ).annotate(
-            content_created_by=Subquery(versions.values(f"created_by__{conf.USERNAME_FIELD}")[:1]),
-            content_state=Subquery(versions.values("state")),
-            content_modified=Subquery(versions.values("modified")[:1]),
-        )
+        if conf.VERSION_SUMMARY:
+            # Read the materialized summary using its unique index
+            contents = VersionSummary.objects.for_grouping_values(
+                versionable, **{self.grouper_field_name: OuterRef("pk"), **self.current_content_filters}
+            ).annotate(
+                content_created_by=models.F(f"created_by__{conf.USERNAME_FIELD}"),
+                content_state=models.F("state"),
+                content_modified=models.F("modified"),
+            )
+        else:
+            versions = Version.objects.filter(object_id=OuterRef("pk"), content_type__in=versionable.content_types)
+            contents = self.content_model.admin_manager.latest_content(
+                **{self.grouper_field_name: OuterRef("pk"), **self.current_content_filters}
+            ).annotate(
+                content_created_by=Subquery(versions.values(f"created_by__{conf.USERNAME_FIELD}")[:1]),
+                content_state=Subquery(versions.values("state")),
+                content_modified=Subquery(versions.values("modified")[:1]),
+            )
         qs = qs.annotate(
             content_created_by=Subquery(contents.values("content_created_by")[:1]),
             content_created_by_sort=Lower(Subquery(contents.values("content_created_by")[:1])),
@@ -508,10 +525,10 @@ class ExtendedVersionAdminMixin(
 
     def get_queryset(self, request):
         queryset = super().get_queryset(request)
-        # Due to django admin ordering using unicode, to alphabetically order regardless of case, we must
-        # annotate the queryset, with the usernames all lower case, and then order based on that!
-
-        queryset = queryset.annotate(created_by_username_ordering=Lower(f"versions__created_by__{conf.USERNAME_FIELD}"))
+        # Due to django admin ordering using unicode, to alphabetically order regardless of case, we
+        # order by the lower-cased user name stored (and indexed) on the version. An alias only joins
+        # the versions if the changelist is actually sorted by author.
+        queryset = queryset.alias(created_by_username_ordering=models.F("versions__author_sort_key"))
         # Prefetch versions (including author, locked_by) to avoid N+1 queries in list display,
         # e.g. get_author() accesses version.created_by for every row.
         queryset = queryset.prefetch_related(
@@ -692,6 +709,17 @@ class ExtendedIndicatorVersionAdminMixin(StateIndicatorMixin, ExtendedVersionAdm
 
 
 class VersionChangeList(ChangeList):
+    #: Query parameters of the keyset pagination: the pk of the last version of
+    #: the previous page (older versions) or of the first version of the next page
+    KEYSET_BEFORE_VAR = "before"
+    KEYSET_AFTER_VAR = "after"
+    #: With keyset pagination, versions are only counted up to this number
+    approximate_count_limit = 1000
+
+    @property
+    def keyset_pagination(self) -> bool:
+        return conf.KEYSET_PAGINATION
+
     def get_filters_params(self, params=None):
         """Removes the grouper param from the filters as the main grouper
         filtering is not handled by the UI filters and therefore needs to be
@@ -701,8 +729,80 @@ class VersionChangeList(ChangeList):
         versionable = versionables.for_content(content_model)
         filter_params = super().get_filters_params(params)
         filter_params.pop(versionable.grouper_field_name, None)
+        filter_params.pop(self.KEYSET_BEFORE_VAR, None)
+        filter_params.pop(self.KEYSET_AFTER_VAR, None)
         return filter_params
 
+    def get_ordering(self, request, queryset):
+        if self.keyset_pagination:
+            return ["-pk"]
+        return super().get_ordering(request, queryset)
+
+    def _get_cursor(self, request, name):
+        value = request.GET.get(name)
+        try:
+            return self.model._meta.pk.to_python(value) if value else None
+        except ValidationError as err:
+            raise IncorrectLookupParameters(err) from err
+
+    def get_results(self, request):
+        """With keyset pagination, fetches the versions of the requested page by
+        their pk (without an offset) and only counts them up to
+        ``approximate_count_limit``."""
+        if not self.keyset_pagination:
+            return super().get_results(request)
+        before = self._get_cursor(request, self.KEYSET_BEFORE_VAR)
+        after = self._get_cursor(request, self.KEYSET_AFTER_VAR)
+        page_size = self.list_per_page
+        if after is not None:
+            result_list = list(self.queryset.filter(pk__gt=after).order_by("pk")[:page_size + 1])
+            self.has_newer, self.has_older = len(result_list) > page_size, True
+            result_list = result_list[:page_size][::-1]
+        else:
+            queryset = self.queryset if before is None else self.queryset.filter(pk__lt=before)
+            result_list = list(queryset.order_by("-pk")[:page_size + 1])
+            self.has_newer, self.has_older = before is not None, len(result_list) > page_size
+            result_list = result_list[:page_size]
+
+        count = self.queryset.order_by()[:self.approximate_count_limit + 1].count()
+        self.result_count = min(count, self.approximate_count_limit)
+        self.result_count_is_approximate = count > self.approximate_count_limit
+        self.show_full_result_count = False
+        self.show_admin_actions = True
+        self.full_result_count = None
+        self.result_list = result_list
+        self.can_show_all = False
+        self.multi_page = self.has_newer or self.has_older
+        self.paginator = None
+
+    @property
+    def older_page_url(self) -> str | None:
+        if self.keyset_pagination and self.has_older:
+            return self.get_query_string(
+                {self.KEYSET_BEFORE_VAR: self.result_list[-1].pk}, remove=[self.KEYSET_AFTER_VAR]
+            )
+        return None
+
+    @property
+    def newer_page_url(self) -> str | None:
+        if self.keyset_pagination and self.has_newer:
+            if not self.result_list:
+                return self.get_query_string(remove=[self.KEYSET_BEFORE_VAR, self.KEYSET_AFTER_VAR])
+            return self.get_query_string(
+                {self.KEYSET_AFTER_VAR: self.result_list[0].pk}, remove=[self.KEYSET_BEFORE_VAR]
+            )
+        return None
+
+    def get_latest_version(self, request):
+        """Returns the latest version of the displayed queryset. With keyset
+        pagination, it is the newest version of the first page, hence already
+        fetched."""
+        if self.keyset_pagination and not self.has_newer:
+            if not self.result_list:
+                raise Version.DoesNotExist
+            return self.result_list[0]
+        return self.get_queryset(request).latest("created")
+
     def get_grouping_field_filters(self, request):
         """Handles extra grouping params (such as PageContent.language).
 
@@ -788,6 +888,8 @@ class VersionAdmin(ChangeListActionsMixin, admin.ModelAdmin, metaclass=MediaDefi
         )
     )
     list_display_links = None
+    #: Number of groupers per page of the grouper selection form's autocomplete
+    grouper_autocomplete_page_size = 20
 
     # FIXME disabled until GenericRelation attached to content models gets
     # fixed to include subclass (polymorphic) support
@@ -804,6 +906,12 @@ class VersionAdmin(ChangeListActionsMixin, admin.ModelAdmin, metaclass=MediaDefi
     def get_changelist(self, request, **kwargs):
         return VersionChangeList
 
+    def get_sortable_by(self, request):
+        if conf.KEYSET_PAGINATION:
+            # Keyset pagination orders the versions by pk only
+            return ()
+        return super().get_sortable_by(request)
+
     def get_list_filter(self, request):
         """Adds the filters for the extra grouping fields to the UI."""
         versionable = versionables.for_content(self.model._source_model)
@@ -957,6 +1065,26 @@ class VersionAdmin(ChangeListActionsMixin, admin.ModelAdmin, metaclass=MediaDefi
             disabled=not obj.check_revert.as_bool(request.user) or disabled,
         )
 
+    def _get_rollback_link(self, obj, request, disabled=False):
+        """Helper function to get the html link to the instant rollback action"""
+        if not conf.INSTANT_ROLLBACK or not obj.can_be_rolled_back():
+            # Don't display the link if rollbacks are disabled or it can't be rolled back
+            return ""
+
+        rollback_url = reverse(
+            f"admin:{obj._meta.app_label}_{self.model._meta.model_name}_rollback",
+            args=(obj.pk,),
+        )
+        return self.admin_action_button(
+            rollback_url,
+            icon="publish",
+            title=_("Publish again"),
+            name="rollback",
+            action="post",
+            disabled=not obj.check_rollback.as_bool(request.user) or disabled,
+            keepsideframe=False,
+        )
+
     def _get_discard_link(self, obj, request, disabled=False):
         """Helper function to get the html link to the discard action"""
         if obj.state != DRAFT:
@@ -1046,6 +1174,7 @@ class VersionAdmin(ChangeListActionsMixin, admin.ModelAdmin, metaclass=MediaDefi
             self._get_publish_link,
             self._get_unpublish_link,
             self._get_revert_link,
+            self._get_rollback_link,
             self._get_discard_link,
             self._get_unlock_link,
             self._get_settings_link,
@@ -1123,6 +1252,57 @@ class VersionAdmin(ChangeListActionsMixin, admin.ModelAdmin, metaclass=MediaDefi
         )
         return TemplateResponse(request, "admin/djangocms_versioning/grouper_form.html", context)
 
+    def grouper_autocomplete_view(self, request):
+        """Returns a page of groupers matching the search term ``term`` as JSON for
+        the grouper selection form. Pages are keyset-paginated by the primary key:
+        ``after`` is the last primary key of the previous page. Labels (and the
+        latest content objects they are based on) are only loaded for the groupers
+        of the returned page.
+        """
+        if not self.has_view_or_change_permission(request):
+            raise PermissionDenied
+        versionable = versionables.for_content(self.model._source_model)
+        language = request.GET.get("language") or get_language_from_request(request)
+        queryset = self.get_grouper_search_results(request, versionable, request.GET.get("term", "").strip())
+        after = request.GET.get("after")
+        if after:
+            try:
+                queryset = queryset.filter(pk__gt=versionable.grouper_model._meta.pk.to_python(after))
+            except ValidationError:
+                return HttpResponseBadRequest()
+
+        page_size = self.grouper_autocomplete_page_size
+        groupers = list(queryset.order_by("pk")[:page_size + 1])
+        more = len(groupers) > page_size
+        groupers = groupers[:page_size]
+        form_class = grouper_form_factory(self.model._source_model, language, self.admin_site)
+        field = form_class.base_fields[versionable.grouper_field_name]
+        return JsonResponse({
+            "results": [{"id": str(grouper.pk), "text": field.label_from_instance(grouper)} for grouper in groupers],
+            "pagination": {"more": more, "after": str(groupers[-1].pk) if more else None},
+        })
+
+    def get_grouper_search_results(self, request, versionable, term):
+        """Returns the groupers matching the search term. Uses the search fields of the
+        grouper's admin or, if it has none, those of the content model's admin."""
+        queryset = versionable.grouper_choices_queryset()
+        if not term:
+            return queryset
+        grouper_admin = self.admin_site._registry.get(versionable.grouper_model)
+        if grouper_admin is not None and grouper_admin.get_search_fields(request):
+            queryset, _may_have_duplicates = grouper_admin.get_search_results(request, queryset, term)
+            return queryset
+        content_admin = self.admin_site._registry.get(versionable.content_model)
+        if content_admin is not None and content_admin.get_search_fields(request):
+            contents, _may_have_duplicates = content_admin.get_search_results(
+                request, versionable.content_model.admin_manager.all(), term
+            )
+            return queryset.filter(pk__in=contents.values(versionable.grouper_field.attname))
+        try:
+            return queryset.filter(pk=versionable.grouper_model._meta.pk.to_python(term))
+        except ValidationError:
+            return queryset.none()
+
     def archive_view(self, request, object_id):
         """Archives the specified version and redirects back to the
         version changelist
@@ -1295,8 +1475,9 @@ class VersionAdmin(ChangeListActionsMixin, admin.ModelAdmin, metaclass=MediaDefi
             pks_for_grouper = version.versionable.for_content_grouping_values(version.content).values_list(
                 "pk", flat=True
             )
-            content_type = ContentType.objects.get_for_model(version.content)
-            drafts = Version.objects.filter(object_id__in=pks_for_grouper, content_type=content_type, state=DRAFT)
+            drafts = Version.objects.filter(
+                object_id__in=pks_for_grouper, content_type_id=get_content_type_id(version.content), state=DRAFT
+            )
             if drafts.exists():
                 # There is a draft record so people should be editing
                 # the draft record not the published one. Redirect to draft.
@@ -1415,6 +1596,49 @@ class VersionAdmin(ChangeListActionsMixin, admin.ModelAdmin, metaclass=MediaDefi
             # Redirect
             return redirect(version_list_url(version.content))
 
+    def rollback_view(self, request, object_id):
+        """Publishes an archived or unpublished version again without copying it
+        (see ``DJANGOCMS_VERSIONING_INSTANT_ROLLBACK``) and redirects back to the
+        version changelist
+        """
+        # This view always changes data so only POST requests should work
+        if request.method != "POST":
+            return HttpResponseNotAllowed(["POST"], _("This view only supports POST method."))
+
+        version = self.get_object(request, unquote(object_id))
+        if version is None:
+            raise Http404
+
+        redirect_url = version_list_url(version.content)
+        if not version.can_be_rolled_back():
+            self.message_user(request, _("Version cannot be published again"), messages.ERROR)
+            return redirect(redirect_url)
+        try:
+            version.check_rollback(request.user)
+        except ConditionFailed as e:
+            self.message_user(request, force_str(e), messages.ERROR)
+            return redirect(redirect_url)
+
+        try:
+            version.rollback(request.user)
+        except IntegrityError as e:
+            # e.g. the cms detected a URL collision with another page
+            logger.warning("Rolling back to version %s failed: %s", version.pk, e)
+            self.message_user(
+                request,
+                _(
+                    "Version could not be published: it conflicts with existing "
+                    "published content. This usually means the URL or slug is "
+                    "already in use by another page. Please change the slug and "
+                    "try again."
+                ),
+                messages.ERROR,
+            )
+            return redirect(redirect_url)
+
+        self.message_user(request, _("Version published"))
+        return redirect(redirect_url)
+
     def discard_view(self, request, object_id):
         """Discards the specified version"""
         version = self.get_object(request, unquote(object_id))
@@ -1516,7 +1740,7 @@ class VersionAdmin(ChangeListActionsMixin, admin.ModelAdmin, metaclass=MediaDefi
             return HttpResponseForbidden(force_str(_("You do not have permission to remove the version lock")))
 
         # Unlock the version
-        remove_version_lock(version)
+        remove_version_lock(version, request.user)
         # Display message
         messages.success(request, _("Version unlocked"))
 
@@ -1527,6 +1751,27 @@ class VersionAdmin(ChangeListActionsMixin, admin.ModelAdmin, metaclass=MediaDefi
         url = version_list_url(version.content)
         return redirect(url)
 
+    def lock_heartbeat_view(self, request, object_id):
+        """
+        Renew the lock of a draft version held by the current user. Pinged by the
+        editing UI if ``DJANGOCMS_VERSIONING_LOCK_TTL`` is set.
+        """
+        if not conf.LOCK_VERSIONS:
+            raise Http404()
+
+        if request.method != "POST":
+            return HttpResponseNotAllowed(["POST"], _("This view only supports POST method."))
+
+        try:
+            version_id = int(unquote(object_id))
+        except ValueError:
+            raise Http404() from None
+        expiry = renew_version_lock(version_id, request.user)
+        return JsonResponse({
+            "locked": expiry is not False,
+            "locked_until": expiry.isoformat() if expiry else None,
+        })
+
     @staticmethod
     def back_link(request, version=None):
         back_url = request.GET.get("back", None)
@@ -1590,7 +1835,7 @@ class VersionAdmin(ChangeListActionsMixin, admin.ModelAdmin, metaclass=MediaDefi
             # empty for the additional values.
             try:
                 response.context_data["latest_content"] = (
-                    response.context_data["cl"].get_queryset(request).latest("created").content
+                    response.context_data["cl"].get_latest_version(request).content
                 )
             except (ObjectDoesNotExist, KeyError):
                 pass
@@ -1604,6 +1849,11 @@ class VersionAdmin(ChangeListActionsMixin, admin.ModelAdmin, metaclass=MediaDefi
                 self.admin_site.admin_view(self.grouper_form_view),
                 name="{}_{}_grouper".format(*info),
             ),
+            path(
+                "select/autocomplete/",
+                self.admin_site.admin_view(self.grouper_autocomplete_view),
+                name="{}_{}_grouper_autocomplete".format(*info),
+            ),
             path(
                 "<path:object_id>/archive/",
                 self.admin_site.admin_view(self.archive_view),
@@ -1629,6 +1879,11 @@ class VersionAdmin(ChangeListActionsMixin, admin.ModelAdmin, metaclass=MediaDefi
                 self.admin_site.admin_view(self.revert_view),
                 name="{}_{}_revert".format(*info),
             ),
+            path(
+                "<path:object_id>/rollback/",
+                self.admin_site.admin_view(self.rollback_view),
+                name="{}_{}_rollback".format(*info),
+            ),
             path(
                 "<path:object_id>/compare/",
                 self.admin_site.admin_view(self.compare_view),
@@ -1644,6 +1899,11 @@ class VersionAdmin(ChangeListActionsMixin, admin.ModelAdmin, metaclass=MediaDefi
                 self.admin_site.admin_view(self.unlock_view),
                 name="{}_{}_unlock".format(*info),
             ),
+            path(
+                "<path:object_id>/lock-heartbeat/",
+                self.admin_site.admin_view(self.lock_heartbeat_view),
+                name="{}_{}_lock_heartbeat".format(*info),
+            ),
         ] + super().get_urls()
 
     def has_add_permission(self, request):
@@ -1,5 +1,4 @@
 from django.apps import AppConfig
-from django.db.models.signals import post_save
 from django.utils.translation import gettext_lazy as _
 
 
@@ -11,14 +10,20 @@ class VersioningConfig(AppConfig):
     def ready(self):
         from cms.models import contentmodels, fields
         from cms.signals import post_obj_operation, post_placeholder_operation
+        from django.conf import settings
+        from django.db.models.signals import post_migrate, post_save
 
         from .conf import LOCK_VERSIONS
         from .handlers import (
-            update_modified_date,
+            update_author_sort_keys,
             update_modified_date_for_pagecontent,
             update_modified_date_for_placeholder_source,
         )
-        from .helpers import is_content_editable, placeholder_content_is_unlocked_for_user
+        from .helpers import (
+            clear_content_type_cache,
+            is_content_editable,
+            placeholder_content_is_unlocked_for_user,
+        )
 
         # Add check to PlaceholderRelationField
         fields.PlaceholderRelationField.default_checks += [is_content_editable]
@@ -31,11 +36,16 @@ class VersioningConfig(AppConfig):
         )
         contentmodels.PageContent._meta.unique_together = pagecontent_unique_together
 
-        # Connect signals
-        post_save.connect(update_modified_date, dispatch_uid="versioning")
+        # Connect signals (post_save receivers for the modified date are connected
+        # per sender in VersioningCMSExtension.handle_modified_date_receivers)
         post_placeholder_operation.connect(
             update_modified_date_for_placeholder_source, dispatch_uid="versioning"
         )
         post_obj_operation.connect(
             update_modified_date_for_pagecontent, dispatch_uid="versioning"
         )
+        post_save.connect(
+            update_author_sort_keys, sender=settings.AUTH_USER_MODEL, dispatch_uid="versioning_author_sort_keys"
+        )
+        # Content types may be recreated (with new ids) by migrations or a flush
+        post_migrate.connect(clear_content_type_cache, dispatch_uid="versioning_content_types")
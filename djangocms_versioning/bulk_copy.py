@@ -0,0 +1,142 @@
+"""Copying of placeholders and their plugins with a constant number of queries
+per plugin tree level and plugin model (instead of several queries per plugin).
+
+Plugins are inserted without calling their ``save`` method and without sending
+``pre_save``/``post_save`` signals. Their ``copy_relations`` and ``post_copy``
+methods are called as usual.
+"""
+from __future__ import annotations
+
+from collections import defaultdict
+from collections.abc import Iterable
+
+from cms.models import CMSPlugin, Placeholder
+from cms.utils.plugins import get_bound_plugins
+from django.db import connections, models, router
+
+
+def can_bulk_copy() -> bool:
+    """Bulk copying requires the database to return the primary keys of rows
+    created by ``bulk_create``."""
+    connection = connections[router.db_for_write(CMSPlugin)]
+    return connection.features.can_return_rows_from_bulk_insert
+
+
+def _concrete_field_values(instance: models.Model, model: type[models.Model]) -> dict:
+    return {field.attname: getattr(instance, field.attname) for field in model._meta.concrete_fields}
+
+
+def _set_pk(plugin: CMSPlugin, pk: int | None) -> None:
+    # Sets the primary key and all parent links of a multi-table inherited plugin
+    for model in (plugin._meta.concrete_model, *plugin._meta.get_parent_list()):
+        setattr(plugin, model._meta.pk.attname, pk)
+
+
+def _get_depth(plugin: CMSPlugin, plugins: dict, depths: dict) -> int:
+    if plugin.pk not in depths:
+        parent = plugins.get(plugin.parent_id)
+        depths[plugin.pk] = 0 if parent is None else _get_depth(parent, plugins, depths) + 1
+    return depths[plugin.pk]
+
+
+def _insert_plugin_tables(plugins: list[CMSPlugin]) -> None:
+    """Inserts the rows of the plugin model tables (below ``CMSPlugin``) of plugins
+    whose ``CMSPlugin`` row already exists. ``bulk_create`` does not support
+    multi-table inheritance, hence each table is inserted separately."""
+    by_model = defaultdict(list)
+    for plugin in plugins:
+        by_model[plugin._meta.concrete_model].append(plugin)
+
+    for concrete_model, instances in by_model.items():
+        tables = sorted(
+            (concrete_model, *concrete_model._meta.get_parent_list()),
+            key=lambda model: len(model._meta.get_parent_list()),
+        )
+        for table in tables:
+            if table is CMSPlugin:
+                continue
+            using = router.db_for_write(table)
+            fields = table._meta.local_concrete_fields
+            batch_size = max(connections[using].ops.bulk_batch_size(fields, instances), 1)
+            for start in range(0, len(instances), batch_size):
+                table._base_manager._insert(instances[start:start + batch_size], fields=fields, using=using)
+        for instance in instances:
+            instance._state.adding = False
+            instance._state.db = router.db_for_write(concrete_model)
+
+
+def copy_plugins(placeholders: dict[int, Placeholder]) -> list[CMSPlugin]:
+    """Copies all plugins of the placeholders given as a dict mapping the primary key
+    of the source placeholder to the target placeholder. Plugin trees are copied
+    level by level: parents are created before their children and parent ids are
+    remapped in memory. Positions and languages are preserved.
+
+    :return: The list of new plugins
+    """
+    plugins = list(
+        CMSPlugin.objects.filter(placeholder_id__in=placeholders).order_by("placeholder_id", "language", "position")
+    )
+    if not plugins:
+        return []
+    source_plugins = {plugin.pk: plugin for plugin in get_bound_plugins(plugins)}
+
+    levels = defaultdict(list)
+    depths = {}
+    for plugin in source_plugins.values():
+        levels[_get_depth(plugin, source_plugins, depths)].append(plugin)
+
+    new_plugins = {}
+    for depth in sorted(levels):
+        level = []
+        for source_plugin in levels[depth]:
+            new_plugin = source_plugin.__class__(**_concrete_field_values(source_plugin, source_plugin.__class__))
+            _set_pk(new_plugin, None)
+            new_plugin.placeholder = placeholders[source_plugin.placeholder_id]
+            new_plugin.parent = new_plugins[source_plugin.parent_id] if depth else None
+            level.append(new_plugin)
+
+        base_plugins = [CMSPlugin(**_concrete_field_values(new_plugin, CMSPlugin)) for new_plugin in level]
+        CMSPlugin.objects.bulk_create(base_plugins)
+        for new_plugin, base_plugin in zip(level, base_plugins):
+            # Also picks up values set when saving, e.g., creation_date
+            for attname, value in _concrete_field_values(base_plugin, CMSPlugin).items():
+                setattr(new_plugin, attname, value)
+            _set_pk(new_plugin, base_plugin.pk)
+            new_plugin._state.adding = False
+            new_plugin._state.db = base_plugin._state.db
+        _insert_plugin_tables([new_plugin for new_plugin in level if new_plugin._meta.concrete_model is not CMSPlugin])
+
+        for source_plugin, new_plugin in zip(levels[depth], level):
+            new_plugins[source_plugin.pk] = new_plugin
+
+    plugin_pairs = [
+        (new_plugins[pk], source_plugin)
+        for pk, source_plugin in source_plugins.items()
+        if source_plugin._meta.concrete_model is not CMSPlugin
+    ]
+    for new_plugin, source_plugin in plugin_pairs:
+        new_plugin.copy_relations(source_plugin)
+    for new_plugin, source_plugin in plugin_pairs:
+        new_plugin.post_copy(source_plugin, plugin_pairs)
+    return list(new_plugins.values())
+
+
+def copy_placeholders(original_placeholders: Iterable[Placeholder], new_content: models.Model) -> list[Placeholder]:
+    """Copies placeholders (and their plugins) to ``new_content`` using bulk inserts,
+    see :func:`~djangocms_versioning.datastructures.copy_placeholder` for copying
+    a single placeholder."""
+    original_placeholders = list(original_placeholders)
+    new_placeholders = []
+    for original_placeholder in original_placeholders:
+        placeholder_fields = _concrete_field_values(original_placeholder, Placeholder)
+        del placeholder_fields[Placeholder._meta.pk.attname]
+        if original_placeholder.object_id is not None:
+            del placeholder_fields["content_type_id"], placeholder_fields["object_id"]
+            placeholder_fields["source"] = new_content
+        new_placeholders.append(Placeholder(**placeholder_fields))
+    Placeholder.objects.bulk_create(new_placeholders)
+    copy_plugins({
+        original_placeholder.pk: new_placeholder
+        for original_placeholder, new_placeholder in zip(original_placeholders, new_placeholders)
+    })
+    return new_placeholders
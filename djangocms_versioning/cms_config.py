@@ -31,6 +31,7 @@ from .admin import VersioningAdminMixin
 from .constants import INDICATOR_DESCRIPTIONS
 from .datastructures import BaseVersionableItem, VersionableItem, default_copy
 from .exceptions import ConditionFailed
+from .handlers import connect_modified_date_receivers
 from .helpers import (
     get_latest_admin_viewable_content,
     get_version_for_content,
@@ -41,6 +42,7 @@ from .helpers import (
     replace_manager,
 )
 from .managers import AdminManagerMixin, PublishedContentManagerMixin
+from .placeholder_checks import PlaceholderCheckCacheToolbarMixin
 from .plugin_rendering import CMSToolbarVersioningMixin
 
 #: django CMS 5.1+ stores slug and overwrite_url on PageContent and derives the
@@ -164,6 +166,20 @@ class VersioningCMSExtension(CMSAppExtension):
                 _group_by_key=list(versionable.grouping_fields),
             )
 
+    def handle_modified_date_receivers(self, cms_config):
+        """Connects the modified date post_save receivers for all provided
+        content models and their extensions.
+        """
+        for versionable in cms_config.versioning:
+            connect_modified_date_receivers(versionable.content_model)
+
+    def handle_content_models(self, cms_config):
+        """Precomputes the models (including polymorphic subclasses) of the
+        provided versionables. Their content type ids are cached on first use.
+        """
+        for versionable in cms_config.versioning:
+            versionable.content_models  # noqa: B018
+
     def handle_admin_field_modifiers(self, cms_config):
         """Allows for the transformation of a given field in the ExtendedVersionAdminMixin"""
         extended_admin_field_modifiers = getattr(cms_config, "extended_admin_field_modifiers", None)
@@ -193,6 +209,8 @@ class VersioningCMSExtension(CMSAppExtension):
             self.handle_version_admin(cms_config)
             self.handle_content_model_generic_relation(cms_config)
             self.handle_content_model_manager(cms_config)
+            self.handle_modified_date_receivers(cms_config)
+            self.handle_content_models(cms_config)
 
 
 def copy_page_content(original_content):
@@ -384,5 +402,7 @@ class VersioningCMSConfig(CMSAppConfig):
     ]
     if PackageVersion(cms_version) < PackageVersion("4.2"):
         cms_toolbar_mixin = CMSToolbarVersioningMixin
+    else:
+        cms_toolbar_mixin = PlaceholderCheckCacheToolbarMixin
     PageContent.add_to_class("is_editable", is_editable)
     PageContent.add_to_class("content_indicator", indicators.content_indicator)
@@ -1,5 +1,6 @@
 from . import conf, constants
 from .helpers import get_version_for_content
+from .routing import get_read_database
 
 if conf.ENABLE_MENU_REGISTRATION:
     from cms import constants as cms_constants
@@ -110,7 +111,9 @@ if conf.ENABLE_MENU_REGISTRATION:
 
             versionable_item = cms_extension.versionables_by_grouper[Page]
             versioned_page_contents = (
-                versionable_item.content_model._base_manager.filter(
+                versionable_item.content_model._base_manager.db_manager(
+                    None if edit_or_preview else get_read_database()
+                ).filter(
                     language=language, page__in=pages_qs, versions__state__in=states
                 )
                 .order_by("page__node__path" if TreeNode else "page__path", "versions__state")
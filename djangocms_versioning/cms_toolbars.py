@@ -23,23 +23,31 @@ from cms.utils.urlutils import add_url_parameters, admin_reverse
 from django.apps import apps
 from django.conf import settings
 from django.contrib.auth import get_permission_codename
-from django.contrib.contenttypes.models import ContentType
+from django.db.models import Q
+from django.middleware.csrf import get_token
 from django.urls import reverse
 from django.utils.http import urlencode
 from django.utils.translation import gettext_lazy as _
 from packaging import version
 
+from djangocms_versioning import conf
 from djangocms_versioning.conf import ALLOW_DELETING_VERSIONS, LOCK_VERSIONS
-from djangocms_versioning.constants import DRAFT
+from djangocms_versioning.constants import DRAFT, PUBLISHED
 from djangocms_versioning.helpers import (
     get_current_site,
     get_latest_admin_viewable_content,
+    get_latest_admin_viewable_contents,
     get_object_live_url,
-    get_version_for_content,
     version_list_url,
 )
 from djangocms_versioning.models import Version
 
+try:
+    # django CMS 4.2+
+    from cms.models.pagemodel import AdminCacheDict
+except ImportError:  # pragma: no cover
+    AdminCacheDict = None
+
 VERSIONING_MENU_IDENTIFIER = "version"
 CMS_SUPPORTS_DELETING_TRANSLATIONS = version.Version(cms_version) > version.Version("4.1.4")
 CMS_ADDS_PREVIEW_BUTTON = version.Version(cms_version) >= version.Version("4.2")
@@ -49,6 +57,7 @@ class VersioningToolbar(PlaceholderToolbar):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self._version_cache = None
+        self._toolbar_state = None
 
     def _get_versionable(self):
         """Helper method to get the versionable for the content type
@@ -70,11 +79,34 @@ class VersioningToolbar(PlaceholderToolbar):
         """
         return self._get_versionable().version_model_proxy
 
+    def _load_toolbar_state(self):
+        """Loads the version of the toolbar object together with the draft and the
+        published version of its grouping (and the source version) in a single query.
+
+        :return: A dict with the keys "version", DRAFT and PUBLISHED
+        """
+        if self._toolbar_state is None:
+            obj = self.toolbar.obj
+            versions = (
+                Version.objects.filter_by_content_grouping_values(obj)
+                .filter(Q(object_id=obj.pk) | Q(state__in=(DRAFT, PUBLISHED)))
+                .select_related("source")
+            )
+            state = {"version": None, DRAFT: None, PUBLISHED: None}
+            for version in versions:
+                if version.object_id == obj.pk:
+                    version._state.fields_cache["content"] = obj
+                    state["version"] = obj._version_cache = version
+                if version.state in (DRAFT, PUBLISHED):
+                    state[version.state] = version
+            obj._latest_draft_version = state[DRAFT]
+            self._toolbar_state = state
+        return self._toolbar_state
+
     def _get_version(self):
-        """Get the version for the toolbar object, using prefetched or cached version to avoid N+1 queries."""
+        """Get the version for the toolbar object, see :meth:`_load_toolbar_state`."""
         if self._version_cache is None and self._is_versioned():
-            # Check for prefetched versions first, then fall back to database query
-            self._version_cache = get_version_for_content(self.toolbar.obj)
+            self._version_cache = self._load_toolbar_state()["version"]
         return self._version_cache
 
     def _add_publish_button(self):
@@ -123,13 +155,7 @@ class VersioningToolbar(PlaceholderToolbar):
             )
             if self.request.GET:
                 edit_url += "?" + self.request.GET.urlencode()
-            pks_for_grouper = version.versionable.for_content_grouping_values(version.content).values_list(
-                "pk", flat=True
-            )
-            content_type = ContentType.objects.get_for_model(version.content)
-            draft_exists = Version.objects.filter(
-                object_id__in=pks_for_grouper, content_type=content_type, state=DRAFT
-            ).exists()
+            draft_exists = self._load_toolbar_state()[DRAFT] is not None
             item.add_button(
                 _("Edit") if draft_exists else _("New Draft"),
                 url=edit_url,
@@ -180,6 +206,30 @@ class VersioningToolbar(PlaceholderToolbar):
             )
             self.toolbar.add_item(lock_message, position=0)
 
+    def _add_lock_heartbeat(self):
+        """Helper method to keep the lock of a draft alive while its holder edits it"""
+        if not (LOCK_VERSIONS and conf.LOCK_TTL and self.toolbar.edit_mode_active and self._is_versioned()):
+            return
+        version = self._get_version()
+        if version is None or version.state != DRAFT or version.locked_by_id != self.request.user.pk:
+            return
+        proxy_model = self._get_proxy_model()
+        heartbeat_url = reverse(
+            f"admin:{proxy_model._meta.app_label}_{proxy_model._meta.model_name}_lock_heartbeat",
+            args=(version.pk,),
+        )
+        heartbeat = TemplateItem(
+            template="djangocms_versioning/admin/lock_heartbeat.html",
+            extra_context={
+                "heartbeat_url": heartbeat_url,
+                # Renew well before the lock expires
+                "interval": max(conf.LOCK_TTL // 3, 1),
+                "csrf_token": get_token(self.request),
+            },
+            side=RIGHT,
+        )
+        self.toolbar.add_item(heartbeat)
+
     def _add_revert_button(self, disabled=False):
         """Helper method to add a revert button to the toolbar"""
         # Check if object is registered with versioning otherwise don't add
@@ -259,7 +309,13 @@ class VersioningToolbar(PlaceholderToolbar):
         if not isinstance(self.toolbar.obj, PageContent) or not self.page:
             return
 
-        return PageContent.objects.filter(page=self.page, language=language).select_related("page").first()
+        if self.toolbar.obj.language != language or self.toolbar.obj.page_id != self.page.pk:
+            return PageContent.objects.filter(page=self.page, language=language).select_related("page").first()
+        if self._load_toolbar_state()[PUBLISHED] is None:
+            return None
+        # All page contents of a page and language share their live url, hence the
+        # toolbar object stands in for the published content (instead of loading it)
+        return self.toolbar.obj
 
     def _add_view_published_button(self):
         """Helper method to add a publish button to the toolbar"""
@@ -298,8 +354,12 @@ class VersioningToolbar(PlaceholderToolbar):
             self.add_preview_button()
 
     def post_template_populate(self):
+        if self._is_versioned():
+            # Caches the version on the toolbar object before the core looks it up
+            self._load_toolbar_state()
         super().post_template_populate()
         self._add_lock_message()
+        self._add_lock_heartbeat()
         self._add_preview_button()
         self._add_view_published_button()
         self._add_revert_button()
@@ -315,8 +375,20 @@ class VersioningPageToolbar(PageToolbar):
 
     def __init__(self, *args, **kwargs):
         self.page_content: PageContent | None = None
+        self._admin_contents: dict[str, PageContent] | None = None
         super().__init__(*args, **kwargs)
 
+    def get_admin_contents(self) -> dict[str, PageContent]:
+        """Returns the latest page content objects (draft, published or, if neither
+        exists, unpublished or archived) of the current page keyed by language.
+        They are loaded with a single query and reused by all menus."""
+        if self._admin_contents is None:
+            self._admin_contents = get_latest_admin_viewable_contents(self.page, include_unpublished_archived=True)
+            if AdminCacheDict is not None and self.page.admin_content_cache is None:
+                # Also lets the core's get_admin_content calls reuse the result
+                self.page.admin_content_cache = AdminCacheDict(self._admin_contents)
+        return self._admin_contents
+
     def get_page_content(self, language: str | None = None) -> PageContent:
         # This method overwrites the method in django CMS core. Not necessary
         # for django CMS 4.2+
@@ -330,6 +402,8 @@ class VersioningPageToolbar(PageToolbar):
         if isinstance(toolbar_obj, PageContent) and toolbar_obj.language == language:
             # Already in the toolbar, then use it!
             return toolbar_obj
+        elif getattr(self, "page", None):
+            return self.get_admin_contents().get(language)
         else:
             # Get it from the DB
             return get_latest_admin_viewable_content(self.page, language=language, include_unpublished_archived=True)
@@ -355,9 +429,10 @@ class VersioningPageToolbar(PageToolbar):
             for _item in copy(language_menu.items):
                 language_menu.remove_item(item=_item)
 
+            admin_contents = self.get_admin_contents()
             for code, name in get_language_tuple(self.current_site.pk):
                 # Get the page content, it could be draft too!
-                page_content = self.page.get_admin_content(language=code)
+                page_content = admin_contents.get(code)
                 if page_content:
                     url = get_object_preview_url(page_content, code)
                     language_menu.add_link_item(name, url=url, active=self.current_lang == code)
@@ -375,8 +450,9 @@ class VersioningPageToolbar(PageToolbar):
             if not language_menu:
                 return None
 
+            admin_contents = self.get_admin_contents()
             languages = get_language_dict(self.current_site.pk)
-            remove = [(code, languages.get(code, code)) for code in self.page.get_languages() if code in languages]
+            remove = [(code, languages.get(code, code)) for code in admin_contents if code in languages]
             add = [code for code in languages.items() if code not in remove]
             copy = [
                 (code, name) for code, name in languages.items() if code != self.current_lang and (code, name) in remove
@@ -401,7 +477,7 @@ class VersioningPageToolbar(PageToolbar):
                 )
                 disabled = len(remove) == 1
                 for code, name in remove:
-                    pagecontent = self.page.get_admin_content(language=code)
+                    pagecontent = admin_contents.get(code)
                     if pagecontent:
                         translation_delete_url = admin_reverse("cms_pagecontent_delete", args=(pagecontent.pk,))
                         url = add_url_parameters(translation_delete_url, language=code)
@@ -409,8 +485,8 @@ class VersioningPageToolbar(PageToolbar):
                         if self.toolbar.get_object() == pagecontent and not disabled:
                             other_content = next(
                                 (
-                                    self.page.get_admin_content(lang)
-                                    for lang in self.page.get_languages()
+                                    content
+                                    for lang, content in admin_contents.items()
                                     if lang != pagecontent.language and lang in languages
                                 ),
                                 None,
@@ -427,7 +503,7 @@ class VersioningPageToolbar(PageToolbar):
                 item_added = False
                 for code, name in copy:
                     # Get the Draft or Published PageContent.
-                    page_content = self.page.get_admin_content(language=code)
+                    page_content = admin_contents.get(code)
                     if page_content:  # Only offer to copy if content for source language exists
                         page_copy_url = admin_reverse("cms_pagecontent_copy_language", args=(page_content.pk,))
                         copy_plugins_menu.add_ajax_item(
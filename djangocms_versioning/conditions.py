@@ -88,13 +88,21 @@ def draft_is_locked(message: str) -> callable:
     return inner
 
 
+def rollback_is_enabled(message: str) -> callable:
+    """Condition that instant rollbacks are enabled by ``settings.DJANGOCMS_VERSIONING_INSTANT_ROLLBACK``"""
+    def inner(version, user):
+        if not conf.INSTANT_ROLLBACK:
+            raise ConditionFailed(message)
+    return inner
+
+
 def user_can_unlock(message: str) -> callable:
     def inner(version, user):
         if conf.LOCK_VERSIONS:
             if user.has_perm(f"{version._meta.app_label}.delete_versionlock"):
                 return
             draft_version = version.get_latest_draft_version()
-            if draft_version and (draft_version.locked_by_id is  None or draft_version.locked_by_id == user.pk):
+            if draft_version and draft_version.is_unlocked_for_user(user):
                 return
             raise ConditionFailed(message)
     return inner
@@ -23,14 +23,97 @@ LOCK_VERSIONS = getattr(
     settings, "DJANGOCMS_VERSIONING_LOCK_VERSIONS", False,
 )
 
+LOCK_TTL = getattr(
+    settings, "DJANGOCMS_VERSIONING_LOCK_TTL", None
+)
+#: Seconds a version lock lasts unless it is renewed by the heartbeat of the
+#: editing UI (None: locks do not expire)
+
 VERBOSE = getattr(
     settings, "DJANGOCMS_VERSIONING_VERBOSE", True,
 )
 
+QUERY_BUDGETS = getattr(
+    settings, "DJANGOCMS_VERSIONING_QUERY_BUDGETS", {}
+)
+#: Maximum number of queries per request and versioning subsystem (or "total")
+#: before djangocms_versioning.profiling logs a warning
+
+METRICS_BACKEND = getattr(
+    settings, "DJANGOCMS_VERSIONING_METRICS_BACKEND", None
+)
+#: Dotted path of the backend receiving the timing metrics of version operations,
+#: e.g. "djangocms_versioning.metrics.StatsdMetricsBackend"
+
+METRICS_OPTIONS = getattr(
+    settings, "DJANGOCMS_VERSIONING_METRICS_OPTIONS", {}
+)
+#: Keyword arguments for the metrics backend
+
+DEFER_POST_OPERATION_SIGNALS = getattr(
+    settings, "DJANGOCMS_VERSIONING_DEFER_POST_OPERATION_SIGNALS", False
+)
+#: If True, post_version_operation signals (and content change notifications)
+#: are sent after the transaction of the version operation commits
+
+POST_OPERATION_WORKERS = getattr(
+    settings, "DJANGOCMS_VERSIONING_POST_OPERATION_WORKERS", 0
+)
+#: Number of worker threads sending deferred post_version_operation signals
+#: (0 sends them in the thread committing the transaction)
+
+BULK_COPY = getattr(
+    settings, "DJANGOCMS_VERSIONING_BULK_COPY", False
+)
+#: If True, default_copy copies placeholders and plugins using bulk inserts
+#: (plugins' save methods are not called and no save signals are sent)
+
+READ_REPLICA = getattr(
+    settings, "DJANGOCMS_VERSIONING_READ_REPLICA", None
+)
+#: Database alias of a read replica used for reading published content
+#: (requires djangocms_versioning.routing.ReadReplicaRouter in DATABASE_ROUTERS)
+
+READ_REPLICA_PIN_SECONDS = getattr(
+    settings, "DJANGOCMS_VERSIONING_READ_REPLICA_PIN_SECONDS", 10
+)
+#: Seconds a session reads from the primary database after changing a version
+#: (requires djangocms_versioning.routing.ReadReplicaPinningMiddleware)
+
+KEYSET_PAGINATION = getattr(
+    settings, "DJANGOCMS_VERSIONING_KEYSET_PAGINATION", False
+)
+#: If True, the version list is paginated by version pk (newest first) without
+#: offsets and with approximate counts
+
+INSTANT_ROLLBACK = getattr(
+    settings, "DJANGOCMS_VERSIONING_INSTANT_ROLLBACK", False
+)
+#: If True, archived and unpublished versions can be published again without
+#: copying them into a new draft (see Version.rollback)
+
+CHANGE_FEED = getattr(
+    settings, "DJANGOCMS_VERSIONING_CHANGE_FEED", False
+)
+#: If True, version creation and lock changes are recorded in StateTracking along
+#: with state transitions (read by the stream_changes management command)
+
+VERSION_SUMMARY = getattr(
+    settings, "DJANGOCMS_VERSIONING_VERSION_SUMMARY", False
+)
+#: If True, a summary of the versions of each grouping is kept in the VersionSummary
+#: model and read by grouper admins (run rebuild_version_summaries after enabling)
+
 EMAIL_NOTIFICATIONS_FAIL_SILENTLY = getattr(
     settings, "EMAIL_NOTIFICATIONS_FAIL_SILENTLY", False
 )
 
+EMAIL_OUTBOX = getattr(
+    settings, "DJANGOCMS_VERSIONING_EMAIL_OUTBOX", False
+)
+#: If True, notification emails are queued in the database and sent by the
+#: send_queued_emails management command instead of during the request
+
 ON_PUBLISH_REDIRECT = getattr(
     settings,
     "DJANGOCMS_VERSIONING_ON_PUBLISH_REDIRECT",
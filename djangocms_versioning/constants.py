@@ -18,6 +18,19 @@ OPERATION_DRAFT = "operation_draft"
 OPERATION_PUBLISH = "operation_publish"
 OPERATION_UNPUBLISH = "operation_unpublish"
 
+"""Change feed events (see StateTracking)"""
+EVENT_CREATED = "created"
+EVENT_TRANSITION = "transition"
+EVENT_LOCKED = "locked"
+EVENT_UNLOCKED = "unlocked"
+
+CHANGE_EVENTS = (
+    (EVENT_CREATED, _("Created")),
+    (EVENT_TRANSITION, _("State transition")),
+    (EVENT_LOCKED, _("Locked")),
+    (EVENT_UNLOCKED, _("Unlocked")),
+)
+
 INDICATOR_DESCRIPTIONS = {
     "published": _("Published"),
     "dirty": _("Changed"),
@@ -4,14 +4,16 @@ from collections.abc import Iterable
 from itertools import chain
 from typing import Any
 
+from asgiref.sync import sync_to_async
 from cms.extensions.models import BaseExtension
 from cms.models import Placeholder, PlaceholderRelationField
-from django.contrib.contenttypes.models import ContentType
 from django.db import models
 from django.utils.functional import cached_property
 
+from . import conf
 from .admin import DefaultGrouperVersioningAdminMixin, VersioningAdminMixin
-from .helpers import get_content_types_with_subclasses
+from .bulk_copy import can_bulk_copy, copy_placeholders
+from .helpers import get_content_type_id, get_models_with_subclasses
 from .models import Version
 
 
@@ -127,15 +129,15 @@ class VersionableItem(BaseVersionableItem):
         """Returns all `Content` objects for specified grouper object."""
         return self.for_grouping_values(**{self.grouper_field.name: grouper})
 
-    def for_content_grouping_values(self, content: models.Model) -> models.QuerySet:
+    def for_content_grouping_values(self, content: models.Model, using: str | None = None) -> models.QuerySet:
         """Returns all `Content` objects based on all grouping values
         in specified content object."""
-        return self.for_grouping_values(**self.grouping_values(content))
+        return self.for_grouping_values(using=using, **self.grouping_values(content))
 
-    def for_grouping_values(self, **kwargs) -> models.QuerySet:
+    def for_grouping_values(self, using: str | None = None, **kwargs) -> models.QuerySet:
         """Returns all `Content` objects based on all specified
-        grouping values."""
-        return self.content_model.admin_manager.filter(**kwargs)
+        grouping values (read from the database ``using`` if given)."""
+        return self.content_model.admin_manager.db_manager(using).filter(**kwargs)
 
     @property
     def grouping_fields(self) -> Iterable[str]:
@@ -166,8 +168,14 @@ class VersionableItem(BaseVersionableItem):
     def get_grouper_with_fallbacks(self, grouper_id) -> models.Model | None:
         return self.grouper_choices_queryset().filter(pk=grouper_id).first()
 
+    @cached_property
+    def content_models(self) -> tuple[type[models.Model], ...]:
+        """The models whose content types are versioned by this versionable,
+        computed when the app is configured."""
+        return (self.content_model,)
+
     def _get_content_types(self) -> set[int]:
-        return {ContentType.objects.get_for_model(self.content_model).pk}
+        return {get_content_type_id(self.content_model)}
 
     @cached_property
     def content_types(self) -> set[int]:
@@ -180,12 +188,23 @@ class VersionableItem(BaseVersionableItem):
         # more elements
         return self._get_content_types()
 
+    async def acontent_types(self) -> set[int]:
+        """Async version of :attr:`content_types`. Content types are only looked up
+        (in the thread used for synchronous code) on first access."""
+        if "content_types" in self.__dict__:
+            return self.content_types
+        return await sync_to_async(lambda: self.content_types)()
+
 
 class PolymorphicVersionableItem(VersionableItem):
     """VersionableItem for use by base polymorphic class (for example filer.File)."""
 
+    @cached_property
+    def content_models(self) -> tuple[type[models.Model], ...]:
+        return get_models_with_subclasses([self.content_model])
+
     def _get_content_types(self) -> set[int]:
-        return get_content_types_with_subclasses([self.content_model])
+        return {get_content_type_id(model, for_concrete_model=False) for model in self.content_models}
 
 
 class VersionableItemAlias(BaseVersionableItem):
@@ -252,7 +271,10 @@ def default_copy(original_content: models.Model) -> models.Model:
         if isinstance(field, PlaceholderRelationField):
             # Copy placeholders
             original_placeholders = getattr(original_content, field.name).all()
-            new_placeholders = [copy_placeholder(ph, new_content) for ph in original_placeholders]
+            if conf.BULK_COPY and can_bulk_copy():
+                new_placeholders = copy_placeholders(original_placeholders, new_content)
+            else:
+                new_placeholders = [copy_placeholder(ph, new_content) for ph in original_placeholders]
             getattr(new_content, field.name).add(*new_placeholders)
         if hasattr(new_content, "copy_relations"):
             if callable(new_content.copy_relations):
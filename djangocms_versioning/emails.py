@@ -1,11 +1,15 @@
 from __future__ import annotations
 
+from datetime import timedelta
 from urllib.parse import urljoin
 
 from cms.toolbar.utils import get_object_preview_url
 from cms.utils import get_current_site
 from django.conf import settings
 from django.contrib.sites.models import Site
+from django.core.mail import EmailMessage, get_connection
+from django.db import connection, transaction
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 
 from djangocms_versioning import models
@@ -55,3 +59,83 @@ def notify_version_author_version_unlocked(version: models.Version, unlocking_us
         template_context=template_context,
     )
     return status
+
+
+def _schedule_retry(email: models.QueuedEmail, error: Exception, backoff: int) -> None:
+    email.attempts += 1
+    email.next_attempt = timezone.now() + timedelta(seconds=backoff * 2 ** (email.attempts - 1))
+    email.last_error = str(error)
+    email.save(update_fields=["attempts", "next_attempt", "last_error"])
+
+
+def _claim_queued_emails(batch_size: int, max_attempts: int, lease: int) -> list[models.QueuedEmail]:
+    now = timezone.now()
+    lease_until = now + timedelta(seconds=lease)
+    with transaction.atomic():
+        queued = models.QueuedEmail.objects.filter(next_attempt__lte=now, attempts__lt=max_attempts)
+        if connection.features.has_select_for_update_skip_locked:
+            queued = queued.select_for_update(skip_locked=True)
+        pks = list(queued.values_list("pk", flat=True)[:batch_size])
+        if not pks:
+            return []
+        # Moving the next attempt to the end of the lease hides the emails from other
+        # workers while they are sent. Should this worker die, they are sent again
+        # once the lease has ended.
+        models.QueuedEmail.objects.filter(pk__in=pks, next_attempt__lte=now).update(next_attempt=lease_until)
+    # Without row locks, another worker may have claimed some of the emails first
+    return list(models.QueuedEmail.objects.filter(pk__in=pks, next_attempt=lease_until))
+
+
+def send_queued_emails(
+    batch_size: int = 100, max_attempts: int = 5, backoff: int = 60, lease: int = 300
+) -> tuple[int, int]:
+    """Sends a batch of due emails from the outbox over a single connection of the
+    email backend. Sent emails are removed from the outbox.
+
+    Emails which fail to send are retried with exponential backoff, i.e., after
+    ``backoff``, ``2 * backoff``, ``4 * backoff``, ... seconds, until they failed
+    ``max_attempts`` times.
+
+    The batch is claimed for ``lease`` seconds in a short transaction, so concurrent
+    workers do not send the same emails. The emails are sent outside of any
+    transaction: a slow email backend holds no database locks. Emails of a worker
+    which dies while sending are sent again after the lease.
+
+    :return: A tuple of the numbers of sent and failed emails
+    """
+    emails = _claim_queued_emails(batch_size, max_attempts, lease)
+    if not emails:
+        return 0, 0
+
+    email_connection = get_connection()
+    try:
+        email_connection.open()
+    except Exception as err:
+        with transaction.atomic():
+            for email in emails:
+                _schedule_retry(email, err, backoff)
+        return 0, len(emails)
+
+    delivered, failed = [], []
+    try:
+        for email in emails:
+            message = EmailMessage(
+                subject=email.subject,
+                body=email.body,
+                from_email=email.from_email,
+                to=email.recipients,
+                connection=email_connection,
+            )
+            try:
+                message.send()
+            except Exception as err:
+                failed.append((email, err))
+            else:
+                delivered.append(email.pk)
+    finally:
+        email_connection.close()
+    with transaction.atomic():
+        for email, err in failed:
+            _schedule_retry(email, err, backoff)
+        models.QueuedEmail.objects.filter(pk__in=delivered).delete()
+    return len(delivered), len(failed)
@@ -1,9 +1,11 @@
 from __future__ import annotations
 
 from functools import lru_cache
+from urllib.parse import urlencode
 
 from django import forms
 from django.contrib.admin.widgets import AutocompleteSelect
+from django.urls import reverse
 
 from . import versionables
 
@@ -15,13 +17,49 @@ class VersionAutocompleteSelect(AutocompleteSelect):
         return [default]
 
 
+class GrouperAutocompleteSelect(VersionAutocompleteSelect):
+    """Select2 widget loading the groupers page by page from the grouper
+    autocomplete endpoint of the version admin (instead of rendering all of them)"""
+
+    url_name = "%s:%s_%s_grouper_autocomplete"
+
+    def __init__(self, field, admin_site, version_model, language=None, **kwargs):
+        super().__init__(field, admin_site, **kwargs)
+        self.version_model = version_model
+        self.language = language
+
+    def get_url(self):
+        opts = self.version_model._meta
+        url = reverse(self.url_name % (self.admin_site.name, opts.app_label, opts.model_name))
+        return f"{url}?{urlencode({'language': self.language})}" if self.language else url
+
+    def build_attrs(self, base_attrs, extra_attrs=None):
+        attrs = super().build_attrs(base_attrs, extra_attrs=extra_attrs)
+        # Initialized by grouper-autocomplete.js instead of the admin's autocomplete.js
+        attrs["class"] = attrs["class"].replace("admin-autocomplete", "versioning-grouper-autocomplete")
+        return attrs
+
+    @property
+    def media(self):
+        return super().media + forms.Media(js=["djangocms_versioning/js/admin/grouper-autocomplete.js"])
+
+
 class VersionContentChoiceField(forms.ModelChoiceField):
     """Form field used to display a list of grouper instances"""
 
     def __init__(self, *args, model=None, admin_site=None, **kwargs):
         self.language = kwargs.pop("language")
         self.predefined_label_method = kwargs.pop("option_label_override")
-        if getattr(admin_site._registry.get(model), "search_fields", []):
+        versionable = versionables.for_content(model)
+        if versionable.version_model_proxy in admin_site._registry:
+            # Search the groupers using the version admin's paginated endpoint
+            kwargs.setdefault("widget", GrouperAutocompleteSelect(
+                model._meta.get_field(versionable.grouper_field_name),
+                admin_site=admin_site,
+                version_model=versionable.version_model_proxy,
+                language=self.language,
+            ))
+        elif getattr(admin_site._registry.get(model), "search_fields", []):
             # If the model is registered in the admin, use the autocomplete widget
             kwargs.setdefault("widget", VersionAutocompleteSelect(
                 model._meta.get_field(versionables.for_content(model).grouper_field_name),
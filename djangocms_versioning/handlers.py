@@ -10,9 +10,12 @@ from cms.operations import (
     PASTE_PLACEHOLDER,
     PASTE_PLUGIN,
 )
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models.signals import post_save
 from django.utils import timezone
 
-from .models import Version
+from . import conf
+from .models import Version, get_author_sort_key
 from .versionables import _cms_extension
 
 
@@ -34,6 +37,38 @@ def update_modified_date(sender, **kwargs):
     _update_modified(kwargs["instance"])
 
 
+def _extension_models_for(content_model, extension_model=BaseExtension):
+    """Yields all concrete (and proxy) subclasses of ``extension_model`` whose
+    ``extended_object`` points to ``content_model``"""
+    for subclass in extension_model.__subclasses__():
+        if not subclass._meta.abstract:
+            try:
+                field = subclass._meta.get_field("extended_object")
+            except FieldDoesNotExist:
+                field = None
+            if field is not None and field.related_model is content_model:
+                yield subclass
+        yield from _extension_models_for(content_model, subclass)
+
+
+def connect_modified_date_receivers(content_model):
+    """Connects the ``update_modified_date`` receiver to the ``post_save`` signal
+    of a versioned content model and of all extensions of that content model.
+
+    Receivers are connected per sender so that saving models unrelated to
+    versioning does not run the handler at all."""
+    for sender in (content_model, *_extension_models_for(content_model)):
+        post_save.connect(update_modified_date, sender=sender, dispatch_uid="versioning")
+
+
+def update_author_sort_keys(sender, instance, created=False, update_fields=None, **kwargs):
+    """Keeps the author sort key of the versions of a user in sync with the user name"""
+    if created or (update_fields is not None and conf.USERNAME_FIELD not in update_fields):
+        return
+    sort_key = get_author_sort_key(instance)
+    Version.objects.filter(created_by=instance).exclude(author_sort_key=sort_key).update(author_sort_key=sort_key)
+
+
 def update_modified_date_for_pagecontent(sender, **kwargs):
     instance = kwargs["obj"].get_content_obj()
     _update_modified(instance)
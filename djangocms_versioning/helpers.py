@@ -4,7 +4,7 @@ import copy
 import warnings
 from collections.abc import Iterable
 from contextlib import contextmanager
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
 
 from cms.models import Page, PageContent, Placeholder
 from cms.toolbar.utils import get_object_edit_url, get_object_preview_url
@@ -15,15 +15,19 @@ from django.contrib import admin
 from django.contrib.contenttypes.fields import GenericRelation
 from django.contrib.contenttypes.models import ContentType
 from django.core.mail import EmailMessage
-from django.db import models
+from django.db import models, transaction
 from django.http import HttpRequest
 from django.template.loader import render_to_string
+from django.utils import timezone
 from django.utils.encoding import force_str
 from django.utils.translation import get_language, override as force_language
 
-from . import versionables
+from . import conf, constants, versionables
 from .conf import EMAIL_NOTIFICATIONS_FAIL_SILENTLY
 from .constants import DRAFT, PUBLISHED
+from .metrics import measure
+from .operations import dispatch
+from .placeholder_checks import get_placeholder_check_results
 
 if TYPE_CHECKING:
     from .models import Version
@@ -277,13 +281,7 @@ def is_content_editable(placeholder: Placeholder, user: models.Model) -> bool:
     :param user: user object
     :return: Boolean
     """
-    try:
-        versionables.for_content(placeholder.source)
-    except KeyError:
-        return True
-
-    version = get_version_for_content(placeholder.source)
-    return version.state == DRAFT
+    return get_placeholder_check_results(placeholder, user)[0]
 
 
 def get_editable_url(content_obj, force_admin=False, params=None):
@@ -304,19 +302,53 @@ def get_editable_url(content_obj, force_admin=False, params=None):
     return url
 
 
+# Process-wide caches of content type ids, see get_content_type_id. Content
+# types are not looked up in VersioningCMSExtension.configure_app since the
+# database must not be accessed while apps are being loaded.
+_content_type_ids: dict[tuple, int] = {}
+_models_with_subclasses: dict[tuple, tuple[type[models.Model], ...]] = {}
+
+
+def clear_content_type_cache(**kwargs) -> None:
+    """Clears the cached content type ids, e.g., after the content types have been
+    recreated by a migration or a database flush."""
+    _content_type_ids.clear()
+
+
+def get_content_type_id(model: type[models.Model], for_concrete_model: bool = True, using: str | None = None) -> int:
+    """Returns the primary key of the content type of ``model`` (or of a model
+    instance). Ids are cached for the lifetime of the process."""
+    if isinstance(model, models.Model):
+        model = type(model)
+    key = (model, for_concrete_model, using)
+    try:
+        return _content_type_ids[key]
+    except KeyError:
+        content_type = ContentType.objects.db_manager(using).get_for_model(model, for_concrete_model=for_concrete_model)
+        return _content_type_ids.setdefault(key, content_type.pk)
+
+
+def get_models_with_subclasses(models: Iterable[type[models.Model]]) -> tuple[type[models.Model], ...]:
+    """Returns the given models together with all their (recursive) subclasses."""
+    key = tuple(models)
+    if key not in _models_with_subclasses:
+        result = []
+        for model in key:
+            result.append(model)
+            subclasses = model.__subclasses__()
+            if subclasses:
+                result.extend(get_models_with_subclasses(subclasses))
+        _models_with_subclasses[key] = tuple(result)
+    return _models_with_subclasses[key]
+
+
 # TODO Based on polymorphic.query_translate._get_mro_content_type_ids,
 # can use that when polymorphic gets a new release
 def get_content_types_with_subclasses(models: Iterable[type[models.Model]], using=None) -> set[int]:
-    content_types = set()
-    for model in models:
-        content_type = ContentType.objects.db_manager(using).get_for_model(
-            model, for_concrete_model=False
-        )
-        content_types.add(content_type.pk)
-        subclasses = model.__subclasses__()
-        if subclasses:
-            content_types.update(get_content_types_with_subclasses(subclasses, using))
-    return content_types
+    return {
+        get_content_type_id(model, for_concrete_model=False, using=using)
+        for model in get_models_with_subclasses(models)
+    }
 
 
 def get_preview_url(
@@ -370,9 +402,59 @@ def get_latest_admin_viewable_content(
     """
     Return the latest Draft or Published PageContent using the draft where possible
     """
+    if hasattr(grouper, "_prefetched_contents"):
+        _check_grouping_fields(grouper, extra_grouping_fields)
+        return get_latest_content_from_cache(
+            grouper._prefetched_contents, include_unpublished_archived, **extra_grouping_fields
+        )
+    return _latest_admin_viewable_queryset(grouper, include_unpublished_archived, extra_grouping_fields).first()
+
+
+async def aget_latest_admin_viewable_content(
+    grouper: models.Model,
+    include_unpublished_archived: bool = False,
+    **extra_grouping_fields,
+) -> models.Model:
+    """Async version of :func:`get_latest_admin_viewable_content`"""
+    if hasattr(grouper, "_prefetched_contents"):
+        _check_grouping_fields(grouper, extra_grouping_fields)
+        return get_latest_content_from_cache(
+            grouper._prefetched_contents, include_unpublished_archived, **extra_grouping_fields
+        )
+    return await _latest_admin_viewable_queryset(
+        grouper, include_unpublished_archived, extra_grouping_fields
+    ).afirst()
+
+
+def get_latest_admin_viewable_contents(
+    grouper: models.Model,
+    include_unpublished_archived: bool = False,
+    key: str = "language",
+) -> dict[Any, models.Model]:
+    """
+    Return the latest Draft or Published content objects of the grouper for all
+    values of the extra grouping field ``key`` (e.g., all languages of a page)
+    with a single query. Returns a dict mapping the field's values to the content
+    objects, see :func:`get_latest_admin_viewable_content`.
+    """
+    if hasattr(grouper, "_prefetched_contents"):
+        values = dict.fromkeys(getattr(content, key) for content in grouper._prefetched_contents)
+        contents = {
+            value: get_latest_content_from_cache(
+                grouper._prefetched_contents, include_unpublished_archived, **{key: value}
+            )
+            for value in values
+        }
+        return {value: content for value, content in contents.items() if content is not None}
     versionable = versionables.for_grouper(grouper)
+    qs = getattr(grouper, versionable.grouper_field.remote_field.get_accessor_name())(manager="admin_manager")
+    qs = qs.latest_content() if include_unpublished_archived else qs.current_content()
+    return {getattr(content, key): content for content in qs}
 
+
+def _check_grouping_fields(grouper: models.Model, extra_grouping_fields: dict) -> None:
     # Check if all required grouping fields are given to be able to select the latest admin viewable content
+    versionable = versionables.for_grouper(grouper)
     missing_fields = [
         field
         for field in versionable.extra_grouping_fields
@@ -383,10 +465,12 @@ def get_latest_admin_viewable_content(
             f"Grouping field(s) {missing_fields} required for {versionable.grouper_model}."
         )
 
-    if hasattr(grouper, "_prefetched_contents"):
-        return get_latest_content_from_cache(
-            grouper._prefetched_contents, include_unpublished_archived, **extra_grouping_fields
-        )
+
+def _latest_admin_viewable_queryset(
+    grouper: models.Model, include_unpublished_archived: bool, extra_grouping_fields: dict
+) -> models.QuerySet:
+    _check_grouping_fields(grouper, extra_grouping_fields)
+    versionable = versionables.for_grouper(grouper)
 
     # Get the name of the content_set (e.g., "pagecontent_set") from the versionable
     content_set = versionable.grouper_field.remote_field.get_accessor_name()
@@ -396,9 +480,9 @@ def get_latest_admin_viewable_content(
 
     if include_unpublished_archived:
         # Relevant for admin to see e.g., the latest unpublished or archived versions
-        return qs.filter(**extra_grouping_fields).latest_content().first()
+        return qs.filter(**extra_grouping_fields).latest_content()
     # Return only active versions, e.g., for copying
-    return qs.filter(**extra_grouping_fields).current_content().first()
+    return qs.filter(**extra_grouping_fields).current_content()
 
 
 def get_latest_content_from_cache(
@@ -453,30 +537,81 @@ def proxy_model(obj: models.Model, content_model: type) -> models.Model:
     return obj_
 
 
-def create_version_lock(version, user):
+def create_version_lock(version, user, changed_by=None):
     """
-    Create a version lock if necessary
+    Create (or renew) a version lock if necessary. Only the lock fields of the
+    version are written. ``changed_by`` is the user recorded in the change feed
+    (defaults to ``user``).
     """
-    changed = version.locked_by != user
-    version.locked_by = user
-    version.save()
-    if changed and emit_content_change:
-        emit_content_change(version.content)
+    from .models import StateTracking, get_lock_expiry
+
+    previous = (version.locked_by_id, version.is_locked())
+    with measure("operation", version, operation="lock" if user else "unlock"):
+        version.locked_by = user
+        version.locked_until = get_lock_expiry() if user else None
+        version.save(update_fields=["locked_by", "locked_until"])
+    # Only drafts store locks: compare with what was saved, not what was asked for
+    if (version.locked_by_id, version.is_locked()) != previous:
+        StateTracking.record(
+            version, constants.EVENT_LOCKED if user else constants.EVENT_UNLOCKED, changed_by or user
+        )
+        if emit_content_change:
+            dispatch(version._content_change_key, emit_content_change, version.content)
     return version
 
 
-def remove_version_lock(version):
+def remove_version_lock(version, user=None):
+    """
+    Delete a version lock, handles when there are none available. ``user`` is the
+    user removing the lock (recorded in the change feed).
+    """
+    return create_version_lock(version, None, changed_by=user)
+
+
+def renew_version_lock(version_id, user):
+    """
+    Extends the lock of a draft version held by ``user`` (the heartbeat of the
+    editing UI) using a single query.
+
+    :return: Until when the lock lasts (``None`` if locks do not expire), or
+        ``False`` if ``user`` does not hold the lock (anymore)
+    """
+    from .models import Version, get_lock_expiry
+
+    expiry = get_lock_expiry()
+    renewed = Version.objects.filter(
+        pk=version_id, state=DRAFT, locked_by=user,
+    ).exclude(locked_until__lte=timezone.now()).update(locked_until=expiry)
+    return expiry if renewed else False
+
+
+def release_expired_version_locks(dry_run: bool = False) -> int:
     """
-    Delete a version lock, handles when there are none available.
+    Removes all expired version locks with a single query. No notifications
+    are sent: expired locks do not prevent editing anyway.
+
+    :return: The number of released locks
     """
-    return create_version_lock(version, None)
+    from .models import StateTracking, Version
+
+    expired = Version.objects.filter(locked_until__lte=timezone.now())
+    if dry_run:
+        return expired.count()
+    if not conf.CHANGE_FEED:
+        return expired.update(locked_by=None, locked_until=None)
+    with transaction.atomic():
+        versions = list(expired.select_for_update().only("pk", "content_type_id", "state"))
+        StateTracking.objects.record_in_bulk(versions, constants.EVENT_UNLOCKED)
+        return Version.objects.filter(pk__in=[version.pk for version in versions]).update(
+            locked_by=None, locked_until=None
+        )
 
 
 def version_is_locked(version) -> settings.AUTH_USER_MODEL:
     """
-    Determine if a version is locked
+    Determine if a version is locked, returns the user holding an unexpired lock
     """
-    return version.locked_by
+    return version.locked_by if version.is_locked() else None
 
 
 def version_is_unlocked_for_user(version, user: settings.AUTH_USER_MODEL) -> bool:
@@ -509,20 +644,37 @@ def placeholder_content_is_unlocked_for_user(
     """Check if lock doesn't exist or placeholder source object
     is locked to provided user.
     """
-    content = placeholder.source
-    return content_is_unlocked_for_user(content, user)
+    from .models import Version
+
+    try:
+        return get_placeholder_check_results(placeholder, user)[1]
+    except Version.DoesNotExist:
+        return True
 
 
 def send_email(
     recipients: list, subject: str, template: str, template_context: dict
 ) -> int:
     """
-    Send emails using locking templates
+    Send emails using locking templates. If the DJANGOCMS_VERSIONING_EMAIL_OUTBOX
+    setting is set, the email is queued to be sent by the send_queued_emails
+    management command instead.
     """
     template = f"djangocms_versioning/emails/{template}"
     subject = force_str(subject)
     content = render_to_string(template, template_context)
 
+    if conf.EMAIL_OUTBOX:
+        from .models import QueuedEmail
+
+        QueuedEmail.objects.create(
+            subject=subject,
+            body=content,
+            from_email=settings.DEFAULT_FROM_EMAIL,
+            recipients=list(recipients),
+        )
+        return 1
+
     message = EmailMessage(
         subject=subject,
         body=content,
@@ -0,0 +1,199 @@
+from __future__ import annotations
+
+from itertools import islice
+
+from django.db import models, transaction
+from django.db.models.functions import RowNumber
+
+from . import conf, constants
+from .models import StateTracking, Version, VersionSummary
+from .pruning import deleting_versions_allowed
+
+#: Checks performed by :func:`check_versionable`
+CHECKS = (
+    "multiple_drafts",
+    "multiple_published",
+    "content_without_version",
+    "version_without_content",
+    "duplicate_numbers",
+)
+
+
+def _chunked(iterable, size):
+    iterator = iter(iterable)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def groupings_with_multiple(versionable, state: str) -> models.QuerySet:
+    """Returns the grouping values (and the number of versions) of all groupings
+    with more than one version in ``state``."""
+    return (
+        versionable.content_model.admin_manager.filter(versions__state=state)
+        .values(*versionable.grouping_fields)
+        .annotate(version_count=models.Count("versions__pk"))
+        .filter(version_count__gt=1)
+        .order_by()
+    )
+
+
+def surplus_versions(versionable, state: str) -> models.QuerySet:
+    """Returns the pks of all versions in ``state`` except for the most recent one
+    of each grouping."""
+    return (
+        versionable.content_model.admin_manager.filter(versions__state=state)
+        .annotate(
+            rank=models.Window(
+                RowNumber(),
+                partition_by=[models.F(field) for field in versionable.grouping_fields],
+                order_by=models.F("versions__pk").desc(),
+            )
+        )
+        .filter(rank__gt=1)
+        .values_list("versions__pk", flat=True)
+    )
+
+
+def content_without_version(versionable) -> models.QuerySet:
+    """Returns the pks of all content objects without a version."""
+    return (
+        versionable.content_model._base_manager.filter(versions__isnull=True)
+        .values_list("pk", flat=True)
+        .order_by("pk")
+    )
+
+
+def version_without_content(versionable) -> models.QuerySet:
+    """Returns the pks of all versions whose content object does not exist."""
+    return (
+        Version.objects.filter(content_type__in=versionable.content_types)
+        .exclude(object_id__in=versionable.content_model._base_manager.values("pk"))
+        .values_list("pk", flat=True)
+        .order_by("pk")
+    )
+
+
+def groupings_with_duplicate_numbers(versionable) -> models.QuerySet:
+    """Returns the grouping values of all groupings in which two or more versions
+    share a version number."""
+    return (
+        versionable.content_model.admin_manager.filter(versions__isnull=False)
+        .values(*versionable.grouping_fields)
+        .annotate(
+            version_count=models.Count("versions__pk"),
+            number_count=models.Count("versions__number", distinct=True),
+        )
+        .filter(version_count__gt=models.F("number_count"))
+        .order_by()
+    )
+
+
+def _fix_multiple(versionable, state, target_state, batch_size):
+    fixed = 0
+    for chunk in _chunked(surplus_versions(versionable, state).iterator(), batch_size):
+        with transaction.atomic():
+            fixed += Version.objects.filter(pk__in=chunk).update(
+                state=target_state, locked_by=None, locked_until=None
+            )
+            StateTracking.objects.record_in_bulk(
+                Version.objects.filter(pk__in=chunk).only("pk", "content_type_id", "state"),
+                constants.EVENT_TRANSITION,
+                old_state=state,
+            )
+            if conf.VERSION_SUMMARY:
+                VersionSummary.objects.refresh_for_contents(
+                    versionable, Version.objects.filter(pk__in=chunk).values("object_id")
+                )
+    return fixed
+
+
+def _fix_version_without_content(versionable, batch_size):
+    fixed = 0
+    for chunk in _chunked(version_without_content(versionable).iterator(), batch_size):
+        with transaction.atomic():
+            Version.objects.filter(source__in=chunk).update(source=None)
+            fixed += len(chunk)
+            Version.objects.filter(pk__in=chunk).delete()
+            if conf.VERSION_SUMMARY:
+                VersionSummary.objects.refresh_referencing(versionable, chunk)
+    return fixed
+
+
+def _fix_duplicate_numbers(versionable, batch_size):
+    """Assigns new numbers (above the highest number of the grouping) to all but
+    the oldest of the versions sharing a number."""
+    grouping_fields = list(versionable.grouping_fields)
+    fixed = 0
+    for groupings in _chunked(groupings_with_duplicate_numbers(versionable).iterator(), batch_size):
+        changed = []
+        for grouping in groupings:
+            content_objects = versionable.for_grouping_values(
+                **{field: grouping[field] for field in grouping_fields}
+            )
+            versions = list(
+                Version.objects.filter(
+                    content_type__in=versionable.content_types, object_id__in=content_objects
+                ).only("pk", "number").order_by("pk")
+            )
+            highest = max((int(version.number) for version in versions if version.number.isdigit()), default=0)
+            seen = set()
+            for version in versions:
+                if version.number in seen:
+                    highest += 1
+                    version.number = str(highest)
+                    changed.append(version)
+                seen.add(version.number)
+        with transaction.atomic():
+            Version.objects.bulk_update(changed, ["number"])
+        fixed += len(changed)
+    return fixed
+
+
+def check_versionable(versionable, fix: bool = False, limit: int = 100, batch_size: int = 1000) -> dict:
+    """Checks the versions of a versionable for broken invariants and optionally
+    repairs them using bulk updates.
+
+    :param versionable: VersionableItem instance
+    :param fix: Repair the problems found where possible
+    :param limit: Maximum number of examples reported per check
+    :param batch_size: Maximum number of rows updated per query when fixing
+    :return: A dict with an entry for each check containing the number of problems
+        found, up to ``limit`` examples and, if ``fix`` is set, the number of fixed
+        rows (``None`` if the problem cannot be fixed automatically)
+
+    Fixes archive all but the most recent draft of a grouping, unpublish all but the
+    most recent published version of a grouping, delete versions without content
+    object, and renumber versions with duplicate numbers. Versions without content
+    object are only deleted if the ``DJANGOCMS_VERSIONING_ALLOW_DELETING_VERSIONS``
+    setting permits deleting versions. Content objects without a version are not
+    fixed: use the ``create_versions`` management command.
+    """
+    queries = {
+        "multiple_drafts": groupings_with_multiple(versionable, constants.DRAFT),
+        "multiple_published": groupings_with_multiple(versionable, constants.PUBLISHED),
+        "content_without_version": content_without_version(versionable),
+        "version_without_content": version_without_content(versionable),
+        "duplicate_numbers": groupings_with_duplicate_numbers(versionable),
+    }
+    fixes = {
+        "multiple_drafts": lambda: _fix_multiple(versionable, constants.DRAFT, constants.ARCHIVED, batch_size),
+        "multiple_published": lambda: _fix_multiple(
+            versionable, constants.PUBLISHED, constants.UNPUBLISHED, batch_size
+        ),
+        "duplicate_numbers": lambda: _fix_duplicate_numbers(versionable, batch_size),
+    }
+    if deleting_versions_allowed():
+        fixes["version_without_content"] = lambda: _fix_version_without_content(versionable, batch_size)
+    report = {}
+    for check in CHECKS:
+        queryset = queries[check]
+        count = queryset.count()
+        report[check] = {"count": count, "examples": list(queryset[:limit])}
+        if fix:
+            if not count:
+                report[check]["fixed"] = 0
+            elif check in fixes:
+                report[check]["fixed"] = fixes[check]()
+            else:
+                report[check]["fixed"] = None
+    return report
@@ -0,0 +1,63 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+from django.core.serializers.json import DjangoJSONEncoder
+
+from djangocms_versioning import versionables
+from djangocms_versioning.integrity import check_versionable
+from djangocms_versioning.routing import read_routing_scope
+
+
+class Command(BaseCommand):
+    help = "Checks the versioning invariants (at most one draft and one published version per grouping, " \
+           "a version for each content object, a content object for each version, unique version numbers) " \
+           "and writes a JSON report. With --fix the problems found are repaired where possible."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--fix",
+            action="store_true",
+            help="Repair the problems found using bulk updates",
+        )
+        parser.add_argument(
+            "--model",
+            action="append",
+            metavar="APP_LABEL.MODEL",
+            help="Only check this content model, can be given more than once "
+                 "(defaults to all versioned content models)",
+        )
+        parser.add_argument(
+            "--limit",
+            type=int,
+            default=100,
+            help="Maximum number of examples reported per check (defaults to 100)",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Maximum number of rows updated per query when fixing (defaults to 1000)",
+        )
+        parser.add_argument(
+            "--indent",
+            type=int,
+            help="Indentation of the JSON report (defaults to a single line)",
+        )
+
+    @read_routing_scope()
+    def handle(self, *args, **options):
+        try:
+            to_check = versionables.for_content_labels(options["model"])
+        except LookupError as err:
+            raise CommandError(str(err)) from err
+
+        report = {"ok": True, "models": {}}
+        for versionable in to_check:
+            result = check_versionable(
+                versionable, fix=options["fix"], limit=options["limit"], batch_size=options["batch_size"]
+            )
+            report["models"][versionable.content_model._meta.label] = result
+            for check in result.values():
+                if check["count"] and check.get("fixed") is None:
+                    report["ok"] = False
+        self.stdout.write(json.dumps(report, cls=DjangoJSONEncoder, indent=options["indent"]))
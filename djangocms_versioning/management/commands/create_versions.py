@@ -1,14 +1,43 @@
+import math
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from django.apps import apps
 from django.contrib.auth import get_user_model
-from django.contrib.contenttypes.models import ContentType
 from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, connections, models, transaction
+from django.db.models.functions import Cast
 
-from djangocms_versioning import constants
-from djangocms_versioning.conf import DEFAULT_USER, USERNAME_FIELD
-from djangocms_versioning.models import Version
+from djangocms_versioning import conf, constants
+from djangocms_versioning.conf import DEFAULT_USER, LOCK_VERSIONS, USERNAME_FIELD
+from djangocms_versioning.helpers import get_content_type_id
+from djangocms_versioning.models import StateTracking, Version, VersionSummary, get_author_sort_key, get_lock_expiry
+from djangocms_versioning.routing import read_routing_scope
 from djangocms_versioning.versionables import _cms_extension
 
 User = get_user_model()
 
+#: Options passed on to parallel jobs
+JOB_OPTIONS = ("state", "dry_run", "bulk", "batch_size")
+
+
+def _init_worker():  # pragma: no cover
+    """Initializes a worker process of the process pool: Sets up django if the
+    process has been spawned and makes sure the worker opens its own database
+    connections."""
+    if not apps.ready:
+        import django
+
+        django.setup()
+    connections.close_all()
+
+
+def _create_versions_job(index, bounds, user_pk, options):  # pragma: no cover
+    """Entry point for a job of the process pool"""
+    user = User.objects.get(pk=user_pk) if user_pk is not None else None
+    return Command().run_job(index, bounds, user, options)
+
 
 class Command(BaseCommand):
     help = 'Creates Version objects for versioned models lacking one. If the DJANGOCMS_VERSIONING_DEFAULT_USER ' \
@@ -41,6 +70,25 @@ class Command(BaseCommand):
             action="store_true",
             help="Do not change the database",
         )
+        parser.add_argument(
+            "--bulk",
+            action="store_true",
+            help="Stream content objects in batches and create Version objects using bulk inserts. "
+                 "No version operation signals are sent and no on_draft_create hooks are called.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Number of Version objects created (and committed) per batch in bulk mode (defaults to 1000)",
+        )
+        parser.add_argument(
+            "--jobs",
+            type=int,
+            default=1,
+            help="Number of worker processes. Versionables and chunks of groupers within a versionable "
+                 "are processed in parallel, each worker using its own database connection (defaults to 1)",
+        )
 
     @staticmethod
     def get_user(options):
@@ -67,56 +115,256 @@ class Command(BaseCommand):
                 raise CommandError(f"No user with name {options['username']} found") from err
         return None  # pragma: no cover
 
+    @read_routing_scope()
     def handle(self, *args, **options):
         user = self.get_user(options)
+        jobs = []
 
-        for versionable in _cms_extension().versionables:
+        for index, versionable in enumerate(_cms_extension().versionables):
             Model = versionable.content_model
-            content_type = ContentType.objects.get_for_model(Model)
-            version_ids = Version.objects.filter(content_type_id=content_type.pk).values_list("object_id", flat=True)
+            content_type_id = get_content_type_id(Model)
+            version_ids = Version.objects.filter(content_type_id=content_type_id).values_list("object_id", flat=True)
             unversioned = Model.admin_manager.exclude(pk__in=version_ids).order_by("-pk")
+            missing = unversioned.count()
             self.stdout.write(self.style.NOTICE(
-                f"{len(version_ids) + len(unversioned)} objects of type {Model.__name__}, thereof "
-                f"{len(unversioned)} missing Version object"
+                f"{Model.admin_manager.count()} objects of type {Model.__name__}, thereof "
+                f"{missing} missing Version object"
             ))
-            if user is None and not options["dry_run"] and unversioned:  # pragma: no cover
+            if user is None and not options["dry_run"] and missing:  # pragma: no cover
                 raise CommandError("Please specify a user which missing Version objects shall belong to "
                                    "either with the DJANGOCMS_VERSIONING_DEFAULT_USER setting or using "
                                    "command line arguments")
+            if not missing:
+                continue
+
+            if options["jobs"] > 1:
+                jobs += [
+                    (index, bounds) for bounds in self.get_grouper_chunks(versionable, unversioned, options["jobs"])
+                ]
+            elif options["bulk"]:
+                self.create_versions_in_bulk(versionable, content_type_id, unversioned, missing, user, options)
+            else:
+                self.create_versions(versionable, content_type_id, unversioned, user, options)
+
+        if jobs:
+            self.run_jobs(jobs, user, options)
+
+    @staticmethod
+    def get_grouper_chunks(versionable, unversioned, jobs):
+        """Splits the groupers of all orphans into chunks of consecutive grouper ids.
+        Since groupings never span groupers, each chunk can be processed independently.
+
+        Returns a list of (first grouper id, last grouper id) tuples.
+        """
+        field = versionable.grouper_field.attname
+        grouper_ids = unversioned.order_by(field).values_list(field, flat=True).distinct()
+        # Create more chunks than jobs to balance the load between the workers
+        chunk_size = math.ceil(grouper_ids.count() / (jobs * 4))
+        chunks, chunk = [], []
+        for grouper_id in grouper_ids.iterator():
+            chunk.append(grouper_id)
+            if len(chunk) >= chunk_size:
+                chunks.append((chunk[0], chunk[-1]))
+                chunk = []
+        if chunk:
+            chunks.append((chunk[0], chunk[-1]))
+        return chunks
 
-            for orphan in unversioned:
-                # find all model instances that belong to the same grouper
-                selectors = {versionable.grouper_field_name: getattr(orphan, versionable.grouper_field_name)}
-                for extra_selector in versionable.extra_grouping_fields:
-                    selectors[extra_selector] = getattr(orphan, extra_selector)
-                same_grouper_ids = Model.admin_manager.filter(**selectors).values_list("pk", flat=True)
-                # get all existing version objects
-                existing_versions = Version.objects.filter(content_type=content_type, object_id__in=same_grouper_ids)
-                # target state
-                state = options["state"]
-                # change to "archived" if state already exists
-                if state != constants.ARCHIVED:
-                    for version in existing_versions:
-                        if version.state == state:
-                            state = constants.ARCHIVED
-                            break
-
-                if options["dry_run"]:  # pragma: no cover
-                    # Only write out change
-                    self.stdout.write(self.style.NOTICE(
-                        f"{str(orphan)} (pk={orphan.pk}) would be assigned a Version object with state {state}"
+    def run_job(self, index, bounds, user, options):
+        """Creates the missing Version objects for the versionable at position ``index``
+        limited to groupers with ids within ``bounds``.
+
+        Returns a tuple of a description of the job, the number of orphans
+        processed, and the time taken.
+        """
+        started = time.monotonic()
+        versionable = _cms_extension().versionables[index]
+        Model = versionable.content_model
+        content_type_id = get_content_type_id(Model)
+        field = versionable.grouper_field.attname
+        version_ids = Version.objects.filter(content_type_id=content_type_id).values_list("object_id", flat=True)
+        unversioned = Model.admin_manager.exclude(pk__in=version_ids).filter(
+            **{f"{field}__gte": bounds[0], f"{field}__lte": bounds[1]}
+        ).order_by("-pk")
+        missing = unversioned.count()
+        if options["bulk"]:
+            self.create_versions_in_bulk(versionable, content_type_id, unversioned, missing, user, options)
+        else:
+            self.create_versions(versionable, content_type_id, unversioned, user, options)
+        label = f"{Model.__name__} ({field} {bounds[0]}-{bounds[1]}, worker {os.getpid()})"
+        return label, missing, time.monotonic() - started
+
+    def run_jobs(self, jobs, user, options):
+        """Runs the jobs in a process pool and reports their progress."""
+        job_options = {key: options[key] for key in JOB_OPTIONS}
+        user_pk = user.pk if user is not None else None
+        # Worker processes cannot see an in-memory database or uncommitted data
+        if (connection.vendor == "sqlite" and connection.is_in_memory_db()) or connection.in_atomic_block:
+            self.stdout.write(self.style.WARNING(
+                "Parallel jobs need a database shared between processes and cannot see uncommitted data: "
+                "running jobs in this process"
+            ))
+            results = (self.run_job(index, bounds, user, job_options) for index, bounds in jobs)
+            self.report_jobs(results, len(jobs))
+            return
+
+        # Each worker must open its own database connections
+        connections.close_all()
+        with ProcessPoolExecutor(max_workers=options["jobs"], initializer=_init_worker) as pool:  # pragma: no cover
+            futures = [
+                pool.submit(_create_versions_job, index, bounds, user_pk, job_options)
+                for index, bounds in jobs
+            ]
+            try:
+                self.report_jobs((future.result() for future in as_completed(futures)), len(jobs))
+            except Exception as e:
+                for future in futures:
+                    future.cancel()
+                raise CommandError(f"Failed creating version objects: {e}") from e
+
+    def report_jobs(self, results, total):
+        started = time.monotonic()
+        processed = 0
+        for done, (label, count, elapsed) in enumerate(results, start=1):
+            processed += count
+            throughput = processed / max(time.monotonic() - started, 1e-6)
+            self.stdout.write(self.style.SUCCESS(
+                f"[{done}/{total}] {label}: {count} objects processed in {elapsed:.1f}s "
+                f"(total {processed}, {throughput:.0f}/s)"
+            ))
+
+    def create_versions(self, versionable, content_type_id, unversioned, user, options):
+        """Creates one Version object per orphan using Version.objects.create"""
+        Model = versionable.content_model
+        for orphan in unversioned:
+            # find all model instances that belong to the same grouper
+            selectors = {versionable.grouper_field_name: getattr(orphan, versionable.grouper_field_name)}
+            for extra_selector in versionable.extra_grouping_fields:
+                selectors[extra_selector] = getattr(orphan, extra_selector)
+            same_grouper_ids = Model.admin_manager.filter(**selectors).values_list("pk", flat=True)
+            # get all existing version objects
+            existing_versions = Version.objects.filter(content_type_id=content_type_id, object_id__in=same_grouper_ids)
+            # target state
+            state = options["state"]
+            # change to "archived" if state already exists
+            if state != constants.ARCHIVED:
+                for version in existing_versions:
+                    if version.state == state:
+                        state = constants.ARCHIVED
+                        break
+
+            if options["dry_run"]:  # pragma: no cover
+                # Only write out change
+                self.stdout.write(self.style.NOTICE(
+                    f"{str(orphan)} (pk={orphan.pk}) would be assigned a Version object with state {state}"
+                ))
+            else:
+                try:
+                    Version.objects.create(
+                        content=orphan,
+                        state=state,
+                        created_by=user,
+                    )
+                    self.stdout.write(self.style.SUCCESS(
+                        f"Successfully created version object for {Model.__name__} with pk={orphan.pk}"
+                    ))
+                except Exception as e:  # pragma: no cover
+                    self.stdout.write(self.style.ERROR(
+                        f"Failed creating version object for {Model.__name__} with pk={orphan.pk}: {e}"
                     ))
-                else:
-                    try:
-                        Version.objects.create(
-                            content=orphan,
-                            state=state,
-                            created_by=user,
+
+    @staticmethod
+    def get_grouping_state(versionable, state):
+        """Returns the grouping keys which already have a version in ``state``
+        and the highest version number for each grouping key with existing versions.
+
+        Grouping keys are tuples of the grouping field values in the order of
+        ``versionable.grouping_fields``.
+        """
+        Model = versionable.content_model
+        grouping_fields = list(versionable.grouping_fields)
+        taken = set()
+        if state != constants.ARCHIVED:
+            taken = set(
+                Model.admin_manager.filter(versions__state=state)
+                .values_list(*grouping_fields)
+                .distinct()
+                .iterator()
+            )
+        numbers = {
+            tuple(row[field] for field in grouping_fields): row["max_number"]
+            for row in Model.admin_manager.filter(versions__isnull=False)
+            .values(*grouping_fields)
+            .annotate(max_number=models.Max(Cast("versions__number", models.IntegerField())))
+            .iterator()
+        }
+        return taken, numbers
+
+    def create_versions_in_bulk(self, versionable, content_type_id, unversioned, missing, user, options):
+        """Streams orphans in chunks and creates their Version objects with bulk_create,
+        committing after each batch.
+
+        Target states and version numbers are worked out per grouping in memory and
+        lead to the same result as creating the versions one by one.
+        """
+        Model = versionable.content_model
+        batch_size = options["batch_size"]
+        state = options["state"]
+        taken, numbers = self.get_grouping_state(versionable, state)
+        # bulk_create does not call Version.save
+        author_sort_key = get_author_sort_key(user)
+
+        started = time.monotonic()
+        processed = 0
+        states = dict.fromkeys((state, constants.ARCHIVED), 0)
+        batch = []
+
+        def flush():
+            if not options["dry_run"]:
+                with transaction.atomic():
+                    Version.objects.bulk_create(batch)
+                    # Not all databases return the pks of bulk inserted rows
+                    StateTracking.objects.record_in_bulk(
+                        Version.objects.filter(
+                            content_type_id=content_type_id, object_id__in=[version.object_id for version in batch]
+                        ).only("pk", "content_type_id", "state"),
+                        constants.EVENT_CREATED,
+                        user=user,
+                    )
+                    if conf.VERSION_SUMMARY:
+                        VersionSummary.objects.refresh_for_contents(
+                            versionable, [version.object_id for version in batch]
                         )
-                        self.stdout.write(self.style.SUCCESS(
-                            f"Successfully created version object for {Model.__name__} with pk={orphan.pk}"
-                        ))
-                    except Exception as e:  # pragma: no cover
-                        self.stdout.write(self.style.ERROR(
-                            f"Failed creating version object for {Model.__name__} with pk={orphan.pk}: {e}"
-                        ))
+            elapsed = max(time.monotonic() - started, 1e-6)
+            self.stdout.write(self.style.SUCCESS(
+                f"{'Checked' if options['dry_run'] else 'Created'} {processed}/{missing} version objects "
+                f"for {Model.__name__} ({processed / elapsed:.0f}/s)"
+            ))
+            batch.clear()
+
+        for orphan in unversioned.iterator(chunk_size=batch_size):
+            key = tuple(versionable.grouping_values(orphan).values())
+            target_state = constants.ARCHIVED if key in taken else state
+            taken.add(key)
+            number = numbers.get(key, 0) + 1
+            numbers[key] = number
+            locked_by = user if LOCK_VERSIONS and target_state == constants.DRAFT else None
+            batch.append(Version(
+                content_type_id=content_type_id,
+                object_id=orphan.pk,
+                state=target_state,
+                number=number,
+                created_by=user,
+                author_sort_key=author_sort_key,
+                locked_by=locked_by,
+                locked_until=get_lock_expiry() if locked_by else None,
+            ))
+            states[target_state] += 1
+            processed += 1
+            if len(batch) >= batch_size:
+                flush()
+        if batch:
+            flush()
+        self.stdout.write(self.style.SUCCESS(
+            f"{Model.__name__}: " + ", ".join(f"{count} {key}" for key, count in states.items())
+        ))
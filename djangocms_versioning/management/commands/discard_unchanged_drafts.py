@@ -0,0 +1,66 @@
+from datetime import timedelta
+
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management.base import BaseCommand, CommandError
+
+from djangocms_versioning import versionables
+from djangocms_versioning.pruning import discard_unchanged_drafts
+from djangocms_versioning.routing import read_routing_scope
+
+
+class Command(BaseCommand):
+    help = "Deletes drafts which were created by editing published content but have never been changed, " \
+           "together with their content objects, placeholders and plugins. Only saving the content object " \
+           "or its extensions and plugin or placeholder operations count as changes, not writes to other " \
+           "related models. Drafts with an unexpired lock are kept. Requires the " \
+           "DJANGOCMS_VERSIONING_ALLOW_DELETING_VERSIONS setting to allow deleting versions."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--older-than",
+            type=int,
+            default=24,
+            metavar="HOURS",
+            help="Only delete drafts created more than HOURS hours ago (defaults to 24)",
+        )
+        parser.add_argument(
+            "--model",
+            action="append",
+            metavar="APP_LABEL.MODEL",
+            help="Only discard drafts of this content model, can be given more than once "
+                 "(defaults to all versioned content models)",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Maximum number of drafts deleted (and committed) per batch (defaults to 500)",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Do not change the database",
+        )
+
+    @read_routing_scope()
+    def handle(self, *args, **options):
+        try:
+            to_discard = versionables.for_content_labels(options["model"])
+        except LookupError as err:
+            raise CommandError(str(err)) from err
+
+        for versionable in to_discard:
+            name = versionable.content_model.__name__
+            try:
+                count = discard_unchanged_drafts(
+                    versionable,
+                    older_than=timedelta(hours=options["older_than"]),
+                    batch_size=options["batch_size"],
+                    dry_run=options["dry_run"],
+                )
+            except ImproperlyConfigured as err:
+                raise CommandError(str(err)) from err
+            if options["dry_run"]:
+                self.stdout.write(self.style.NOTICE(f"{count} unchanged drafts of {name} would be deleted"))
+            else:
+                self.stdout.write(self.style.SUCCESS(f"Successfully deleted {count} unchanged drafts of {name}"))
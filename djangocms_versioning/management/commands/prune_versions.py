@@ -0,0 +1,87 @@
+from datetime import timedelta
+
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management.base import BaseCommand, CommandError
+
+from djangocms_versioning import constants, versionables
+from djangocms_versioning.pruning import prune_versions
+from djangocms_versioning.routing import read_routing_scope
+
+
+class Command(BaseCommand):
+    help = "Deletes archived (and optionally unpublished) versions together with their content objects, " \
+           "placeholders and plugins according to retention policies. Requires the " \
+           "DJANGOCMS_VERSIONING_ALLOW_DELETING_VERSIONS setting to allow deleting versions. " \
+           "The most recent version of each grouping is never deleted."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--keep",
+            type=int,
+            help="Number of most recent versions to keep per grouping",
+        )
+        parser.add_argument(
+            "--older-than",
+            type=int,
+            metavar="DAYS",
+            help="Only delete versions last modified more than DAYS days ago",
+        )
+        parser.add_argument(
+            "--state",
+            action="append",
+            choices=[constants.ARCHIVED, constants.UNPUBLISHED],
+            help=f"State of versions to delete, can be given more than once (defaults to {constants.ARCHIVED})",
+        )
+        parser.add_argument(
+            "--model",
+            action="append",
+            metavar="APP_LABEL.MODEL",
+            help="Only prune versions of this content model, can be given more than once "
+                 "(defaults to all versioned content models)",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Maximum number of versions deleted (and committed) per batch (defaults to 500)",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Do not change the database",
+        )
+
+    @read_routing_scope()
+    def handle(self, *args, **options):
+        if options["keep"] is None and options["older_than"] is None:
+            raise CommandError("Please specify a retention policy using --keep and/or --older-than")
+        older_than = timedelta(days=options["older_than"]) if options["older_than"] is not None else None
+        states = options["state"] or [constants.ARCHIVED]
+
+        try:
+            to_prune = versionables.for_content_labels(options["model"])
+        except LookupError as err:
+            raise CommandError(str(err)) from err
+
+        for versionable in to_prune:
+            Model = versionable.content_model
+
+            def report(deleted, Model=Model):
+                self.stdout.write(self.style.NOTICE(f"Deleted {deleted} versions of {Model.__name__}"))
+
+            try:
+                count = prune_versions(
+                    versionable,
+                    keep=options["keep"],
+                    older_than=older_than,
+                    states=states,
+                    batch_size=options["batch_size"],
+                    dry_run=options["dry_run"],
+                    callback=report,
+                )
+            except ImproperlyConfigured as err:
+                raise CommandError(str(err)) from err
+            if options["dry_run"]:
+                self.stdout.write(self.style.NOTICE(f"{count} versions of {Model.__name__} would be deleted"))
+            else:
+                self.stdout.write(self.style.SUCCESS(f"Successfully deleted {count} versions of {Model.__name__}"))
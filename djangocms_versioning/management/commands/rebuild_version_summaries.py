@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from djangocms_versioning import versionables
+from djangocms_versioning.models import VersionSummary
+
+
+class Command(BaseCommand):
+    help = "Recomputes the version summary of every grouping, e.g., after enabling the " \
+           "DJANGOCMS_VERSIONING_VERSION_SUMMARY setting or after creating versions in bulk."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--model",
+            action="append",
+            metavar="APP_LABEL.MODEL",
+            help="Only rebuild the summaries of this content model, can be given more than once "
+                 "(defaults to all versioned content models)",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            to_rebuild = versionables.for_content_labels(options["model"])
+        except LookupError as err:
+            raise CommandError(str(err)) from err
+
+        for versionable in to_rebuild:
+            count = VersionSummary.objects.rebuild(versionable)
+            self.stdout.write(
+                self.style.SUCCESS(f"Rebuilt {count} version summaries of {versionable.content_model.__name__}")
+            )
@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+
+from djangocms_versioning.helpers import release_expired_version_locks
+
+
+class Command(BaseCommand):
+    help = "Removes expired version locks (see the DJANGOCMS_VERSIONING_LOCK_TTL setting) in bulk. " \
+           "No notification emails are sent."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Do not change the database",
+        )
+
+    def handle(self, *args, **options):
+        count = release_expired_version_locks(dry_run=options["dry_run"])
+        if options["dry_run"]:
+            self.stdout.write(self.style.NOTICE(f"{count} expired version locks would be released"))
+        else:
+            self.stdout.write(self.style.SUCCESS(f"Released {count} expired version locks"))
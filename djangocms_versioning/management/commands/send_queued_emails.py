@@ -0,0 +1,71 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from djangocms_versioning.emails import send_queued_emails
+
+
+class Command(BaseCommand):
+    help = "Sends the notification emails queued in the outbox (see the DJANGOCMS_VERSIONING_EMAIL_OUTBOX " \
+           "setting) in batches, each over a single connection. Failed emails are retried with " \
+           "exponential backoff."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=100,
+            help="Maximum number of emails sent per connection (defaults to 100)",
+        )
+        parser.add_argument(
+            "--max-attempts",
+            type=int,
+            default=5,
+            help="Give up on an email after this many failed attempts (defaults to 5)",
+        )
+        parser.add_argument(
+            "--backoff",
+            type=int,
+            default=60,
+            metavar="SECONDS",
+            help="Delay before the first retry, doubled with each further attempt (defaults to 60)",
+        )
+        parser.add_argument(
+            "--lease",
+            type=int,
+            default=300,
+            metavar="SECONDS",
+            help="Time a batch is reserved for this worker while it is sent, after which unsent emails "
+                 "of a crashed worker are sent again (defaults to 300)",
+        )
+        parser.add_argument(
+            "--loop",
+            action="store_true",
+            help="Keep running as a worker, checking for queued emails every --interval seconds",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=10,
+            metavar="SECONDS",
+            help="Time to wait for new emails when the outbox is empty in --loop mode (defaults to 10)",
+        )
+
+    def handle(self, *args, **options):
+        total_sent = total_failed = 0
+        while True:
+            sent, failed = send_queued_emails(
+                batch_size=options["batch_size"],
+                max_attempts=options["max_attempts"],
+                backoff=options["backoff"],
+                lease=options["lease"],
+            )
+            total_sent += sent
+            total_failed += failed
+            if sent or failed:
+                self.stdout.write(self.style.NOTICE(f"Sent {sent} emails, {failed} failed"))
+            if sent + failed < options["batch_size"]:
+                if not options["loop"]:
+                    break
+                time.sleep(options["interval"])  # pragma: no cover
+        self.stdout.write(self.style.SUCCESS(f"Sent {total_sent} queued emails, {total_failed} failed"))
@@ -0,0 +1,67 @@
+import json
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+
+from djangocms_versioning import versionables
+from djangocms_versioning.models import StateTracking
+
+
+class Command(BaseCommand):
+    help = "Writes the changes of versions recorded after a cursor as JSON lines, oldest first. " \
+           "Store the cursor of the last line to continue from there."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--since",
+            type=int,
+            metavar="CURSOR",
+            help="Only write changes recorded after this cursor (defaults to all changes)",
+        )
+        parser.add_argument(
+            "--model",
+            action="append",
+            metavar="APP_LABEL.MODEL",
+            help="Only write changes of this content model, can be given more than once "
+                 "(defaults to all versioned content models)",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Number of changes read per query",
+        )
+        parser.add_argument(
+            "--lag",
+            type=float,
+            metavar="SECONDS",
+            help="Leave out the changes recorded during the last SECONDS, so that changes of "
+                 "transactions still running are not skipped (defaults to no lag)",
+        )
+        parser.add_argument(
+            "--limit",
+            type=int,
+            help="Maximum number of changes to write",
+        )
+
+    def handle(self, *args, **options):
+        models = None
+        if options["model"]:
+            try:
+                models = [
+                    versionable.content_model for versionable in versionables.for_content_labels(options["model"])
+                ]
+            except LookupError as err:
+                raise CommandError(str(err)) from err
+        if options["batch_size"] < 1:
+            raise CommandError("--batch-size must be positive")
+
+        batch_size = options["batch_size"]
+        if options["limit"] is not None:
+            batch_size = max(1, min(batch_size, options["limit"]))
+        lag = timedelta(seconds=options["lag"]) if options["lag"] is not None else None
+        changes = StateTracking.objects.iter_changes(options["since"], models, batch_size=batch_size, lag=lag)
+        for count, change in enumerate(changes):
+            if options["limit"] is not None and count >= options["limit"]:
+                break
+            self.stdout.write(json.dumps(change))
@@ -1,12 +1,14 @@
 import warnings
 from copy import copy
 
+from asgiref.sync import sync_to_async
 from django.contrib.auth import get_user_model
 from django.db import models
 
 from . import constants
 from .constants import PUBLISHED
 from .models import Version
+from .routing import PUBLISHED_HINT
 
 
 class PublishedContentManagerMixin:
@@ -19,7 +21,10 @@ class PublishedContentManagerMixin:
         queryset = super().get_queryset()
         if not self.versioning_enabled:
             return queryset
-        return queryset.filter(versions__state=PUBLISHED)
+        queryset = queryset.filter(versions__state=PUBLISHED)
+        # Allows the ReadReplicaRouter to send reads to the read replica
+        queryset._add_hints(**{PUBLISHED_HINT: True})
+        return queryset
 
     def create(self, *args, **kwargs):
         obj = super().create(*args, **kwargs)
@@ -37,6 +42,10 @@ class PublishedContentManagerMixin:
             )
         return obj
 
+    async def acreate(self, *args, **kwargs):
+        # Django's acreate bypasses the manager's create method
+        return await sync_to_async(self.create)(*args, **kwargs)
+
     def with_user(self, user):
         if not isinstance(user, get_user_model()) and user is not None:
             import inspect
@@ -108,6 +117,14 @@ class AdminQuerySetMixin:
                   )
         return self.filter(versions__pk__in=latest, **kwargs)
 
+    async def acurrent_content(self, **kwargs) -> list:
+        """Async version of :meth:`current_content` returning a list of content objects"""
+        return [content async for content in self.current_content(**kwargs)]
+
+    async def alatest_content(self, **kwargs) -> list:
+        """Async version of :meth:`latest_content` returning a list of content objects"""
+        return [content async for content in self.latest_content(**kwargs)]
+
 
 class AdminManagerMixin:
     versioning_enabled = True
@@ -135,3 +152,11 @@ class AdminManagerMixin:
     def latest_content(self, **kwargs):  # pragma: no cover
         """Syntactic sugar: admin_manager.latest_content()"""
         return self.get_queryset().latest_content(**kwargs)
+
+    async def acurrent_content(self, **kwargs):  # pragma: no cover
+        """Syntactic sugar: await admin_manager.acurrent_content()"""
+        return await self.get_queryset().acurrent_content(**kwargs)
+
+    async def alatest_content(self, **kwargs):  # pragma: no cover
+        """Syntactic sugar: await admin_manager.alatest_content()"""
+        return await self.get_queryset().alatest_content(**kwargs)
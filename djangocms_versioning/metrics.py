@@ -0,0 +1,154 @@
+"""Timing and query count metrics for version operations.
+
+Each version operation (``publish``, ``unpublish``, ``archive``, ``draft``
+creation, ``copy``, ``lock`` and ``unlock``), each hook (``on_publish`` and the
+others) and each sending of the version operation signals is measured and
+reported to the backend configured by ``DJANGOCMS_VERSIONING_METRICS_BACKEND``:
+
+* ``versioning.operation.duration`` / ``versioning.operation.queries``
+  tagged with ``operation``
+* ``versioning.hook.duration`` / ``versioning.hook.queries``
+  tagged with ``hook``
+* ``versioning.signal.duration`` / ``versioning.signal.queries``
+  tagged with ``signal`` and ``operation``
+
+All metrics are tagged with the ``content_type`` (``app_label.model``) of the
+version. Durations are reported in milliseconds. Nothing is measured if no
+backend is configured.
+"""
+from __future__ import annotations
+
+import functools
+import logging
+import socket
+import time
+from contextlib import ExitStack, contextmanager
+
+from django.contrib.contenttypes.models import ContentType
+from django.db import connections
+from django.utils.module_loading import import_string
+
+from . import conf
+
+logger = logging.getLogger(__name__)
+
+PREFIX = "versioning"
+
+_backends = {}
+
+
+class BaseMetricsBackend:
+    """Interface of metrics backends"""
+
+    def timing(self, name: str, value: float, tags: dict):
+        """Reports a duration in milliseconds"""
+        raise NotImplementedError  # pragma: no cover
+
+    def histogram(self, name: str, value: float, tags: dict):
+        """Reports a value, e.g., a number of queries"""
+        raise NotImplementedError  # pragma: no cover
+
+
+class InMemoryMetricsBackend(BaseMetricsBackend):
+    """Keeps all metrics in memory, e.g., for tests or for inspection in a shell"""
+
+    def __init__(self):
+        self.records = []
+
+    def timing(self, name, value, tags):
+        self.records.append(("timing", name, value, tags))
+
+    def histogram(self, name, value, tags):
+        self.records.append(("histogram", name, value, tags))
+
+    def values(self, name: str, **tags) -> list:
+        """Returns the values reported for ``name`` with (at least) the given tags"""
+        return [
+            value for _kind, record_name, value, record_tags in self.records
+            if record_name == name and tags.items() <= record_tags.items()
+        ]
+
+    def reset(self):
+        self.records = []
+
+
+class StatsdMetricsBackend(BaseMetricsBackend):
+    """Sends metrics over UDP using the statsd line protocol with DogStatsD tags.
+    Errors sending metrics are logged and otherwise ignored."""
+
+    def __init__(self, host: str = "localhost", port: int = 8125, prefix: str = ""):
+        self.address = (host, port)
+        self.prefix = prefix
+        self.socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+
+    def _send(self, name, value, kind, tags):
+        line = f"{self.prefix}{name}:{value:g}|{kind}"
+        if tags:
+            line += "|#" + ",".join(f"{key}:{tag}" for key, tag in tags.items())
+        try:
+            self.socket.sendto(line.encode(), self.address)
+        except OSError as err:
+            logger.debug("Sending metric %s failed: %s", name, err)
+
+    def timing(self, name, value, tags):
+        self._send(name, value, "ms", tags)
+
+    def histogram(self, name, value, tags):
+        self._send(name, value, "h", tags)
+
+
+def get_metrics_backend() -> BaseMetricsBackend | None:
+    """Returns the (shared) instance of the backend configured by the
+    ``DJANGOCMS_VERSIONING_METRICS_BACKEND`` setting or ``None``"""
+    path = conf.METRICS_BACKEND
+    if not path:
+        return None
+    if path not in _backends:
+        _backends[path] = import_string(path)(**conf.METRICS_OPTIONS)
+    return _backends[path]
+
+
+class _QueryCounter:
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+@contextmanager
+def measure(kind: str, version, **tags):
+    """Context manager reporting the duration and the number of queries of its block
+    as ``versioning.<kind>.duration`` and ``versioning.<kind>.queries``. The block's
+    metrics are reported even if it raises an exception."""
+    backend = get_metrics_backend()
+    if backend is None:
+        yield
+        return
+
+    content_type = ContentType.objects.get_for_id(version.content_type_id)
+    tags = {"content_type": f"{content_type.app_label}.{content_type.model}", **tags}
+    counter = _QueryCounter()
+    with ExitStack() as stack:
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(counter))
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            duration = time.perf_counter() - start
+            backend.timing(f"{PREFIX}.{kind}.duration", duration * 1000, tags)
+            backend.histogram(f"{PREFIX}.{kind}.queries", counter.count, tags)
+
+
+def measure_operation(operation: str):
+    """Decorator measuring a method of :class:`~djangocms_versioning.models.Version`
+    as ``operation``"""
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(version, *args, **kwargs):
+            with measure("operation", version, operation=operation):
+                return method(version, *args, **kwargs)
+        return wrapper
+    return decorator
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.18 on 2026-10-18 21:57
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('djangocms_versioning', '0018_fix_typo'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='QueuedEmail',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('subject', models.TextField(verbose_name='subject')),
+                ('body', models.TextField(verbose_name='body')),
+                ('from_email', models.CharField(max_length=254, verbose_name='from')),
+                ('recipients', models.JSONField(verbose_name='recipients')),
+                ('created', models.DateTimeField(auto_now_add=True, verbose_name='created')),
+                ('attempts', models.PositiveIntegerField(default=0, verbose_name='attempts')),
+                ('next_attempt', models.DateTimeField(db_index=True, default=django.utils.timezone.now, verbose_name='next attempt')),
+                ('last_error', models.TextField(blank=True, verbose_name='last error')),
+            ],
+            options={
+                'verbose_name': 'queued email',
+                'verbose_name_plural': 'queued emails',
+                'ordering': ('next_attempt', 'pk'),
+            },
+        ),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 5.2.18 on 2026-10-18 22:37
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+from django.db.models.functions import Left, Lower
+
+
+def forwards(apps, schema_editor):
+    """Computes the author sort key of existing versions"""
+    Version = apps.get_model("djangocms_versioning", "Version")
+    User = apps.get_model(settings.AUTH_USER_MODEL)
+    username_field = getattr(settings, "DJANGOCMS_VERSIONING_USERNAME_FIELD", "username")
+    usernames = User.objects.filter(pk=OuterRef("created_by_id")).values(username_field)[:1]
+    Version.objects.using(schema_editor.connection.alias).update(
+        author_sort_key=Left(Lower(Subquery(usernames)), 255)
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contenttypes', '0002_remove_content_type_name'),
+        ('djangocms_versioning', '0020_versionsummary'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='version',
+            name='author_sort_key',
+            field=models.CharField(blank=True, editable=False, max_length=255),
+        ),
+        migrations.RunPython(forwards, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='version',
+            index=models.Index(fields=['content_type', 'author_sort_key'], name='djangocms_v_content_8de927_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='version',
+            index=models.Index(fields=['content_type', 'modified'], name='djangocms_v_content_643969_idx'),
+        ),
+    ]
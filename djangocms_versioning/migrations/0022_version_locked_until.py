@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 22:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('djangocms_versioning', '0021_version_author_sort_key'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='version',
+            name='locked_until',
+            field=models.DateTimeField(blank=True, db_index=True, default=None, editable=False, null=True, verbose_name='locked until'),
+        ),
+    ]
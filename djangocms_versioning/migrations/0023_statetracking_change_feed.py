@@ -0,0 +1,51 @@
+# Generated by Django 5.2.18 on 2026-10-18 22:52
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+def forwards(apps, schema_editor):
+    """Copies the content type of existing state changes from their versions"""
+    StateTracking = apps.get_model("djangocms_versioning", "StateTracking")
+    Version = apps.get_model("djangocms_versioning", "Version")
+    content_types = Version.objects.filter(pk=OuterRef("version_id")).values("content_type_id")[:1]
+    StateTracking.objects.using(schema_editor.connection.alias).update(content_type_id=Subquery(content_types))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contenttypes', '0002_remove_content_type_name'),
+        ('djangocms_versioning', '0022_version_locked_until'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='statetracking',
+            name='content_type',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='contenttypes.contenttype'),
+        ),
+        migrations.RunPython(forwards, migrations.RunPython.noop),
+        migrations.AddField(
+            model_name='statetracking',
+            name='event',
+            field=models.CharField(choices=[('created', 'Created'), ('transition', 'State transition'), ('locked', 'Locked'), ('unlocked', 'Unlocked')], default='transition', max_length=20),
+        ),
+        migrations.AlterField(
+            model_name='statetracking',
+            name='old_state',
+            field=models.CharField(blank=True, choices=[('draft', 'Draft'), ('published', 'Published'), ('unpublished', 'Unpublished'), ('archived', 'Archived')], max_length=100),
+        ),
+        migrations.AlterField(
+            model_name='statetracking',
+            name='user',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddIndex(
+            model_name='statetracking',
+            index=models.Index(fields=['content_type', 'id'], name='djangocms_v_content_08290f_idx'),
+        ),
+    ]
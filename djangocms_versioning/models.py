@@ -1,5 +1,8 @@
 import copy
+import json
+from datetime import timedelta
 
+from asgiref.sync import sync_to_async
 from django.conf import settings
 from django.contrib.contenttypes.fields import GenericForeignKey
 from django.contrib.contenttypes.models import ContentType
@@ -9,19 +12,23 @@ from django.utils.formats import localize
 from django.utils.translation import gettext_lazy as _
 from django_fsm import FSMField, can_proceed, transition
 
-from . import constants, versionables
+from . import conf, constants, versionables
 from .conditions import (
     Conditions,
     draft_is_locked,
     draft_is_not_locked,
     in_state,
     is_not_locked,
+    rollback_is_enabled,
     user_can_change,
     user_can_publish,
     user_can_unlock,
 )
 from .conf import ALLOW_DELETING_VERSIONS, LOCK_VERSIONS
-from .operations import send_post_version_operation, send_pre_version_operation
+from .metrics import measure, measure_operation
+from .operations import dispatch, send_post_version_operation, send_pre_version_operation
+from .placeholder_checks import clear_placeholder_check_cache
+from .routing import pin_to_primary
 
 try:
     from djangocms_internalsearch.helpers import emit_content_change
@@ -35,6 +42,21 @@ lock_draft_error_message = _("The draft version is locked by {user}")
 change_permission_error = _("You do not have change permissions")
 permission_error_message = _("You do not have permission to perform this action")
 
+AUTHOR_SORT_KEY_LENGTH = 255
+
+
+def get_lock_expiry():
+    """Returns until when a lock taken (or renewed) now lasts, ``None`` if locks
+    do not expire (see ``DJANGOCMS_VERSIONING_LOCK_TTL``)"""
+    if conf.LOCK_TTL:
+        return timezone.now() + timedelta(seconds=conf.LOCK_TTL)
+    return None
+
+
+def get_author_sort_key(user) -> str:
+    """Returns the case-insensitive key of ``user`` versions are sorted by author with"""
+    return str(getattr(user, conf.USERNAME_FIELD, "") or "").lower()[:AUTHOR_SORT_KEY_LENGTH]
+
 
 def PROTECT_IF_PUBLIC_VERSION(collector, field, sub_objs, using):
     public_objs = sub_objs.filter(state=constants.PUBLISHED)
@@ -64,13 +86,30 @@ class VersionQuerySet(models.QuerySet):
         if hasattr(content_object, "_version_cache"):
             return content_object._version_cache
         versionable = versionables.for_content(content_object)
-        version = self.get(
+        queryset = self._chain()
+        # Read the version from the same database as the content object
+        queryset._add_hints(instance=content_object)
+        version = queryset.get(
             object_id=content_object.pk, content_type__in=versionable.content_types
         )
         version._state.fields_cache["content"] = content_object
         content_object._version_cache = version
         return version
 
+    async def aget_for_content(self, content_object):
+        """Async version of :meth:`get_for_content`"""
+        if hasattr(content_object, "_version_cache"):
+            return content_object._version_cache
+        versionable = versionables.for_content(content_object)
+        queryset = self._chain()
+        queryset._add_hints(instance=content_object)
+        version = await queryset.aget(
+            object_id=content_object.pk, content_type__in=await versionable.acontent_types()
+        )
+        version._state.fields_cache["content"] = content_object
+        content_object._version_cache = version
+        return version
+
     def filter_by_grouper(self, grouper_object):
         """Returns a list of Version objects for the provided grouper
         object
@@ -80,23 +119,25 @@ class VersionQuerySet(models.QuerySet):
             versionable, **{versionable.grouper_field_name: grouper_object}
         )
 
-    def filter_by_grouping_values(self, versionable, **kwargs):
+    def filter_by_grouping_values(self, versionable, using=None, **kwargs):
         """Returns a list of Version objects for the provided grouping
         values (unique grouper version list)
         """
-        content_objects = versionable.for_grouping_values(**kwargs)
-        return self.filter(
+        queryset = self.using(using) if using else self
+        content_objects = versionable.for_grouping_values(using=using or self._db, **kwargs)
+        return queryset.filter(
             object_id__in=content_objects, content_type__in=versionable.content_types
         )
 
-    def filter_by_content_grouping_values(self, content):
+    def filter_by_content_grouping_values(self, content, using=None):
         """Returns a list of Version objects for grouping values taken
         from provided content object. In other words:
         it uses the content instance property values as filter parameters
         """
         versionable = versionables.for_content(content)
-        content_objects = versionable.for_content_grouping_values(content)
-        return self.filter(
+        queryset = self.using(using) if using else self
+        content_objects = versionable.for_content_grouping_values(content, using=using or self._db)
+        return queryset.filter(
             object_id__in=content_objects, content_type__in=versionable.content_types
         )
 
@@ -108,6 +149,8 @@ class Version(models.Model):
     created_by = models.ForeignKey(
         settings.AUTH_USER_MODEL, on_delete=models.PROTECT, verbose_name=_("author")
     )
+    # Lower-cased user name of the author, an indexed sort key for admin changelists
+    author_sort_key = models.CharField(max_length=AUTHOR_SORT_KEY_LENGTH, blank=True, editable=False)
     number = models.CharField(max_length=11, verbose_name="#")
     content_type = models.ForeignKey(
         ContentType,
@@ -130,6 +173,14 @@ class Version(models.Model):
         verbose_name=_("locked by"),
         related_name="locking_users",
     )
+    locked_until = models.DateTimeField(
+        null=True,
+        blank=True,
+        default=None,
+        db_index=True,
+        editable=False,
+        verbose_name=_("locked until"),
+    )
 
     source = models.ForeignKey(
         "self",
@@ -142,10 +193,22 @@ class Version(models.Model):
 
     class Meta:
         unique_together = ("content_type", "object_id")
+        indexes = [
+            # Sorting content changelists by author or modified date
+            models.Index(fields=["content_type", "author_sort_key"]),
+            models.Index(fields=["content_type", "modified"]),
+        ]
         permissions = (
             ("delete_versionlock", "Can unlock version"),
         )
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # The author the stored sort key was computed for
+        instance._author_sort_key_user_id = instance.__dict__.get("created_by_id")
+        return instance
+
     def __str__(self):
         state = dict(constants.VERSION_STATES).get(self.state, self.state)
         if self.object_id:
@@ -169,13 +232,17 @@ class Version(models.Model):
         )
 
     def locked_message(self):
-        if self.locked_by:
+        if self.is_locked():
             return _("Locked by %(user)s") % {"user": self.locked_by}
         return ""
 
+    def is_locked(self) -> bool:
+        """Return ``True`` if this version has a lock which has not expired."""
+        return self.locked_by_id is not None and (self.locked_until is None or self.locked_until > timezone.now())
+
     def is_unlocked_for_user(self, user) -> bool:
-        """Return ``True`` if this version has no lock or is locked to ``user``."""
-        return self.locked_by_id is None or self.locked_by_id == user.pk
+        """Return ``True`` if this version has no (unexpired) lock or is locked to ``user``."""
+        return self.locked_by_id == user.pk or not self.is_locked()
 
     def get_latest_draft_version(self):
         """Return the latest draft version for this version's grouping, caching
@@ -212,6 +279,8 @@ class Version(models.Model):
 
         grouper = self.grouper
         ContentModel = self.content._meta.model
+        versionable = self.versionable
+        grouping_values = versionable.grouping_values(self.content)
 
         grouper_name = get_grouper_name(ContentModel, grouper._meta.model)
         querydict = {f"{grouper_name}__pk": grouper.pk}
@@ -223,9 +292,19 @@ class Version(models.Model):
         if count == 1:
             grouper.delete()
             deleted[1]["last"] = True
+        if conf.VERSION_SUMMARY:
+            VersionSummary.objects.refresh(versionable, **grouping_values)
         return deleted
 
     def save(self, **kwargs):
+        # Subsequent reads need to see the change: do not use a read replica
+        pin_to_primary()
+        if not self.pk:
+            with measure("operation", self, operation="draft"):
+                return self._save(**kwargs)
+        return self._save(**kwargs)
+
+    def _save(self, **kwargs):
         created = not self.pk
         # On version creation
         if created:
@@ -240,12 +319,29 @@ class Version(models.Model):
             if LOCK_VERSIONS and self.locked_by is None:
                 # create a lock
                 self.locked_by = self.created_by
+            if self.locked_by_id is not None:
+                self.locked_until = get_lock_expiry()
         elif self.state != constants.DRAFT:
             # A any other state than draft has no lock, an existing lock should be removed
             self.locked_by = None
+            self.locked_until = None
+        update_fields = kwargs.get("update_fields")
+        if update_fields is None or "created_by" in update_fields:
+            if created or self.created_by_id != getattr(self, "_author_sort_key_user_id", None):
+                self.author_sort_key = get_author_sort_key(self.created_by)
+                self._author_sort_key_user_id = self.created_by_id
+                if update_fields is not None:
+                    kwargs["update_fields"] = {*update_fields, "author_sort_key"}
+
+        # Lock changes neither change the content nor the summary. create_version_lock
+        # emits content changes if the lock holder changes.
+        lock_only = update_fields is not None and {"locked_by", "locked_until"}.issuperset(update_fields)
 
         super().save(**kwargs)
         self._clear_content_version_caches()
+        clear_placeholder_check_cache()
+        if created:
+            StateTracking.record(self, constants.EVENT_CREATED, self.created_by)
         # Only one draft version is allowed per unique grouping values.
         # Set all other drafts to archived
         if self.state == constants.DRAFT:
@@ -262,13 +358,21 @@ class Version(models.Model):
                     version.archive(self.created_by)
                 on_draft_create = self.versionable.on_draft_create
                 if on_draft_create:
-                    on_draft_create(self)
+                    with measure("hook", self, hook="on_draft_create"):
+                        on_draft_create(self)
                 # trigger post operation signal
                 send_post_version_operation(
                     constants.OPERATION_DRAFT, version=self, token=action_token
                 )
-            if emit_content_change:
-                emit_content_change(self.content, created=created)
+            if emit_content_change and not lock_only:
+                dispatch(self._content_change_key, emit_content_change, self.content, created=created)
+        if conf.VERSION_SUMMARY and not lock_only:
+            VersionSummary.objects.refresh_for_version(self)
+
+    @property
+    def _content_change_key(self):
+        """Key to deduplicate deferred emit_content_change calls"""
+        return ("emit_content_change", self.content_type_id, self.object_id)
 
     def make_version_number(self):
         """
@@ -310,6 +414,7 @@ class Version(models.Model):
         """
         return getattr(self.content, self.versionable.grouper_field_name)
 
+    @measure_operation("copy")
     @transaction.atomic
     def copy(self, created_by):
         """Creates a new Version object, with a copy of the related
@@ -333,6 +438,11 @@ class Version(models.Model):
         )
         return new_version
 
+    async def acopy(self, created_by):
+        """Async version of :meth:`copy`. Runs :meth:`copy` (and its transaction) in the
+        thread used for synchronous code since the async ORM does not support transactions."""
+        return await sync_to_async(self.copy)(created_by)
+
     check_archive = Conditions(
         [
             user_can_change(change_permission_error),
@@ -344,6 +454,7 @@ class Version(models.Model):
     def can_be_archived(self):
         return can_proceed(self._set_archive)
 
+    @measure_operation("archive")
     def archive(self, user):
         """Change state to ARCHIVED"""
         # trigger pre operation signal
@@ -361,13 +472,18 @@ class Version(models.Model):
         )
         on_archive = self.versionable.on_archive
         if on_archive:
-            on_archive(self)
+            with measure("hook", self, hook="on_archive"):
+                on_archive(self)
         # trigger post operation signal
         send_post_version_operation(
             constants.OPERATION_ARCHIVE, version=self, token=action_token
         )
         if emit_content_change:
-            emit_content_change(self.content)
+            dispatch(self._content_change_key, emit_content_change, self.content)
+
+    async def aarchive(self, user):
+        """Async version of :meth:`archive`, see :meth:`acopy`"""
+        return await sync_to_async(self.archive)(user)
 
     @transition(
         field=state,
@@ -394,6 +510,7 @@ class Version(models.Model):
     def can_be_published(self):
         return can_proceed(self._set_publish)
 
+    @measure_operation("publish")
     @transaction.atomic
     def publish(self, user):
         """Change state to PUBLISHED and unpublish currently
@@ -406,11 +523,16 @@ class Version(models.Model):
             constants.OPERATION_PUBLISH, version=self
         )
         self._set_publish(user)
+        self._complete_publish(user, constants.DRAFT, action_token)
+
+    def _complete_publish(self, user, old_state, action_token, **signal_kwargs):
+        """Saves the transition to PUBLISHED and unpublishes the previously
+        published version (shared by :meth:`publish` and :meth:`rollback`)"""
         self.modified = timezone.now()
         self.save()
         StateTracking.objects.create(
             version=self,
-            old_state=constants.DRAFT,
+            old_state=old_state,
             new_state=constants.PUBLISHED,
             user=user,
         )
@@ -428,16 +550,22 @@ class Version(models.Model):
             version.unpublish(user, to_be_published=self)
         on_publish = self.versionable.on_publish
         if on_publish:
-            on_publish(self)
+            with measure("hook", self, hook="on_publish"):
+                on_publish(self)
         # trigger post operation signal
         send_post_version_operation(
             constants.OPERATION_PUBLISH,
             version=self,
             token=action_token,
             unpublished=list(to_unpublish),
+            **signal_kwargs,
         )
         if emit_content_change:
-            emit_content_change(self.content)
+            dispatch(self._content_change_key, emit_content_change, self.content)
+
+    async def apublish(self, user):
+        """Async version of :meth:`publish`, see :meth:`acopy`"""
+        return await sync_to_async(self.publish)(user)
 
     @transition(
         field=state,
@@ -454,6 +582,56 @@ class Version(models.Model):
         possible to be left with inconsistent data)"""
         pass
 
+    check_rollback = Conditions(
+        [
+            rollback_is_enabled(_("Instant rollback is not enabled")),
+            user_can_publish(_("You do not have publish permissions")),
+            in_state(
+                [constants.ARCHIVED, constants.UNPUBLISHED],
+                _("Version is not in archived or unpublished state"),
+            ),
+        ]
+    )
+
+    def can_be_rolled_back(self):
+        return can_proceed(self._set_rollback)
+
+    @measure_operation("rollback")
+    @transaction.atomic
+    def rollback(self, user):
+        """Change state of an UNPUBLISHED or ARCHIVED version back to PUBLISHED
+        and unpublish the currently published version
+
+        Unlike reverting, no draft is copied from the version. An existing draft
+        is left untouched. The publish operation signals are sent with
+        ``rollback=True``."""
+        old_state = self.state
+        # trigger pre operation signal
+        action_token = send_pre_version_operation(
+            constants.OPERATION_PUBLISH, version=self, rollback=True
+        )
+        self._set_rollback(user)
+        self._complete_publish(user, old_state, action_token, rollback=True)
+
+    async def arollback(self, user):
+        """Async version of :meth:`rollback`, see :meth:`acopy`"""
+        return await sync_to_async(self.rollback)(user)
+
+    @transition(
+        field=state,
+        source=[constants.ARCHIVED, constants.UNPUBLISHED],
+        target=constants.PUBLISHED,
+        permission=check_rollback.as_bool,
+    )
+    def _set_rollback(self, user):
+        """State machine transition method for moving version
+        from ARCHIVED or UNPUBLISHED back to PUBLISHED state.
+
+        Please refrain from modifying data in this method, as
+        state change is not guaranteed to be saved (making it
+        possible to be left with inconsistent data)"""
+        pass
+
     check_unpublish = Conditions([
         user_can_publish(_("You do not have unpublish permissions")),
         in_state([constants.PUBLISHED], _("Version is not in published state")),
@@ -463,6 +641,7 @@ class Version(models.Model):
     def can_be_unpublished(self):
         return can_proceed(self._set_unpublish)
 
+    @measure_operation("unpublish")
     @transaction.atomic
     def unpublish(self, user, to_be_published=None):
         """Change state to UNPUBLISHED"""
@@ -481,7 +660,8 @@ class Version(models.Model):
         )
         on_unpublish = self.versionable.on_unpublish
         if on_unpublish:
-            on_unpublish(self)
+            with measure("hook", self, hook="on_unpublish"):
+                on_unpublish(self)
         # trigger post operation signal
         send_post_version_operation(
             constants.OPERATION_UNPUBLISH,
@@ -490,7 +670,11 @@ class Version(models.Model):
             to_be_published=to_be_published,
         )
         if emit_content_change:
-            emit_content_change(self.content)
+            dispatch(self._content_change_key, emit_content_change, self.content)
+
+    async def aunpublish(self, user, to_be_published=None):
+        """Async version of :meth:`unpublish`, see :meth:`acopy`"""
+        return await sync_to_async(self.unpublish)(user, to_be_published=to_be_published)
 
     @transition(
         field=state,
@@ -600,9 +784,286 @@ class Version(models.Model):
     )
 
 
+class StateTrackingQuerySet(models.QuerySet):
+    def since(self, cursor=None, models=None, lag=None):
+        """Returns the changes recorded after ``cursor`` (the ``cursor`` of the last
+        change a consumer has processed, ``None`` for all changes) in cursor order,
+        optionally only those of the given content models.
+
+        ``lag`` (a ``timedelta``) leaves out the changes recorded during the last
+        ``lag``, so that changes of transactions still running are not skipped (see
+        :class:`StateTracking`)."""
+        queryset = self.order_by("pk").select_related("version")
+        if cursor is not None:
+            queryset = queryset.filter(pk__gt=cursor)
+        if lag is not None:
+            queryset = queryset.filter(date__lt=timezone.now() - lag)
+        if models:
+            content_types = ContentType.objects.db_manager(self.db).get_for_models(*models).values()
+            queryset = queryset.filter(content_type__in=content_types)
+        return queryset
+
+    def iter_changes(self, cursor=None, models=None, batch_size=1000, lag=None):
+        """Yields the entries (see :meth:`StateTracking.as_change`) of the changes
+        returned by :meth:`since`. Each batch is read by a separate keyset query, so
+        large backlogs are streamed without loading them at once."""
+        while True:
+            batch = list(self.since(cursor, models, lag)[:batch_size])
+            for change in batch:
+                yield change.as_change()
+            if len(batch) < batch_size:
+                return
+            cursor = batch[-1].pk
+
+    def record_in_bulk(self, versions, event, old_state=None, user=None):
+        """Records ``event`` for each of the given versions with a single insert if
+        ``DJANGOCMS_VERSIONING_CHANGE_FEED`` is set, e.g., after the versions have
+        been created or changed in bulk. The versions need to be in their new state;
+        ``old_state`` is their previous state if it changed."""
+        if not conf.CHANGE_FEED:
+            return []
+        return self.bulk_create([
+            StateTracking(
+                version=version,
+                content_type_id=version.content_type_id,
+                event=event,
+                old_state="" if event == constants.EVENT_CREATED else old_state or version.state,
+                new_state=version.state,
+                user=user,
+            )
+            for version in versions
+        ])
+
+
 class StateTracking(models.Model):
+    """Change feed of versions: state transitions and, if ``DJANGOCMS_VERSIONING_CHANGE_FEED``
+    is set, version creation and lock changes. Rows are only ever appended (and deleted
+    with their version), so their primary key is the cursor of the feed.
+
+    Cursors increase in the order changes are recorded, not in the order their
+    transactions commit. A reader may therefore see a change before an earlier
+    change of a transaction still running and move past the earlier one. Reading
+    with a ``lag`` longer than the longest transaction recording changes (see
+    :meth:`StateTrackingQuerySet.since`) guarantees that no committed change is
+    skipped. Without a lag, only changes committed before a read are guaranteed
+    to be complete up to the highest cursor read."""
     version = models.ForeignKey(Version, on_delete=models.CASCADE)
+    # Copied from the version to read the feed of a content model from an index
+    content_type = models.ForeignKey(ContentType, null=True, on_delete=models.CASCADE, related_name="+")
+    event = models.CharField(max_length=20, choices=constants.CHANGE_EVENTS, default=constants.EVENT_TRANSITION)
     date = models.DateTimeField(auto_now_add=True)
-    old_state = models.CharField(max_length=100, choices=constants.VERSION_STATES)
+    old_state = models.CharField(max_length=100, choices=constants.VERSION_STATES, blank=True)
     new_state = models.CharField(max_length=100, choices=constants.VERSION_STATES)
-    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, null=True, on_delete=models.CASCADE)
+
+    objects = StateTrackingQuerySet.as_manager()
+
+    class Meta:
+        indexes = [models.Index(fields=["content_type", "id"])]
+
+    def save(self, **kwargs):
+        if self.content_type_id is None:
+            self.content_type_id = self.version.content_type_id
+        super().save(**kwargs)
+
+    @classmethod
+    def record(cls, version, event, user=None):
+        """Records an event not changing the version's state if
+        ``DJANGOCMS_VERSIONING_CHANGE_FEED`` is set"""
+        if conf.CHANGE_FEED:
+            return cls.objects.create(
+                version=version,
+                event=event,
+                old_state="" if event == constants.EVENT_CREATED else version.state,
+                new_state=version.state,
+                user=user,
+            )
+
+    def as_change(self) -> dict:
+        """Returns the JSON-serializable entry of the change feed"""
+        content_type = ContentType.objects.db_manager(self._state.db).get_for_id(self.content_type_id)
+        return {
+            "cursor": self.pk,
+            "event": self.event,
+            "date": self.date.isoformat(),
+            "content_type": f"{content_type.app_label}.{content_type.model}",
+            "object_id": self.version.object_id,
+            "version": self.version_id,
+            "number": self.version.number,
+            "old_state": self.old_state or None,
+            "new_state": self.new_state,
+            "user": self.user_id,
+        }
+
+
+class VersionSummaryQuerySet(models.QuerySet):
+    def _split_grouping_values(self, versionable, grouping_values):
+        grouping_values = dict(grouping_values)
+        grouper_field = versionable.grouper_field
+        grouper = grouping_values.pop(grouper_field.name, None)
+        if grouper is None:
+            grouper = grouping_values.pop(grouper_field.attname)
+        content_type = ContentType.objects.db_manager(self.db).get_for_model(versionable.content_model)
+        return {
+            "content_type": content_type,
+            "grouper_id": grouper.pk if isinstance(grouper, models.Model) else grouper,
+            "grouping_key": VersionSummary.make_grouping_key(versionable, grouping_values),
+        }
+
+    def for_grouping_values(self, versionable, **kwargs):
+        """Returns the summary of the grouping given by the grouper and the extra
+        grouping values, e.g., ``poll=poll, language="en"``. The grouper can also
+        be given by its primary key or an ``OuterRef``."""
+        return self.filter(**self._split_grouping_values(versionable, kwargs))
+
+    def refresh(self, versionable, **kwargs):
+        """Recomputes the summary of a grouping (given like for :meth:`for_grouping_values`)
+        from its versions. The summary is deleted if the grouping has no versions left.
+
+        :return: The summary or ``None``
+        """
+        lookup = self._split_grouping_values(versionable, kwargs)
+        with transaction.atomic(using=self.db):
+            versions = list(
+                Version.objects.using(self.db)
+                .filter_by_grouping_values(versionable, **kwargs)
+                .order_by("-pk")
+                .only("pk", "state", "created_by_id", "modified")
+            )
+            if not versions:
+                self.filter(**lookup).delete()
+                return None
+            # Same order as latest_content(): draft or published, else the latest version
+            current = next(
+                (version for version in versions if version.state in (constants.DRAFT, constants.PUBLISHED)),
+                versions[0],
+            )
+            summary, _ = self.update_or_create(**lookup, defaults={
+                "draft": next((version for version in versions if version.state == constants.DRAFT), None),
+                "published": next((version for version in versions if version.state == constants.PUBLISHED), None),
+                "state": current.state,
+                "created_by_id": current.created_by_id,
+                "modified": current.modified,
+                "version_count": len(versions),
+            })
+        return summary
+
+    def refresh_for_version(self, version):
+        """Recomputes the summary of the grouping of ``version``"""
+        versionable = version.versionable
+        return self.refresh(versionable, **versionable.grouping_values(version.content))
+
+    def refresh_for_contents(self, versionable, object_ids):
+        """Recomputes the summaries of the groupings of the given content objects (pks
+        or a subquery of pks), e.g., after their versions have been changed in bulk"""
+        groupings = (
+            versionable.content_model._base_manager.using(self.db)
+            .filter(pk__in=object_ids)
+            .values(*versionable.grouping_fields)
+            .order_by()
+            .distinct()
+        )
+        for grouping_values in groupings:
+            self.refresh(versionable, **grouping_values)
+
+    def refresh_referencing(self, versionable, version_pks):
+        """Recomputes the summaries showing one of the given versions as their draft or
+        published version, e.g., after the versions have been deleted without their
+        content objects"""
+        content_type = ContentType.objects.db_manager(self.db).get_for_model(versionable.content_model)
+        summaries = self.filter(
+            models.Q(draft__in=version_pks) | models.Q(published__in=version_pks), content_type=content_type
+        )
+        for summary in summaries:
+            self.refresh(
+                versionable,
+                **{versionable.grouper_field.attname: summary.grouper_id},
+                **json.loads(summary.grouping_key),
+            )
+
+    def rebuild(self, versionable):
+        """Recomputes the summaries of all groupings of a versionable, e.g., after
+        versions have been created or changed in bulk.
+
+        :return: The number of summaries
+        """
+        content_type = ContentType.objects.db_manager(self.db).get_for_model(versionable.content_model)
+        groupings = (
+            versionable.content_model._base_manager.using(self.db)
+            .filter(pk__in=Version.objects.using(self.db).filter(content_type__in=versionable.content_types)
+                    .values("object_id"))
+            .values(*versionable.grouping_fields)
+            .order_by()
+            .distinct()
+        )
+        count = 0
+        with transaction.atomic(using=self.db):
+            self.filter(content_type=content_type).delete()
+            for grouping_values in groupings:
+                self.refresh(versionable, **grouping_values)
+                count += 1
+        return count
+
+
+class VersionSummary(models.Model):
+    """Summary of the versions of one grouping (a grouper and its extra grouping values),
+    kept up to date when versions are saved if the ``DJANGOCMS_VERSIONING_VERSION_SUMMARY``
+    setting is set. State, author and modified date are those of the version of the
+    latest content (see ``latest_content()``)."""
+    content_type = models.ForeignKey(ContentType, on_delete=models.CASCADE)
+    grouper_id = models.PositiveIntegerField()
+    grouping_key = models.CharField(max_length=255, blank=True)
+    # Summaries are refreshed whenever versions are deleted: deleting versions does
+    # not need to update them (which would cost queries in bulk deletions)
+    draft = models.ForeignKey(
+        Version, null=True, on_delete=models.DO_NOTHING, db_constraint=False, related_name="+"
+    )
+    published = models.ForeignKey(
+        Version, null=True, on_delete=models.DO_NOTHING, db_constraint=False, related_name="+"
+    )
+    state = models.CharField(max_length=100, choices=constants.VERSION_STATES)
+    created_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL, null=True, on_delete=models.SET_NULL, related_name="+"
+    )
+    modified = models.DateTimeField()
+    version_count = models.PositiveIntegerField(default=0)
+
+    objects = VersionSummaryQuerySet.as_manager()
+
+    class Meta:
+        unique_together = ("content_type", "grouper_id", "grouping_key")
+
+    def __str__(self):
+        return f"{self.content_type} {self.grouper_id} {self.grouping_key}"
+
+    @staticmethod
+    def make_grouping_key(versionable, grouping_values) -> str:
+        """Returns the canonical representation of the extra grouping values (by field
+        name or attribute name) stored in :attr:`grouping_key`"""
+        key = {}
+        for field_name in versionable.extra_grouping_fields:
+            field = versionable.content_model._meta.get_field(field_name)
+            value = grouping_values[field_name if field_name in grouping_values else field.attname]
+            key[field_name] = str(value.pk if isinstance(value, models.Model) else value)
+        return json.dumps(key, sort_keys=True)
+
+
+class QueuedEmail(models.Model):
+    """Notification email waiting to be sent by the ``send_queued_emails`` management
+    command (see the ``DJANGOCMS_VERSIONING_EMAIL_OUTBOX`` setting)"""
+    subject = models.TextField(verbose_name=_("subject"))
+    body = models.TextField(verbose_name=_("body"))
+    from_email = models.CharField(max_length=254, verbose_name=_("from"))
+    recipients = models.JSONField(verbose_name=_("recipients"))
+    created = models.DateTimeField(auto_now_add=True, verbose_name=_("created"))
+    attempts = models.PositiveIntegerField(default=0, verbose_name=_("attempts"))
+    next_attempt = models.DateTimeField(default=timezone.now, db_index=True, verbose_name=_("next attempt"))
+    last_error = models.TextField(blank=True, verbose_name=_("last error"))
+
+    class Meta:
+        verbose_name = _("queued email")
+        verbose_name_plural = _("queued emails")
+        ordering = ("next_attempt", "pk")
+
+    def __str__(self):
+        return self.subject
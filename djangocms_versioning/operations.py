@@ -1,7 +1,63 @@
+import logging
 import uuid
+from concurrent.futures import ThreadPoolExecutor
 
+from django.db import connections, transaction
+
+from . import conf
+from .metrics import measure
 from .signals import post_version_operation, pre_version_operation
 
+logger = logging.getLogger(__name__)
+
+_executors = {}
+
+
+def _get_executor():
+    workers = conf.POST_OPERATION_WORKERS
+    if workers not in _executors:
+        _executors[workers] = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="djangocms_versioning")
+    return _executors[workers]
+
+
+def _run_in_worker(func, *args, **kwargs):
+    try:
+        func(*args, **kwargs)
+    except Exception:
+        logger.exception("Deferred call of %s failed", getattr(func, "__qualname__", func))
+    finally:
+        # Worker threads do not outlive a request like the request thread does
+        connections.close_all()
+
+
+def dispatch(key, func, *args, **kwargs):
+    """Calls ``func(*args, **kwargs)``.
+
+    If the ``DJANGOCMS_VERSIONING_DEFER_POST_OPERATION_SIGNALS`` setting is set
+    and a transaction is in progress, the call is queued until the transaction
+    commits (and dropped if it is rolled back). A call is not queued if a call
+    with the same ``key`` is already queued in the transaction. If
+    ``DJANGOCMS_VERSIONING_POST_OPERATION_WORKERS`` is set, queued calls are made
+    in a worker thread.
+    """
+    if not conf.DEFER_POST_OPERATION_SIGNALS:
+        return func(*args, **kwargs)
+
+    connection = transaction.get_connection()
+    if any(getattr(queued, "key", None) == key for _sids, queued, _robust in connection.run_on_commit):
+        return None
+
+    def deferred():
+        if conf.POST_OPERATION_WORKERS:
+            _get_executor().submit(_run_in_worker, func, *args, **kwargs)
+        else:
+            func(*args, **kwargs)
+
+    deferred.key = key
+    # Errors of receivers are logged: the operation has been committed already
+    transaction.on_commit(deferred, robust=True)
+    return None
+
 
 def send_pre_version_operation(operation, version, **kwargs):
     """
@@ -14,29 +70,36 @@ def send_pre_version_operation(operation, version, **kwargs):
     :return: A unique token for the transaction
     """
     token = str(uuid.uuid4())
-    pre_version_operation.send(
-        sender=version.content_type.model_class(),
-        operation=operation,
-        token=token,
-        obj=version,
-        **kwargs
-    )
+    with measure("signal", version, signal="pre_version_operation", operation=operation):
+        pre_version_operation.send(
+            sender=version.content_type.model_class(),
+            operation=operation,
+            token=token,
+            obj=version,
+            **kwargs
+        )
     return token
 
 
 def send_post_version_operation(operation, version, token, **kwargs):
     """
-    Signal emitter for after a version operation occurs
+    Signal emitter for after a version operation occurs. The signal is sent
+    after the transaction commits if the ``DJANGOCMS_VERSIONING_DEFER_POST_OPERATION_SIGNALS``
+    setting is set (see :func:`dispatch`).
 
     :param operation: Operation constants
     :param version: Version instance
     :param token: A unique token for the transaction
     :param kwargs:
     """
-    post_version_operation.send(
-        sender=version.content_type.model_class(),
-        operation=operation,
-        token=token,
-        obj=version,
-        **kwargs
-    )
+    def send():
+        with measure("signal", version, signal="post_version_operation", operation=operation):
+            post_version_operation.send(
+                sender=version.content_type.model_class(),
+                operation=operation,
+                token=token,
+                obj=version,
+                **kwargs
+            )
+
+    dispatch(("post_version_operation", version.pk, operation), send)
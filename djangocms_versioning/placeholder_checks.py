@@ -0,0 +1,175 @@
+"""Request-scoped cache for the placeholder checks of djangocms-versioning.
+
+django CMS runs the checks ``is_content_editable`` and
+``placeholder_content_is_unlocked_for_user`` for every placeholder, e.g., when
+rendering a page in edit mode. Without a cache, each check resolves the
+placeholder's source object and looks up its version separately. Within
+:func:`placeholder_check_cache`, the version of a source object is looked up
+once, and the results of both checks are computed once per source object and
+user and shared by all placeholders of the object.
+
+The cms toolbar opens the cache while it renders (see
+:class:`PlaceholderCheckCacheToolbarMixin`), which covers edit mode and the
+structure board. Add :class:`PlaceholderCheckCacheMiddleware` to cover
+whole requests::
+
+    MIDDLEWARE = [
+        ...,
+        "djangocms_versioning.placeholder_checks.PlaceholderCheckCacheMiddleware",
+    ]
+
+Outside of a cache scope, the checks behave as before.
+"""
+from __future__ import annotations
+
+from collections import defaultdict
+from collections.abc import Iterable
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import TYPE_CHECKING
+
+from django.contrib.contenttypes.models import ContentType
+from django.db import models
+
+from . import versionables
+from .constants import DRAFT
+
+if TYPE_CHECKING:  # pragma: no cover
+    from cms.models import Placeholder
+
+_cache: ContextVar[dict | None] = ContextVar("djangocms_versioning_placeholder_checks", default=None)
+
+#: Cache value of source objects without a version
+_MISSING = object()
+
+
+@contextmanager
+def placeholder_check_cache():
+    """Caches the versions of placeholder sources until the block is left. Nested
+    blocks share the cache of the outermost block."""
+    if _cache.get() is not None:
+        yield
+        return
+    token = _cache.set({})
+    try:
+        yield
+    finally:
+        _cache.reset(token)
+
+
+def clear_placeholder_check_cache() -> None:
+    """Empties the active cache, e.g., after a version has been changed."""
+    cache = _cache.get()
+    if cache:
+        cache.clear()
+
+
+class PlaceholderCheckCacheMiddleware:
+    """Shares the versions of placeholder sources between all placeholder checks
+    of a request (see :func:`placeholder_check_cache`)."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with placeholder_check_cache():
+            return self.get_response(request)
+
+
+class PlaceholderCheckCacheToolbarMixin:
+    """Mixin for the cms toolbar sharing the versions of placeholder sources between
+    all placeholder checks run while the toolbar renders, i.e., for every placeholder
+    of a page in edit mode and of the structure board."""
+
+    def render(self):
+        with placeholder_check_cache():
+            return super().render()
+
+    def render_with_structure(self, context, nodelist):
+        with placeholder_check_cache():
+            return super().render_with_structure(context, nodelist)
+
+
+def prime_placeholder_check_cache(contents: Iterable[models.Model]) -> None:
+    """Loads the versions of the given content objects (the sources of placeholders)
+    into the active cache with one query per versioned content model. Versions
+    already cached on a content object are used without a query."""
+    cache = _cache.get()
+    if cache is None:
+        return
+    from .helpers import get_content_type_id
+    from .models import Version
+
+    to_load = defaultdict(dict)
+    for content in contents:
+        key = (get_content_type_id(content), content.pk)
+        if key in cache:
+            continue
+        if not versionables.exists_for_content(content):
+            cache[key] = None
+        elif hasattr(content, "_version_cache"):
+            cache[key] = content._version_cache
+        else:
+            to_load[versionables.for_content(content)][content.pk] = key
+    for versionable, keys in to_load.items():
+        versions = Version.objects.filter(content_type__in=versionable.content_types, object_id__in=keys)
+        for version in versions:
+            key = keys.pop(version.object_id, None)
+            if key is not None:
+                cache[key] = version
+        for key in keys.values():
+            cache[key] = _MISSING
+
+
+def get_placeholder_source_version(placeholder: Placeholder):
+    """Returns the version of the placeholder's source object or ``None`` if the
+    source is not versioned. Raises ``Version.DoesNotExist`` if the source has no
+    version."""
+    from .helpers import get_version_for_content
+    from .models import Version
+
+    cache = _cache.get()
+    if cache is None:
+        source = placeholder.source
+        if not versionables.exists_for_content(source):
+            return None
+        return get_version_for_content(source)
+
+    if placeholder.object_id is None:
+        return None
+    key = (placeholder.content_type_id, placeholder.object_id)
+    if key not in cache:
+        # A source object already loaded (e.g., the toolbar's object) may have its version cached
+        source = placeholder._state.fields_cache.get("source")
+        if source is None:
+            model = ContentType.objects.get_for_id(placeholder.content_type_id).model_class()
+            source = model(pk=placeholder.object_id) if model is not None else None
+        if source is None:
+            cache[key] = None
+        else:
+            prime_placeholder_check_cache([source])
+    version = cache[key]
+    if version is _MISSING:
+        raise Version.DoesNotExist
+    return version
+
+
+def get_placeholder_check_results(placeholder: Placeholder, user) -> tuple[bool, bool]:
+    """Returns if the placeholder's source object is a draft (or not versioned) and
+    if it is unlocked for ``user``. Within a cache scope, the results are computed
+    once per source object and user. Raises ``Version.DoesNotExist`` if the source
+    has no version."""
+    cache = _cache.get()
+    key = None
+    if cache is not None and placeholder.object_id is not None:
+        key = (placeholder.content_type_id, placeholder.object_id, getattr(user, "pk", None))
+        if key in cache:
+            return cache[key]
+    version = get_placeholder_source_version(placeholder)
+    if version is None:
+        results = (True, True)
+    else:
+        results = (version.state == DRAFT, version.is_unlocked_for_user(user))
+    if key is not None:
+        cache[key] = results
+    return results
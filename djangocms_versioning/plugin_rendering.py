@@ -5,6 +5,7 @@ from django.utils.functional import cached_property
 
 from . import versionables
 from .constants import DRAFT, PUBLISHED
+from .placeholder_checks import PlaceholderCheckCacheToolbarMixin
 
 
 def prefetch_versioned_related_objects(instance, toolbar):
@@ -75,7 +76,7 @@ class VersionStructureRenderer(StructureRenderer):
         return super().render_plugin(instance, page)
 
 
-class CMSToolbarVersioningMixin:
+class CMSToolbarVersioningMixin(PlaceholderCheckCacheToolbarMixin):
     @cached_property
     def content_renderer(self):
         return VersionContentRenderer(request=self.request)
@@ -0,0 +1,181 @@
+"""Opt-in profiling of the database queries caused by djangocms-versioning.
+
+Queries are attributed to the subsystem of djangocms-versioning whose code
+(directly or indirectly) executed them, e.g., ``"toolbar"``, ``"indicators"``,
+``"handlers"``, ``"plugin_rendering"`` or ``"admin"``. If versioning code is
+nested, the outermost subsystem (the entry point) is used. Queries evaluating
+querysets of versioned content models or of :class:`~djangocms_versioning.models.Version`
+outside of versioning code are attributed to ``"managers"``. All other queries
+are counted as ``"other"``.
+"""
+from __future__ import annotations
+
+import logging
+import sys
+import time
+from collections import defaultdict
+from contextlib import ExitStack, contextmanager
+
+from django.db import connections
+from django.db.models import QuerySet
+
+from . import conf, versionables
+from .models import Version
+
+logger = logging.getLogger(__name__)
+
+_PACKAGE = __name__.rpartition(".")[0]
+#: Subsystem names for modules not named after their subsystem
+_ALIASES = {
+    "cms_toolbars": "toolbar",
+    "cms_menus": "menus",
+}
+_IGNORED = {"metrics", "profiling", "test_utils"}
+
+#: Subsystem of queries not caused by versioning
+OTHER = "other"
+#: Budget key limiting the number of queries of all versioning subsystems together
+TOTAL = "total"
+
+
+def get_subsystem(frame=None) -> str:
+    """Returns the subsystem of djangocms-versioning responsible for code running
+    in ``frame`` (defaults to the caller's frame)."""
+    frame = frame or sys._getframe(1)
+    subsystem = None
+    queryset_model = None
+    while frame is not None:
+        module = frame.f_globals.get("__name__", "")
+        if module.startswith(f"{_PACKAGE}."):
+            name = module.split(".")[1]
+            if name not in _IGNORED:
+                subsystem = _ALIASES.get(name, name)
+        elif queryset_model is None and module == "django.db.models.query":
+            queryset = frame.f_locals.get("self")
+            if isinstance(queryset, QuerySet):
+                queryset_model = queryset.model
+        frame = frame.f_back
+    if subsystem:
+        return subsystem
+    if queryset_model is not None and (
+        queryset_model is Version or versionables.exists_for_content(queryset_model)
+    ):
+        return "managers"
+    return OTHER
+
+
+class QueryProfile:
+    """Counts and times the database queries executed (on any database) while it is
+    active, grouped by subsystem. Use :func:`profile_queries` to activate it."""
+
+    def __init__(self, label: str = "", budgets: dict | None = None):
+        self.label = label
+        self.budgets = conf.QUERY_BUDGETS if budgets is None else budgets
+        self.subsystems = defaultdict(lambda: {"count": 0, "time": 0.0})
+
+    def __call__(self, execute, sql, params, many, context):
+        subsystem = get_subsystem()
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            entry = self.subsystems[subsystem]
+            entry["count"] += 1
+            entry["time"] += time.perf_counter() - start
+
+    @property
+    def total(self) -> dict:
+        """Number and duration of all queries caused by versioning"""
+        entries = [entry for subsystem, entry in self.subsystems.items() if subsystem != OTHER]
+        return {
+            "count": sum(entry["count"] for entry in entries),
+            "time": sum(entry["time"] for entry in entries),
+        }
+
+    def exceeded_budgets(self) -> dict:
+        """Returns the budgets exceeded as a dict mapping the subsystem to a tuple of
+        the number of queries and the budget"""
+        counts = {subsystem: entry["count"] for subsystem, entry in self.subsystems.items()}
+        counts[TOTAL] = self.total["count"]
+        return {
+            subsystem: (counts.get(subsystem, 0), budget)
+            for subsystem, budget in self.budgets.items()
+            if counts.get(subsystem, 0) > budget
+        }
+
+    def summary(self) -> dict:
+        """Returns the profile as a (JSON serializable) dict"""
+        return {
+            "label": self.label,
+            TOTAL: self.total,
+            "subsystems": {subsystem: dict(entry) for subsystem, entry in sorted(self.subsystems.items())},
+            "exceeded": self.exceeded_budgets(),
+        }
+
+    def server_timing(self) -> str:
+        """Returns the profile as value of a ``Server-Timing`` HTTP header"""
+        return ", ".join(
+            f'versioning-{subsystem};desc="{entry["count"]} queries";dur={entry["time"] * 1000:.1f}'
+            for subsystem, entry in sorted(self.subsystems.items())
+            if subsystem != OTHER
+        )
+
+    def log(self):
+        """Logs the summary (at debug level) and a warning for each exceeded budget"""
+        total = self.total
+        logger.debug(
+            "%s: %d versioning queries (%.1fms) %s",
+            self.label or "Query profile",
+            total["count"],
+            total["time"] * 1000,
+            ", ".join(
+                f"{subsystem}: {entry['count']}" for subsystem, entry in sorted(self.subsystems.items())
+            ),
+        )
+        for subsystem, (count, budget) in self.exceeded_budgets().items():
+            logger.warning(
+                "%s: %d %s queries exceed the budget of %d",
+                self.label or "Query profile", count, subsystem, budget,
+            )
+
+
+@contextmanager
+def profile_queries(label: str = "", budgets: dict | None = None):
+    """Context manager profiling the database queries executed in its block. Yields
+    the :class:`QueryProfile` and logs its summary when the block is left.
+
+    :param label: Label used when logging the summary
+    :param budgets: Maximum number of queries per subsystem (or ``"total"``),
+        defaults to the ``DJANGOCMS_VERSIONING_QUERY_BUDGETS`` setting
+
+    Example::
+
+        with profile_queries("publish") as profile:
+            version.publish(user)
+        assert profile.subsystems["models"]["count"] < 10
+    """
+    profile = QueryProfile(label=label, budgets=budgets)
+    with ExitStack() as stack:
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(profile))
+        yield profile
+    profile.log()
+
+
+class QueryProfileMiddleware:
+    """Profiles the database queries of each request (see :func:`profile_queries`)
+    and adds them to the response's ``Server-Timing`` header. Add it at the top of
+    the ``MIDDLEWARE`` setting to include the queries of all other middlewares."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with profile_queries(label=f"{request.method} {request.path}") as profile:
+            response = self.get_response(request)
+        server_timing = profile.server_timing()
+        if server_timing:
+            if response.has_header("Server-Timing"):
+                server_timing = f"{response['Server-Timing']}, {server_timing}"
+            response["Server-Timing"] = server_timing
+        return response
@@ -0,0 +1,212 @@
+from __future__ import annotations
+
+from collections.abc import Iterable
+from datetime import timedelta
+
+from cms.models import CMSPlugin, Placeholder
+from django.core.exceptions import ImproperlyConfigured
+from django.db import models, transaction
+from django.db.models.functions import RowNumber
+from django.utils import timezone
+
+from . import conf, constants
+from .models import Version, VersionSummary
+
+
+def deleting_versions_allowed() -> bool:
+    """Returns if the DJANGOCMS_VERSIONING_ALLOW_DELETING_VERSIONS setting permits
+    deleting versions."""
+    setting = conf.ALLOW_DELETING_VERSIONS
+    return setting is True or setting in (constants.DELETE_ANY, constants.DELETE_NON_PUBLIC_ONLY)
+
+
+def get_prunable_versions(
+    versionable,
+    keep: int | None = None,
+    older_than: timedelta | None = None,
+    states: Iterable[str] = (constants.ARCHIVED,),
+) -> models.QuerySet:
+    """Returns a queryset of the versions of a versionable which may be pruned
+    according to the given policies.
+
+    :param versionable: VersionableItem instance
+    :param keep: Keep the ``keep`` most recent versions in ``states`` per grouping
+    :param older_than: Only versions last modified longer ago than this are pruned
+    :param states: Only versions in these states are pruned
+    :return: A queryset of Version objects
+
+    If both ``keep`` and ``older_than`` are given, versions need to meet both
+    policies to be pruned. The most recent version of a grouping is never pruned
+    and neither are versions which are the source of a published version.
+    """
+    if keep is None and older_than is None:
+        raise ValueError("At least one of the keep or older_than policies is required.")
+    states = list(states)
+    if not set(states) <= {constants.ARCHIVED, constants.UNPUBLISHED}:
+        raise ValueError("Only archived or unpublished versions can be pruned.")
+
+    content_model = versionable.content_model
+    grouping_fields = list(versionable.grouping_fields)
+    latest_per_grouping = (
+        content_model.admin_manager.values(*grouping_fields)
+        .annotate(latest_pk=models.Max("versions__pk"))
+        .values("latest_pk")
+    )
+    candidates = content_model.admin_manager.filter(versions__state__in=states)
+    if keep is not None:
+        candidates = candidates.annotate(
+            rank=models.Window(
+                RowNumber(),
+                partition_by=[models.F(field) for field in grouping_fields],
+                order_by=models.F("versions__pk").desc(),
+            )
+        ).filter(rank__gt=keep)
+    prunable = Version.objects.filter(
+        content_type__in=versionable.content_types,
+        pk__in=candidates.values("versions__pk"),
+    ).exclude(
+        pk__in=latest_per_grouping
+    ).exclude(
+        pk__in=Version.objects.filter(state=constants.PUBLISHED, source__isnull=False).values("source")
+    )
+    if older_than is not None:
+        prunable = prunable.filter(modified__lt=timezone.now() - older_than)
+    return prunable
+
+
+def delete_versions_in_bulk(versionable, version_pks: Iterable[int]) -> int:
+    """Deletes versions together with their content objects, placeholders and plugins
+    using a fixed number of queries, i.e., without calling ``Version.delete`` for
+    each version.
+
+    Groupers are not deleted. Versions having one of the deleted versions as their
+    source lose their source reference. Version summaries of the affected groupings
+    are refreshed if ``DJANGOCMS_VERSIONING_VERSION_SUMMARY`` is set.
+
+    :return: The number of deleted versions
+    """
+    version_pks = list(version_pks)
+    object_ids = list(
+        Version.objects.filter(pk__in=version_pks).values_list("object_id", flat=True)
+    )
+    with transaction.atomic():
+        if conf.VERSION_SUMMARY:
+            groupings = list(
+                versionable.content_model._base_manager.filter(pk__in=object_ids)
+                .values(*versionable.grouping_fields)
+                .order_by()
+                .distinct()
+            )
+        Version.objects.filter(source__in=version_pks).update(source=None)
+        placeholders = Placeholder.objects.filter(
+            content_type__in=versionable.content_types, object_id__in=object_ids
+        )
+        CMSPlugin.objects.filter(placeholder__in=placeholders).delete()
+        placeholders.delete()
+        # Deleting the content objects also deletes their versions
+        versionable.content_model._base_manager.filter(pk__in=object_ids).delete()
+        if conf.VERSION_SUMMARY:
+            for grouping_values in groupings:
+                VersionSummary.objects.refresh(versionable, **grouping_values)
+    return len(object_ids)
+
+
+def prune_versions(
+    versionable,
+    keep: int | None = None,
+    older_than: timedelta | None = None,
+    states: Iterable[str] = (constants.ARCHIVED,),
+    batch_size: int = 500,
+    dry_run: bool = False,
+    callback=None,
+) -> int:
+    """Deletes versions of a versionable according to the given retention policies
+    in batches of at most ``batch_size`` versions. Each batch is committed separately.
+
+    See :func:`get_prunable_versions` for the policies. ``callback`` is called with
+    the number of versions deleted so far after each batch.
+
+    :return: The number of deleted (or, if ``dry_run`` is set, prunable) versions
+    """
+    if not deleting_versions_allowed():
+        raise ImproperlyConfigured(
+            "Pruning versions requires the DJANGOCMS_VERSIONING_ALLOW_DELETING_VERSIONS setting "
+            "to allow deleting versions."
+        )
+    prunable = get_prunable_versions(versionable, keep=keep, older_than=older_than, states=states)
+    if dry_run:
+        return prunable.count()
+
+    # Evaluate the policies only once instead of once per batch
+    version_pks = list(prunable.order_by("pk").values_list("pk", flat=True))
+    deleted = 0
+    for start in range(0, len(version_pks), batch_size):
+        deleted += delete_versions_in_bulk(versionable, version_pks[start:start + batch_size])
+        if callback:
+            callback(deleted)
+    return deleted
+
+
+def get_unchanged_drafts(versionable, older_than: timedelta | None = None) -> models.QuerySet:
+    """Returns a queryset of the drafts of a versionable which were created as copies
+    of a published version (e.g., by clicking "Edit" on published content) and have
+    not been changed since.
+
+    Only these writes update a version's ``modified`` date and count as changes:
+    saving the content object or one of its page extensions (``post_save``), and
+    the plugin and placeholder operations of the structure board and of page
+    content changes in the admin. Other writes, e.g., to inline or related models
+    of the content object or plugin changes made directly in the database, are
+    not tracked: such drafts count as unchanged.
+
+    Drafts locked by an editor (with an unexpired lock) are never returned: they
+    may be open for editing without having been saved yet. Use ``older_than`` to
+    protect drafts opened recently if versions are not locked.
+
+    :param versionable: VersionableItem instance
+    :param older_than: Only drafts created longer ago than this are returned
+    :return: A queryset of Version objects
+    """
+    unchanged = Version.objects.filter(
+        content_type__in=versionable.content_types,
+        state=constants.DRAFT,
+        source__state=constants.PUBLISHED,
+        modified__lte=models.F("created"),
+    ).exclude(
+        models.Q(locked_by__isnull=False)
+        & (models.Q(locked_until__isnull=True) | models.Q(locked_until__gt=timezone.now()))
+    )
+    if older_than is not None:
+        unchanged = unchanged.filter(created__lt=timezone.now() - older_than)
+    return unchanged
+
+
+def discard_unchanged_drafts(
+    versionable,
+    older_than: timedelta | None = None,
+    batch_size: int = 500,
+    dry_run: bool = False,
+    callback=None,
+) -> int:
+    """Deletes the unchanged drafts of a versionable (see :func:`get_unchanged_drafts`)
+    together with their content objects, placeholders and plugins in batches of at
+    most ``batch_size`` versions. Their published versions remain untouched.
+
+    :return: The number of deleted (or, if ``dry_run`` is set, unchanged) drafts
+    """
+    if not deleting_versions_allowed():
+        raise ImproperlyConfigured(
+            "Discarding drafts requires the DJANGOCMS_VERSIONING_ALLOW_DELETING_VERSIONS setting "
+            "to allow deleting versions."
+        )
+    unchanged = get_unchanged_drafts(versionable, older_than=older_than)
+    if dry_run:
+        return unchanged.count()
+
+    version_pks = list(unchanged.order_by("pk").values_list("pk", flat=True))
+    deleted = 0
+    for start in range(0, len(version_pks), batch_size):
+        deleted += delete_versions_in_bulk(versionable, version_pks[start:start + batch_size])
+        if callback:
+            callback(deleted)
+    return deleted
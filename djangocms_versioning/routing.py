@@ -0,0 +1,130 @@
+"""Routing of read-only queries for published content to a read replica.
+
+Add the router and (optionally) the middleware to your settings::
+
+    DATABASE_ROUTERS = ["djangocms_versioning.routing.ReadReplicaRouter"]
+    DJANGOCMS_VERSIONING_READ_REPLICA = "replica"
+    MIDDLEWARE = [
+        ...,
+        "django.contrib.sessions.middleware.SessionMiddleware",
+        "djangocms_versioning.routing.ReadReplicaPinningMiddleware",
+        ...,
+    ]
+
+Querysets of the published content managers (``objects``) are read from the
+replica. So are versions looked up for content read from the replica, and the
+menu in public mode. All writes (state transitions, copies, locking), all
+queries inside a transaction and all other reads use the primary database.
+
+Once a version has been saved, all further reads of the same request use the
+primary. With the middleware, the session also sticks to the primary for
+``DJANGOCMS_VERSIONING_READ_REPLICA_PIN_SECONDS``. Outside of requests (e.g., in
+management commands or task workers), saving a version only pins reads within a
+:func:`read_routing_scope`::
+
+    with read_routing_scope():
+        version.publish(user)
+        ...  # Reads published content from the primary
+"""
+from __future__ import annotations
+
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.db import DEFAULT_DB_ALIAS, connections
+
+from . import conf
+
+#: Queryset hint marking reads of published content
+PUBLISHED_HINT = "versioning_published"
+#: Session key storing until when the session sticks to the primary database
+SESSION_KEY = "djangocms_versioning_primary_until"
+
+_state: ContextVar[dict | None] = ContextVar("djangocms_versioning_read_routing", default=None)
+
+
+@contextmanager
+def read_routing_scope(pinned: bool = False):
+    """Scope of pins to the primary database: reads of published content within
+    the block use the primary once a version has been saved in it (or from the
+    start if ``pinned``). The pin ends with the block.
+
+    :return: The routing state of the block (``"changed"`` is set once a version
+        has been saved)
+    """
+    state = {"pinned": pinned}
+    token = _state.set(state)
+    try:
+        yield state
+    finally:
+        _state.reset(token)
+
+
+def pin_to_primary() -> None:
+    """Makes all further reads of published content in the current request (or
+    :func:`read_routing_scope`) use the primary database, e.g., after a version has
+    been changed. Does nothing outside of requests and scopes, so that threads and
+    processes are not pinned for their whole lifetime."""
+    state = _state.get()
+    if state is not None:
+        state["pinned"] = state["changed"] = True
+
+
+def is_pinned_to_primary() -> bool:
+    state = _state.get()
+    return bool(state and state.get("pinned"))
+
+
+def get_read_database() -> str | None:
+    """Returns the alias of the read replica to use for reading published content
+    or ``None`` if the primary database has to be used."""
+    replica = conf.READ_REPLICA
+    if not replica or is_pinned_to_primary() or connections[DEFAULT_DB_ALIAS].in_atomic_block:
+        return None
+    return replica
+
+
+class ReadReplicaRouter:
+    """Database router sending reads of published content to the replica configured
+    by ``DJANGOCMS_VERSIONING_READ_REPLICA``. Objects read from the replica are
+    written to the primary database."""
+
+    def db_for_read(self, model, **hints):
+        if hints.get(PUBLISHED_HINT):
+            return get_read_database()
+        instance = hints.get("instance")
+        if instance is not None and conf.READ_REPLICA and instance._state.db == conf.READ_REPLICA:
+            # Related objects of objects read from the replica
+            return get_read_database() or DEFAULT_DB_ALIAS
+        return None
+
+    def db_for_write(self, model, **hints):
+        instance = hints.get("instance")
+        if instance is not None and conf.READ_REPLICA and instance._state.db == conf.READ_REPLICA:
+            return DEFAULT_DB_ALIAS
+        return None
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {DEFAULT_DB_ALIAS, conf.READ_REPLICA}
+        if conf.READ_REPLICA and {obj1._state.db, obj2._state.db} <= databases:
+            return True
+        return None
+
+
+class ReadReplicaPinningMiddleware:
+    """Sticks sessions which changed a version to the primary database for
+    ``DJANGOCMS_VERSIONING_READ_REPLICA_PIN_SECONDS``. Needs to come after the
+    session middleware."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        session = getattr(request, "session", None)
+        pinned = session is not None and session.get(SESSION_KEY, 0) > time.time()
+        with read_routing_scope(pinned) as state:
+            response = self.get_response(request)
+        if state.get("changed") and session is not None:
+            session[SESSION_KEY] = time.time() + conf.READ_REPLICA_PIN_SECONDS
+        return response
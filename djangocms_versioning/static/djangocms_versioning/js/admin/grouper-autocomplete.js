@@ -0,0 +1,39 @@
+/*
+ * Grouper selection form of the version admin.
+ *
+ * Initializes select2 on the grouper field. Groupers are loaded page by page
+ * from the keyset-paginated grouper autocomplete endpoint: instead of a page
+ * number, the last primary key of the previous page is sent as "after".
+ */
+'use strict';
+{
+    const $ = django.jQuery;
+
+    function init(element) {
+        // Cursor ("after" parameter) of each page for the current search term
+        const cursors = {};
+
+        $(element).select2({
+            ajax: {
+                data: function (params) {
+                    const page = params.page || 1;
+
+                    return {
+                        term: params.term,
+                        after: page > 1 ? cursors[page] : ''
+                    };
+                },
+                processResults: function (data, params) {
+                    cursors[(params.page || 1) + 1] = data.pagination.after;
+                    return data;
+                }
+            }
+        });
+    }
+
+    $(function () {
+        $('.versioning-grouper-autocomplete').each(function () {
+            init(this);
+        });
+    });
+}
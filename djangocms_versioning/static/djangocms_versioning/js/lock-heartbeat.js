@@ -0,0 +1,39 @@
+/*
+ * Heartbeat of the version lock.
+ *
+ * While a locked draft is open in edit mode, its lock is renewed regularly so
+ * that it does not expire (see DJANGOCMS_VERSIONING_LOCK_TTL). Locks of drafts
+ * which are no longer being edited expire on their own.
+ */
+'use strict';
+{
+    const script = document.currentScript;
+
+    // The toolbar may be rendered more than once per page
+    if (script && !window.djangocmsVersioningLockHeartbeat) {
+        const url = script.dataset.url;
+        const csrfToken = script.dataset.csrfToken;
+
+        const timer = window.setInterval(function () {
+            fetch(url, {
+                method: 'POST',
+                credentials: 'same-origin',
+                headers: { 'X-CSRFToken': csrfToken }
+            })
+                .then(function (response) {
+                    return response.ok ? response.json() : null;
+                })
+                .then(function (data) {
+                    if (data && !data.locked) {
+                        // The lock has been removed or taken over: stop renewing it
+                        window.clearInterval(timer);
+                    }
+                })
+                .catch(function () {
+                    // Try again with the next beat
+                });
+        }, parseInt(script.dataset.interval, 10) * 1000);
+
+        window.djangocmsVersioningLockHeartbeat = timer;
+    }
+}
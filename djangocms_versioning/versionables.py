@@ -30,3 +30,23 @@ def exists_for_content(model_or_obj):
 def exists_for_grouper(model_or_obj):
     """Test for registered VersionableItem for a grouper model or grouper model instance"""
     return _to_model(model_or_obj) in _cms_extension().versionables_by_grouper
+
+
+def for_content_labels(labels=None):
+    """Get the registered concrete VersionableItem instances for a list of content model
+    labels ("app_label.ModelName"), or all of them if no labels are given.
+
+    Raises LookupError for unknown or unversioned models."""
+    versionables = [versionable for versionable in _cms_extension().versionables if versionable.concrete]
+    if not labels:
+        return versionables
+    try:
+        models = {apps.get_model(label) for label in labels}
+    except ValueError as err:
+        raise LookupError(str(err)) from err
+    unversioned = models - {versionable.content_model for versionable in versionables}
+    if unversioned:
+        raise LookupError(
+            "Not a versioned content model: " + ", ".join(model._meta.label for model in unversioned)
+        )
+    return [versionable for versionable in versionables if versionable.content_model in models]
@@ -0,0 +1,437 @@
+"""
+Benchmarks for the hot paths of djangocms-versioning.
+
+A synthetic dataset of polls (the groupers) with ``--languages`` languages and
+``--versions`` versions per language is generated using the factories in
+``djangocms_versioning.test_utils.factories`` and bulk inserts. Pages are
+generated separately (and slowly, through the regular version operations) for
+the menu and the page copy benchmarks.
+
+Each benchmark reports its wall time, its number of database queries and its
+peak memory (as measured by ``tracemalloc`` in a separate, untimed run) as JSON::
+
+    python -m tests.benchmark --groupers 10000 --languages 2 --versions 3 --output results.json
+
+The database is created (and destroyed) like the test database, so
+``DATABASE_URL`` can be used to benchmark against postgres or mysql.
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass, field
+from io import StringIO
+from statistics import mean
+
+import django
+
+if __name__ == "__main__":  # pragma: no cover
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "tests.settings")
+    django.setup()
+
+import cms
+from cms.models import PageContent
+from cms.toolbar.toolbar import CMSToolbar
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.core.management import call_command
+from django.db import connection, models, transaction
+from django.template import Context, Template
+from django.test import Client, RequestFactory
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils.translation import override
+from menus.menu_pool import menu_pool
+
+import djangocms_versioning
+from djangocms_versioning import constants, versionables
+from djangocms_versioning.helpers import version_list_url
+from djangocms_versioning.indicators import content_indicator
+from djangocms_versioning.models import Version, get_author_sort_key
+from djangocms_versioning.test_utils.factories import (
+    PageVersionFactory,
+    PlaceholderFactory,
+    PollContentFactory,
+    PollFactory,
+    TextPluginFactory,
+    TreeNode,
+    UserFactory,
+)
+from djangocms_versioning.test_utils.polls.models import Poll, PollContent
+
+#: Registered benchmarks by name
+BENCHMARKS = {}
+
+
+@dataclass
+class Dataset:
+    user: models.Model
+    groupers: int
+    languages: list
+    versions: int
+    poll_pks: tuple = (0, 0)
+    page_versions: list = field(default_factory=list)
+
+    def sample(self, run: int, runs: int) -> int:
+        """Returns the pk of a poll for the ``run``-th of ``runs`` runs, spread evenly
+        over all polls"""
+        first, last = self.poll_pks
+        return first + (last - first) * run // max(runs - 1, 1)
+
+
+def _bulk_create(model, objs, batch_size=None):
+    """Bulk creates objs and makes sure their primary keys are set, even on
+    databases which do not return them from bulk inserts."""
+    manager = model._base_manager
+    if connection.features.can_return_rows_from_bulk_insert:
+        return manager.bulk_create(objs, batch_size=batch_size)
+    last_pk = manager.aggregate(last_pk=models.Max("pk"))["last_pk"] or 0
+    manager.bulk_create(objs, batch_size=batch_size)
+    pks = manager.filter(pk__gt=last_pk).order_by("pk").values_list("pk", flat=True)
+    for obj, pk in zip(objs, pks):
+        obj.pk = pk
+    return objs
+
+
+def _version_state(number: int, versions: int) -> str:
+    """The latest version of a grouping is a draft, the one before is published and
+    all older versions are archived. A single version is published."""
+    if number == versions:
+        return constants.DRAFT if versions > 1 else constants.PUBLISHED
+    if number == versions - 1:
+        return constants.PUBLISHED
+    return constants.ARCHIVED
+
+
+def generate_polls(dataset: Dataset, batch_size: int = 1000, callback=None):
+    """Generates ``dataset.groupers`` polls with ``dataset.versions`` versioned poll
+    contents for each language using bulk inserts of ``batch_size`` polls at a time"""
+    content_type = ContentType.objects.get_for_model(PollContent)
+    # bulk_create does not call Version.save
+    author_sort_key = get_author_sort_key(dataset.user)
+    for start in range(0, dataset.groupers, batch_size):
+        with transaction.atomic():
+            polls = _bulk_create(Poll, PollFactory.build_batch(min(batch_size, dataset.groupers - start)))
+            contents = _bulk_create(PollContent, [
+                PollContentFactory.build(poll=poll, language=language)
+                for poll in polls for language in dataset.languages for _number in range(dataset.versions)
+            ], batch_size=batch_size)
+            Version.objects.bulk_create([
+                Version(
+                    content_type=content_type,
+                    object_id=content.pk,
+                    number=str(index % dataset.versions + 1),
+                    state=_version_state(index % dataset.versions + 1, dataset.versions),
+                    created_by=dataset.user,
+                    author_sort_key=author_sort_key,
+                )
+                for index, content in enumerate(contents)
+            ], batch_size=batch_size)
+        if callback:
+            callback(start + len(polls))
+    dataset.poll_pks = (
+        Poll.objects.order_by("pk").values_list("pk", flat=True).first(),
+        Poll.objects.order_by("pk").values_list("pk", flat=True).last(),
+    )
+
+
+def generate_pages(dataset: Dataset, pages: int, plugins: int):
+    """Generates ``pages`` published root pages for each language, each with a
+    placeholder holding ``plugins`` text plugins"""
+    path_model = TreeNode or PageContent.page.field.related_model
+    for index in range(pages):
+        page = None
+        for language in dataset.languages:
+            kwargs = {"content__page": page} if page else {
+                "content__page__node__path" if TreeNode else "content__page__path": path_model._get_path(
+                    None, 1, index + 1
+                ),
+            }
+            version = PageVersionFactory(
+                content__language=language,
+                content__in_navigation=True,
+                content__limit_visibility_in_menu=None,
+                created_by=dataset.user,
+                **kwargs,
+            )
+            page = version.content.page
+            placeholder = PlaceholderFactory(source=version.content, slot="content")
+            for _plugin in range(plugins):
+                TextPluginFactory(placeholder=placeholder, language=language)
+            version.publish(dataset.user)
+            dataset.page_versions.append(version)
+
+
+def benchmark(name: str):
+    """Registers a benchmark. The decorated function receives the dataset and the
+    index and total number of runs. It prepares the run and returns the (argument-less)
+    operation to measure."""
+    def decorator(func):
+        BENCHMARKS[name] = func
+        return func
+    return decorator
+
+
+def _latest_version(dataset, poll_pk):
+    return Version.objects.filter_by_grouping_values(
+        versionables.for_content(PollContent), poll=poll_pk, language=dataset.languages[0]
+    ).order_by("-pk").first()
+
+
+@benchmark("publish")
+def publish(dataset, run, runs):
+    version = _latest_version(dataset, dataset.sample(run, runs))
+    if version.state != constants.DRAFT:
+        version = version.copy(dataset.user)
+    return lambda: version.publish(dataset.user)
+
+
+@benchmark("copy")
+def copy(dataset, run, runs):
+    version = _latest_version(dataset, dataset.sample(run, runs))
+    return lambda: version.copy(dataset.user)
+
+
+@benchmark("copy_page")
+def copy_page(dataset, run, runs):
+    if not dataset.page_versions:
+        return None
+    version = dataset.page_versions[run % len(dataset.page_versions)]
+    return lambda: version.copy(dataset.user)
+
+
+@benchmark("latest_content")
+def latest_content(dataset, run, runs):
+    poll_pk = dataset.sample(run, runs)
+    return lambda: PollContent.admin_manager.filter(poll=poll_pk).latest_content().first()
+
+
+@benchmark("latest_content_all")
+def latest_content_all(dataset, run, runs):
+    return lambda: PollContent.admin_manager.latest_content().count()
+
+
+@benchmark("current_content")
+def current_content(dataset, run, runs):
+    poll_pk = dataset.sample(run, runs)
+    return lambda: PollContent.admin_manager.filter(poll=poll_pk).current_content().first()
+
+
+@benchmark("current_content_all")
+def current_content_all(dataset, run, runs):
+    return lambda: PollContent.admin_manager.current_content().count()
+
+
+def _get(dataset, url):
+    client = Client()
+    client.force_login(dataset.user)
+
+    def get():
+        response = client.get(url)
+        assert response.status_code == 200, f"{url} returned {response.status_code}"
+        return response
+
+    return get
+
+
+@benchmark("version_changelist")
+def version_changelist(dataset, run, runs):
+    content = PollContent.admin_manager.filter(
+        poll=dataset.sample(run, runs), language=dataset.languages[0]
+    ).latest_content().first()
+    return _get(dataset, version_list_url(content))
+
+
+@benchmark("grouper_changelist")
+def grouper_changelist(dataset, run, runs):
+    with override(dataset.languages[0]):
+        return _get(dataset, reverse("admin:polls_poll_changelist"))
+
+
+@benchmark("indicators")
+def indicators(dataset, run, runs):
+    """Renders the indicators of 100 content objects which have not been annotated
+    with their versions"""
+    poll_pk = dataset.sample(run, runs)
+    contents = list(
+        PollContent.admin_manager.filter(poll__gte=poll_pk, language=dataset.languages[0])
+        .latest_content().order_by("poll")[:100]
+    )
+    return lambda: [content_indicator(content) for content in contents]
+
+
+@benchmark("menu")
+def menu(dataset, run, runs):
+    if not dataset.page_versions:
+        return None
+    menu_pool.clear(all=True)
+    request = RequestFactory().get("/")
+    request.user = dataset.user
+    request.session = {}
+    request.toolbar = CMSToolbar(request)
+    template = Template("{% load menu_tags %}{% show_menu 0 100 100 100 %}")
+    return lambda: template.render(Context({"request": request}))
+
+
+def _create_unversioned_polls(dataset, count=100):
+    polls = _bulk_create(Poll, PollFactory.build_batch(count))
+    _bulk_create(PollContent, [
+        PollContentFactory.build(poll=poll, language=dataset.languages[0]) for poll in polls
+    ])
+
+
+@benchmark("create_versions")
+def create_versions(dataset, run, runs):
+    _create_unversioned_polls(dataset)
+    return lambda: call_command("create_versions", userid=dataset.user.pk, stdout=StringIO())
+
+
+@benchmark("create_versions_bulk")
+def create_versions_bulk(dataset, run, runs):
+    _create_unversioned_polls(dataset)
+    return lambda: call_command("create_versions", userid=dataset.user.pk, bulk=True, stdout=StringIO())
+
+
+def measure(name: str, dataset: Dataset, repeat: int = 3) -> dict | None:
+    """Runs a benchmark ``repeat`` times and once more to measure its peak memory.
+
+    :return: A dict with the wall times (in seconds), the maximum number of queries
+        and the peak memory (in bytes), or ``None`` if the dataset does not allow
+        running the benchmark
+    """
+    wall_times = []
+    queries = 0
+    for run in range(repeat):
+        operation = BENCHMARKS[name](dataset, run, repeat + 1)
+        if operation is None:
+            return None
+        with CaptureQueriesContext(connection) as ctx:
+            start = time.perf_counter()
+            operation()
+            wall_times.append(time.perf_counter() - start)
+        queries = max(queries, len(ctx.captured_queries))
+
+    # Tracing memory allocations slows down execution and is not timed
+    operation = BENCHMARKS[name](dataset, repeat, repeat + 1)
+    tracemalloc.start()
+    try:
+        operation()
+        _current, peak_memory = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {
+        "runs": repeat,
+        "wall_time": {"min": min(wall_times), "mean": mean(wall_times), "max": max(wall_times)},
+        "queries": queries,
+        "peak_memory": peak_memory,
+    }
+
+
+def run_benchmarks(
+    groupers: int = 10000,
+    languages: int = 2,
+    versions: int = 3,
+    pages: int = 50,
+    plugins: int = 5,
+    repeat: int = 3,
+    names=None,
+    batch_size: int = 1000,
+    callback=None,
+) -> dict:
+    """Generates the dataset and runs the benchmarks (all, if ``names`` is not given).
+
+    ``callback`` is called with a progress message.
+    :return: The results (including the environment and the dataset) as a dict
+    """
+    callback = callback or (lambda message: None)
+    names = names or list(BENCHMARKS)
+    unknown = set(names) - set(BENCHMARKS)
+    if unknown:
+        raise ValueError(f"Unknown benchmarks: {', '.join(sorted(unknown))}")
+
+    dataset = Dataset(
+        user=UserFactory(is_staff=True, is_superuser=True),
+        groupers=groupers,
+        languages=[code for code, _name in settings.LANGUAGES][:languages],
+        versions=versions,
+    )
+    start = time.perf_counter()
+    generate_polls(dataset, batch_size=batch_size, callback=lambda done: callback(f"Generated {done} polls"))
+    generate_pages(dataset, pages, plugins)
+    generation_time = time.perf_counter() - start
+    callback(f"Generated dataset in {generation_time:.1f}s")
+
+    results = {}
+    for name in names:
+        results[name] = measure(name, dataset, repeat=repeat)
+        if results[name] is not None:
+            callback(f"{name}: {results[name]['wall_time']['mean'] * 1000:.1f}ms, "
+                     f"{results[name]['queries']} queries")
+    return {
+        "environment": {
+            "python": platform.python_version(),
+            "django": django.get_version(),
+            "django_cms": cms.__version__,
+            "djangocms_versioning": djangocms_versioning.__version__,
+            "database": connection.vendor,
+        },
+        "dataset": {
+            "groupers": groupers,
+            "languages": len(dataset.languages),
+            "versions": versions,
+            "pages": pages,
+            "plugins": plugins,
+            "generation_time": generation_time,
+        },
+        "benchmarks": results,
+    }
+
+
+def main(argv=None):  # pragma: no cover
+    from django.test.utils import setup_test_environment, teardown_test_environment
+
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--groupers", type=int, default=10000, help="Number of polls (defaults to 10000)")
+    parser.add_argument("--languages", type=int, default=2, help="Number of languages per poll (defaults to 2)")
+    parser.add_argument("--versions", type=int, default=3, help="Number of versions per language (defaults to 3)")
+    parser.add_argument("--pages", type=int, default=50, help="Number of pages (defaults to 50)")
+    parser.add_argument("--plugins", type=int, default=5, help="Number of plugins per page (defaults to 5)")
+    parser.add_argument("--repeat", type=int, default=3, help="Number of timed runs (defaults to 3)")
+    parser.add_argument("--batch-size", type=int, default=1000, help="Polls inserted per batch (defaults to 1000)")
+    parser.add_argument("--benchmark", action="append", choices=list(BENCHMARKS),
+                        help="Only run this benchmark, can be given more than once")
+    parser.add_argument("--keepdb", action="store_true", help="Keep the benchmark database")
+    parser.add_argument("--output", help="Write the JSON results to this file (defaults to stdout)")
+    options = parser.parse_args(argv)
+
+    setup_test_environment(debug=False)
+    old_name = connection.creation.create_test_db(verbosity=0, keepdb=options.keepdb)
+    try:
+        results = run_benchmarks(
+            groupers=options.groupers,
+            languages=options.languages,
+            versions=options.versions,
+            pages=options.pages,
+            plugins=options.plugins,
+            repeat=options.repeat,
+            names=options.benchmark,
+            batch_size=options.batch_size,
+            callback=lambda message: print(message, file=sys.stderr),
+        )
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0, keepdb=options.keepdb)
+        teardown_test_environment()
+
+    output = json.dumps(results, indent=2)
+    if options.output:
+        with open(options.output, "w") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
@@ -22,8 +22,9 @@ from django.contrib.auth.models import Permission
 from django.contrib.contenttypes.models import ContentType
 from django.contrib.messages.storage.fallback import FallbackStorage
 from django.core.exceptions import ImproperlyConfigured
+from django.db import connection
 from django.test import RequestFactory
-from django.test.utils import ignore_warnings
+from django.test.utils import CaptureQueriesContext, ignore_warnings
 from django.urls import reverse
 from django.utils.http import urlencode
 from django.utils.timezone import now
@@ -1246,6 +1247,85 @@ class GrouperFormViewTestCase(CMSTestCase):
         self.assertRedirects(response, admin_reverse("login") + "?next=" + url)
 
 
+class GrouperAutocompleteViewTestCase(CMSTestCase):
+    def setUp(self):
+        self.versionable = PollsCMSConfig.versioning[0]
+        self.url = self.get_admin_url(self.versionable.version_model_proxy, "grouper_autocomplete")
+        self.versions = [factories.PollVersionFactory(content__language="en") for _ in range(3)]
+
+    def test_keyset_pagination(self):
+        polls = sorted((version.content.poll for version in self.versions), key=lambda poll: poll.pk)
+
+        with patch.object(VersionAdmin, "grouper_autocomplete_page_size", 2):
+            with self.login_user_context(self.get_superuser()):
+                first_page = self.client.get(self.url).json()
+                second_page = self.client.get(self.url, {"after": first_page["pagination"]["after"]}).json()
+
+        self.assertEqual(
+            first_page["results"], [{"id": str(poll.pk), "text": str(poll)} for poll in polls[:2]]
+        )
+        self.assertEqual(first_page["pagination"], {"more": True, "after": str(polls[1].pk)})
+        self.assertEqual(second_page["results"], [{"id": str(polls[2].pk), "text": str(polls[2])}])
+        self.assertEqual(second_page["pagination"], {"more": False, "after": None})
+
+    def test_search_without_search_fields_matches_primary_key(self):
+        poll = self.versions[1].content.poll
+
+        with self.login_user_context(self.get_superuser()):
+            results = self.client.get(self.url, {"term": str(poll.pk)}).json()["results"]
+            no_results = self.client.get(self.url, {"term": "poll"}).json()["results"]
+
+        self.assertEqual([result["id"] for result in results], [str(poll.pk)])
+        self.assertEqual(no_results, [])
+
+    def test_search_uses_content_admin_search_fields(self):
+        versionable = VersioningCMSConfig.versioning[0]
+        factories.PageVersionFactory(content__title="Unrelated", content__language="en")
+        version = factories.PageVersionFactory(content__title="Find me", content__language="en")
+        url = self.get_admin_url(versionable.version_model_proxy, "grouper_autocomplete")
+
+        with self.login_user_context(self.get_superuser()):
+            response = self.client.get(url, {"term": "find", "language": "en"})
+
+        self.assertEqual(
+            response.json()["results"],
+            [{"id": str(version.content.page.pk), "text": "Find me (Unpublished)"}],
+        )
+
+    def test_labels_are_loaded_for_the_page_only(self):
+        with self.login_user_context(self.get_superuser()):
+            self.client.get(self.url)  # Warm up caches
+            with CaptureQueriesContext(connection) as context:
+                self.client.get(self.url)
+            queries = len(context.captured_queries)
+            for _ in range(10):
+                factories.PollVersionFactory(content__language="en")
+            with self.assertNumQueries(queries):
+                self.client.get(self.url)
+
+    def test_invalid_cursor(self):
+        with self.login_user_context(self.get_superuser()):
+            response = self.client.get(self.url, {"after": "x"})
+
+        self.assertEqual(response.status_code, 400)
+
+    def test_requires_view_permission(self):
+        with self.login_user_context(self.get_staff_user_with_no_permissions()):
+            response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, 403)
+
+    def test_grouper_form_uses_autocomplete(self):
+        with self.login_user_context(self.get_superuser()):
+            response = self.client.get(self.get_admin_url(self.versionable.version_model_proxy, "grouper"))
+
+        self.assertContains(response, "versioning-grouper-autocomplete")
+        self.assertContains(response, "djangocms_versioning/js/admin/grouper-autocomplete.js")
+        self.assertContains(response, self.url)
+        for version in self.versions:
+            self.assertNotContains(response, f'value="{version.content.poll.pk}"')
+
+
 class ArchiveViewTestCase(BaseStateTestCase):
     def setUp(self):
         self.versionable = PollsCMSConfig.versioning[0]
@@ -1967,6 +2047,72 @@ class RevertViewTestCase(BaseStateTestCase):
         )
 
 
+class RollbackViewTestCase(BaseStateTestCase):
+    def setUp(self):
+        self.versionable = PollsCMSConfig.versioning[0]
+        patcher = patch("djangocms_versioning.conf.INSTANT_ROLLBACK", True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_rollback_view_publishes_version(self):
+        poll = factories.PollFactory()
+        previous = factories.PollVersionFactory(content__poll=poll, state=constants.ARCHIVED)
+        current = factories.PollVersionFactory(
+            content__poll=poll, content__language=previous.content.language, state=constants.PUBLISHED
+        )
+        url = self.get_admin_url(self.versionable.version_model_proxy, "rollback", previous.pk)
+
+        with self.login_user_context(self.get_superuser()):
+            response = self.client.post(url)
+
+        self.assertRedirectsToVersionList(response, previous)
+        self.assertEqual(Version.objects.get(pk=previous.pk).state, constants.PUBLISHED)
+        self.assertEqual(Version.objects.get(pk=current.pk).state, constants.UNPUBLISHED)
+        self.assertEqual(Version.objects.count(), 2)
+
+    def test_rollback_view_is_disabled_by_default(self):
+        version = factories.PollVersionFactory(state=constants.UNPUBLISHED)
+        url = self.get_admin_url(self.versionable.version_model_proxy, "rollback", version.pk)
+
+        with patch("djangocms_versioning.conf.INSTANT_ROLLBACK", False):
+            with self.login_user_context(self.get_superuser()):
+                response = self.client.post(url)
+
+        self.assertRedirectsToVersionList(response, version)
+        self.assertEqual(Version.objects.get(pk=version.pk).state, constants.UNPUBLISHED)
+
+    def test_rollback_view_rejects_draft(self):
+        version = factories.PollVersionFactory(state=constants.DRAFT)
+        url = self.get_admin_url(self.versionable.version_model_proxy, "rollback", version.pk)
+
+        with self.login_user_context(self.get_superuser()):
+            response = self.client.post(url)
+
+        self.assertRedirectsToVersionList(response, version)
+        self.assertEqual(Version.objects.get(pk=version.pk).state, constants.DRAFT)
+
+    def test_rollback_view_cant_be_accessed_by_get_request(self):
+        version = factories.PollVersionFactory(state=constants.UNPUBLISHED)
+        url = self.get_admin_url(self.versionable.version_model_proxy, "rollback", version.pk)
+
+        with self.login_user_context(self.get_superuser()):
+            response = self.client.get(url)
+
+        self.assertEqual(response.status_code, 405)
+        self.assertEqual(Version.objects.get(pk=version.pk).state, constants.UNPUBLISHED)
+
+    def test_rollback_link(self):
+        version_admin = admin.site._registry[self.versionable.version_model_proxy]
+        request = RequestFactory().get("/")
+        request.user = self.get_superuser()
+        unpublished = factories.PollVersionFactory(state=constants.UNPUBLISHED)
+
+        self.assertIn("rollback", version_admin._get_rollback_link(unpublished, request))
+        self.assertEqual(version_admin._get_rollback_link(factories.PollVersionFactory(), request), "")
+        with patch("djangocms_versioning.conf.INSTANT_ROLLBACK", False):
+            self.assertEqual(version_admin._get_rollback_link(unpublished, request), "")
+
+
 class EditRedirectTestCase(BaseStateTestCase):
     def setUp(self):
         self.versionable = PollsCMSConfig.versioning[0]
@@ -2699,6 +2845,72 @@ class VersionChangeListViewTestCase(CMSTestCase):
         self.assertEqual(response.status_code, 403)
 
 
+class VersionChangeListKeysetPaginationTestCase(CMSTestCase):
+    def setUp(self):
+        self.versionable = PollsCMSConfig.versioning[0]
+        self.changelist_url = self.get_admin_url(self.versionable.version_model_proxy, "changelist")
+        self.poll = factories.PollFactory()
+        self.versions = [
+            factories.PollVersionFactory(content__poll=self.poll, content__language="en", state=constants.ARCHIVED)
+            for _ in range(5)
+        ]
+        patcher = patch("djangocms_versioning.conf.KEYSET_PAGINATION", True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _get(self, **params):
+        with patch.object(VersionAdmin, "list_per_page", 2), self.login_user_context(self.get_superuser()):
+            return self.client.get(self.changelist_url, {"poll": self.poll.pk, "language": "en", **params})
+
+    def test_pages(self):
+        newest_first = [version.pk for version in reversed(self.versions)]
+
+        first = self._get()
+        second = self._get(before=newest_first[1])
+        last = self._get(before=newest_first[3])
+        back = self._get(after=newest_first[2])
+
+        self.assertEqual([version.pk for version in first.context["cl"].result_list], newest_first[:2])
+        self.assertIsNone(first.context["cl"].newer_page_url)
+        self.assertIn(f"before={newest_first[1]}", first.context["cl"].older_page_url)
+        self.assertContains(first, f"before={newest_first[1]}")
+        self.assertEqual([version.pk for version in second.context["cl"].result_list], newest_first[2:4])
+        self.assertIn(f"after={newest_first[2]}", second.context["cl"].newer_page_url)
+        self.assertEqual([version.pk for version in last.context["cl"].result_list], newest_first[4:])
+        self.assertIsNone(last.context["cl"].older_page_url)
+        self.assertEqual([version.pk for version in back.context["cl"].result_list], newest_first[:2])
+        self.assertIsNone(back.context["cl"].newer_page_url)
+        self.assertEqual(first.context["cl"].result_count, 5)
+        self.assertFalse(first.context["cl"].result_count_is_approximate)
+
+    def test_approximate_count(self):
+        with patch.object(VersionChangeList, "approximate_count_limit", 3):
+            response = self._get()
+
+        self.assertEqual(response.context["cl"].result_count, 3)
+        self.assertContains(response, "More than 3")
+
+    def test_latest_content_taken_from_first_page(self):
+        self._get()  # Warm up caches
+        with CaptureQueriesContext(connection) as context:
+            response = self._get()
+
+        queries = [query["sql"] for query in context.captured_queries]
+        self.assertEqual(response.context["latest_content"], self.versions[-1].content)
+        self.assertFalse([sql for sql in queries if '"djangocms_versioning_version"."created" DESC' in sql])
+        self.assertFalse([sql for sql in queries if "OFFSET" in sql])
+
+    def test_latest_content_on_later_pages(self):
+        response = self._get(before=self.versions[2].pk)
+
+        self.assertEqual(response.context["latest_content"], self.versions[-1].content)
+
+    def test_invalid_cursor(self):
+        response = self._get(before="x")
+
+        self.assertRedirects(response, self.changelist_url + "?e=1", fetch_redirect_response=False)
+
+
 class VersionChangeViewTestCase(CMSTestCase):
     def setUp(self):
         self.versionable = PollsCMSConfig.versioning[0]
@@ -3431,7 +3643,10 @@ class DefaultGrouperAdminTestCase(CMSTestCase):
         self.assertEqual(modeladmin.get_content_obj(obj), version.content)
 
         indicator = modeladmin.get_indicator_column(request)
-        self.assertIn("cms-pagetree-node-state-draft", indicator(obj))
+        with patch.object(modeladmin, "get_extra_grouping_field") as get_extra_grouping_field:
+            self.assertIn("cms-pagetree-node-state-draft", indicator(obj))
+        # The language is provided by the admin: no lookup needed
+        get_extra_grouping_field.assert_not_called()
 
     def test_changelist_indicator_with_only_content_without_version(self):
         """A grouper whose only content object has no version renders an empty
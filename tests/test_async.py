@@ -0,0 +1,115 @@
+from unittest.mock import patch
+
+from asgiref.sync import sync_to_async
+from cms.test_utils.testcases import CMSTestCase
+
+from djangocms_versioning import constants, versionables
+from djangocms_versioning.helpers import aget_latest_admin_viewable_content, get_latest_admin_viewable_content
+from djangocms_versioning.models import StateTracking, Version
+from djangocms_versioning.test_utils import factories
+from djangocms_versioning.test_utils.polls.models import Poll, PollContent
+
+
+class AsyncVersionTestCase(CMSTestCase):
+    def setUp(self):
+        self.user = factories.UserFactory()
+        self.poll = factories.PollFactory()
+        self.published = factories.PollVersionFactory(
+            content__poll=self.poll, content__language="en", state=constants.PUBLISHED
+        )
+        self.draft = factories.PollVersionFactory(content__poll=self.poll, content__language="en")
+
+    async def test_aget_for_content(self):
+        content = await PollContent.admin_manager.aget(pk=self.draft.object_id)
+
+        version = await Version.objects.aget_for_content(content)
+
+        self.assertEqual(version, self.draft)
+        self.assertIs(version.content, content)
+        self.assertIs(await Version.objects.aget_for_content(content), version)
+
+    async def test_acontent_types(self):
+        versionable = versionables.for_content(PollContent)
+        content_types = versionable.content_types
+        del versionable.content_types
+
+        self.assertEqual(await versionable.acontent_types(), content_types)
+        self.assertIn("content_types", versionable.__dict__)
+        self.assertEqual(await versionable.acontent_types(), content_types)
+
+    async def test_apublish(self):
+        await self.draft.apublish(self.user)
+
+        self.assertEqual((await Version.objects.aget(pk=self.draft.pk)).state, constants.PUBLISHED)
+        self.assertEqual((await Version.objects.aget(pk=self.published.pk)).state, constants.UNPUBLISHED)
+        self.assertEqual(await StateTracking.objects.filter(version=self.draft).acount(), 1)
+
+    async def test_apublish_rolls_back(self):
+        with patch.object(StateTracking.objects, "create", side_effect=RuntimeError):
+            with self.assertRaises(RuntimeError):
+                await self.draft.apublish(self.user)
+
+        self.assertEqual((await Version.objects.aget(pk=self.draft.pk)).state, constants.DRAFT)
+        self.assertEqual((await Version.objects.aget(pk=self.published.pk)).state, constants.PUBLISHED)
+
+    async def test_aunpublish(self):
+        await self.published.aunpublish(self.user)
+
+        self.assertEqual((await Version.objects.aget(pk=self.published.pk)).state, constants.UNPUBLISHED)
+
+    async def test_aarchive(self):
+        await self.draft.aarchive(self.user)
+
+        self.assertEqual((await Version.objects.aget(pk=self.draft.pk)).state, constants.ARCHIVED)
+
+    async def test_acopy(self):
+        new_version = await self.published.acopy(self.user)
+
+        self.assertEqual(new_version.state, constants.DRAFT)
+        self.assertEqual(new_version.source_id, self.published.pk)
+        self.assertNotEqual(new_version.object_id, self.published.object_id)
+        self.assertTrue(await PollContent.admin_manager.filter(pk=new_version.object_id).aexists())
+
+
+class AsyncContentTestCase(CMSTestCase):
+    def setUp(self):
+        self.user = factories.UserFactory()
+        self.poll = factories.PollFactory()
+        self.published = factories.PollVersionFactory(
+            content__poll=self.poll, content__language="en", state=constants.PUBLISHED
+        )
+        self.draft = factories.PollVersionFactory(content__poll=self.poll, content__language="en")
+        self.archived = factories.PollVersionFactory(
+            content__poll=self.poll, content__language="fr", state=constants.ARCHIVED
+        )
+
+    async def test_acurrent_content(self):
+        contents = await PollContent.admin_manager.acurrent_content(poll=self.poll)
+
+        self.assertEqual(contents, [self.draft.content])
+
+    async def test_alatest_content(self):
+        contents = await PollContent.admin_manager.filter(poll=self.poll).alatest_content()
+
+        self.assertCountEqual(contents, [self.draft.content, self.archived.content])
+
+    async def test_aget_latest_admin_viewable_content(self):
+        poll = await Poll.objects.aget(pk=self.poll.pk)
+
+        self.assertEqual(await aget_latest_admin_viewable_content(poll, language="en"), self.draft.content)
+        self.assertIsNone(await aget_latest_admin_viewable_content(poll, language="fr"))
+        self.assertEqual(
+            await aget_latest_admin_viewable_content(poll, include_unpublished_archived=True, language="fr"),
+            self.archived.content,
+        )
+        self.assertEqual(
+            await aget_latest_admin_viewable_content(poll, language="en"),
+            await sync_to_async(get_latest_admin_viewable_content)(poll, language="en"),
+        )
+
+    async def test_acreate_creates_version(self):
+        content = await PollContent.objects.with_user(self.user).acreate(poll=self.poll, language="de", text="Hallo")
+
+        version = await Version.objects.aget_for_content(content)
+        self.assertEqual(version.state, constants.DRAFT)
+        self.assertEqual(version.created_by_id, self.user.pk)
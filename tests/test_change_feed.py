@@ -0,0 +1,227 @@
+import json
+from datetime import timedelta
+from io import StringIO
+from unittest.mock import patch
+
+from cms.test_utils.testcases import CMSTestCase
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.utils import timezone
+from freezegun import freeze_time
+
+from djangocms_versioning import constants, versionables
+from djangocms_versioning.helpers import (
+    create_version_lock,
+    release_expired_version_locks,
+    remove_version_lock,
+)
+from djangocms_versioning.integrity import check_versionable
+from djangocms_versioning.models import StateTracking, Version
+from djangocms_versioning.test_utils import factories
+from djangocms_versioning.test_utils.blogpost.models import BlogContent
+from djangocms_versioning.test_utils.polls.models import Poll, PollContent
+
+
+class ChangeFeedTestCase(CMSTestCase):
+    def setUp(self):
+        patcher = patch("djangocms_versioning.conf.CHANGE_FEED", True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.user = factories.UserFactory()
+
+    def _events(self):
+        changes = StateTracking.objects.iter_changes()
+        return [(change["event"], change["old_state"], change["new_state"]) for change in changes]
+
+    def test_records_creation_and_transitions(self):
+        version = factories.PollVersionFactory(created_by=self.user)
+        version.publish(self.user)
+
+        self.assertEqual(self._events(), [
+            (constants.EVENT_CREATED, None, constants.DRAFT),
+            (constants.EVENT_TRANSITION, constants.DRAFT, constants.PUBLISHED),
+        ])
+        created = StateTracking.objects.since().first()
+        self.assertEqual(created.user, self.user)
+        self.assertEqual(created.content_type_id, version.content_type_id)
+
+    def test_records_lock_changes(self):
+        version = factories.PollVersionFactory(created_by=self.user)
+        other_user = factories.UserFactory()
+
+        create_version_lock(version, self.user)
+        create_version_lock(version, self.user)  # Renewals are not changes
+        remove_version_lock(version, other_user)
+
+        self.assertEqual(
+            list(StateTracking.objects.since().values_list("event", "user")),
+            [
+                (constants.EVENT_CREATED, self.user.pk),
+                (constants.EVENT_LOCKED, self.user.pk),
+                (constants.EVENT_UNLOCKED, other_user.pk),
+            ],
+        )
+
+    @patch("djangocms_versioning.conf.LOCK_VERSIONS", True)
+    def test_edit_of_published_version_with_draft_records_no_lock(self):
+        user = self.get_superuser()
+        published = factories.PollVersionFactory(state=constants.PUBLISHED, created_by=user)
+        draft = factories.PollVersionFactory(
+            content__poll=published.content.poll, content__language=published.content.language,
+            created_by=user,
+        )
+        cursor = StateTracking.objects.since().last().pk
+
+        with self.login_user_context(user), self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(
+                self.get_admin_url(published.versionable.version_model_proxy, "edit_redirect", published.pk)
+            )
+
+        self.assertEqual(response.status_code, 302)
+        self.assertFalse(StateTracking.objects.since(cursor).exists())
+        self.assertIsNone(Version.objects.get(pk=published.pk).locked_by)
+        self.assertEqual(Version.objects.get(pk=draft.pk).state, constants.DRAFT)
+
+    def test_records_expired_locks(self):
+        version = factories.PollVersionFactory(created_by=self.user)
+        create_version_lock(version, self.user)
+        Version.objects.filter(pk=version.pk).update(locked_until=timezone.now() - timedelta(seconds=1))
+
+        self.assertEqual(release_expired_version_locks(), 1)
+
+        change = StateTracking.objects.since().last()
+        self.assertEqual((change.event, change.user, change.content_type_id), (
+            constants.EVENT_UNLOCKED, None, version.content_type_id,
+        ))
+        self.assertIsNone(Version.objects.get(pk=version.pk).locked_by)
+
+    def test_records_bulk_created_versions(self):
+        poll = Poll.objects.create()
+        for _ in range(2):
+            # Use save NOT objects.create to avoid creating Version object
+            PollContent(poll=poll, language="en").save()
+
+        call_command(
+            "create_versions", userid=self.user.pk, state=constants.DRAFT, bulk=True, batch_size=1, stdout=StringIO()
+        )
+
+        changes = list(StateTracking.objects.since())
+        self.assertEqual(
+            sorted(change.version_id for change in changes), sorted(Version.objects.values_list("pk", flat=True))
+        )
+        self.assertEqual(
+            {(change.event, change.old_state, change.new_state, change.user_id) for change in changes},
+            {
+                (constants.EVENT_CREATED, "", constants.DRAFT, self.user.pk),
+                (constants.EVENT_CREATED, "", constants.ARCHIVED, self.user.pk),
+            },
+        )
+
+    def test_records_integrity_fixes(self):
+        poll = factories.PollFactory()
+        versions = [
+            factories.PollVersionFactory(content__poll=poll, content__language="en", state=constants.ARCHIVED)
+            for _ in range(2)
+        ]
+        Version.objects.filter(pk__in=[version.pk for version in versions]).update(state=constants.PUBLISHED)
+        cursor = StateTracking.objects.since().last().pk
+
+        check_versionable(versionables.for_content(PollContent), fix=True)
+
+        change = StateTracking.objects.since(cursor).get()
+        self.assertEqual(
+            (change.version_id, change.event, change.old_state, change.new_state, change.user),
+            (versions[0].pk, constants.EVENT_TRANSITION, constants.PUBLISHED, constants.UNPUBLISHED, None),
+        )
+
+    def test_only_transitions_are_recorded_by_default(self):
+        with patch("djangocms_versioning.conf.CHANGE_FEED", False):
+            version = factories.PollVersionFactory(created_by=self.user)
+            create_version_lock(version, self.user)
+            version.archive(self.user)
+
+        self.assertEqual(self._events(), [(constants.EVENT_TRANSITION, constants.DRAFT, constants.ARCHIVED)])
+
+    def test_iter_changes_since_cursor(self):
+        versions = [factories.PollVersionFactory(state=constants.PUBLISHED) for _ in range(5)]
+        cursor = StateTracking.objects.since().values_list("pk", flat=True)[1]
+
+        changes = list(StateTracking.objects.iter_changes(cursor, batch_size=2))
+
+        self.assertEqual([change["version"] for change in changes], [version.pk for version in versions[2:]])
+        self.assertEqual(changes[0], {
+            "cursor": cursor + 1,
+            "event": constants.EVENT_CREATED,
+            "date": StateTracking.objects.get(pk=cursor + 1).date.isoformat(),
+            "content_type": "polls.pollcontent",
+            "object_id": versions[2].object_id,
+            "version": versions[2].pk,
+            "number": str(versions[2].number),
+            "old_state": None,
+            "new_state": constants.PUBLISHED,
+            "user": versions[2].created_by_id,
+        })
+
+    def test_lag_leaves_out_recent_changes(self):
+        with freeze_time("2024-01-01 12:00"):
+            old_version = factories.PollVersionFactory()
+        with freeze_time("2024-01-01 12:05"):
+            factories.PollVersionFactory()
+
+        with freeze_time("2024-01-01 12:06"):
+            changes = list(StateTracking.objects.iter_changes(lag=timedelta(minutes=5)))
+            all_changes = list(StateTracking.objects.iter_changes())
+
+        self.assertEqual([change["version"] for change in changes], [old_version.pk])
+        self.assertEqual(len(all_changes), 2)
+
+    def test_stream_changes_command_lag(self):
+        with freeze_time("2024-01-01 12:00"):
+            factories.PollVersionFactory()
+        out = StringIO()
+
+        with freeze_time("2024-01-01 12:00:30"):
+            call_command("stream_changes", lag=60, stdout=out)
+            self.assertEqual(out.getvalue(), "")
+            call_command("stream_changes", lag=10, stdout=out)
+
+        self.assertEqual(len(out.getvalue().splitlines()), 1)
+
+    def test_since_filters_by_model(self):
+        factories.PollVersionFactory()
+        blog_version = factories.BlogPostVersionFactory()
+
+        with self.assertNumQueries(1):
+            changes = list(StateTracking.objects.since(models=[BlogContent]))
+
+        self.assertEqual([change.version_id for change in changes], [blog_version.pk])
+        self.assertEqual(StateTracking.objects.since(models=[PollContent, BlogContent]).count(), 2)
+
+    def test_stream_changes_command(self):
+        versions = [factories.PollVersionFactory() for _ in range(3)]
+        factories.BlogPostVersionFactory()
+        out = StringIO()
+
+        call_command(
+            "stream_changes",
+            since=StateTracking.objects.since().first().pk,
+            model=["polls.PollContent"],
+            batch_size=1,
+            stdout=out,
+        )
+
+        lines = [json.loads(line) for line in out.getvalue().splitlines()]
+        self.assertEqual([line["version"] for line in lines], [version.pk for version in versions[1:]])
+
+    def test_stream_changes_command_limit(self):
+        for _ in range(3):
+            factories.PollVersionFactory()
+        out = StringIO()
+
+        call_command("stream_changes", limit=2, stdout=out)
+
+        self.assertEqual(len(out.getvalue().splitlines()), 2)
+
+    def test_stream_changes_command_rejects_unversioned_model(self):
+        with self.assertRaises(CommandError):
+            call_command("stream_changes", model=["auth.User"], stdout=StringIO())
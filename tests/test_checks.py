@@ -1,5 +1,12 @@
+from unittest.mock import Mock, patch
+
+from cms.models import Placeholder
 from cms.models.fields import PlaceholderRelationField
 from cms.test_utils.testcases import CMSTestCase
+from cms.toolbar.toolbar import CMSToolbar
+from django.http import HttpResponse
+from django.test import RequestFactory
+from sekizai.context import SekizaiContext
 
 from djangocms_versioning.constants import (
     ARCHIVED,
@@ -7,7 +14,13 @@ from djangocms_versioning.constants import (
     PUBLISHED,
     UNPUBLISHED,
 )
-from djangocms_versioning.helpers import is_content_editable
+from djangocms_versioning.helpers import is_content_editable, placeholder_content_is_unlocked_for_user
+from djangocms_versioning.models import Version
+from djangocms_versioning.placeholder_checks import (
+    PlaceholderCheckCacheMiddleware,
+    placeholder_check_cache,
+    prime_placeholder_check_cache,
+)
 from djangocms_versioning.test_utils.factories import (
     FancyPollFactory,
     PageVersionFactory,
@@ -49,3 +62,117 @@ class CheckDraftEditableTestCase(CMSTestCase):
 class CheckInjectTestCase(CMSTestCase):
     def test_draft_state_check_is_injected_into_default_checks(self):
         self.assertIn(is_content_editable, PlaceholderRelationField.default_checks)
+
+
+class PlaceholderCheckCacheTestCase(CMSTestCase):
+    def setUp(self):
+        self.user = self.get_superuser()
+        self.version = PageVersionFactory(state=DRAFT, created_by=self.user, locked_by=self.user)
+        for _ in range(3):
+            PlaceholderFactory(source=self.version.content)
+
+    def _placeholders(self):
+        # Fresh instances without cached source objects, as rendered by the cms
+        return list(Placeholder.objects.filter(object_id=self.version.object_id))
+
+    def _run_checks(self, placeholders):
+        return [
+            (
+                is_content_editable(placeholder, self.user),
+                placeholder_content_is_unlocked_for_user(placeholder, self.user),
+            )
+            for placeholder in placeholders
+        ]
+
+    def test_version_is_looked_up_once_per_source(self):
+        placeholders = self._placeholders()
+
+        with placeholder_check_cache(), self.assertNumQueries(1):
+            results = self._run_checks(placeholders)
+
+        self.assertEqual(results, [(True, True)] * 3)
+
+    def test_checks_without_cache(self):
+        placeholders = self._placeholders()
+
+        # Source object and version of each placeholder
+        with self.assertNumQueries(2 * 3):
+            results = self._run_checks(placeholders)
+
+        self.assertEqual(results, [(True, True)] * 3)
+
+    def test_prime_uses_cached_version(self):
+        placeholders = self._placeholders()
+        content = Version.objects.get(pk=self.version.pk).content
+        Version.objects.get_for_content(content)
+
+        with placeholder_check_cache(), self.assertNumQueries(0):
+            prime_placeholder_check_cache([content])
+            results = self._run_checks(placeholders)
+
+        self.assertEqual(results, [(True, True)] * 3)
+
+    def test_results_depend_on_user(self):
+        other_user = self._create_user("other", is_staff=True, is_superuser=True)
+        placeholder = self._placeholders()[0]
+
+        with placeholder_check_cache():
+            self.assertTrue(placeholder_content_is_unlocked_for_user(placeholder, self.user))
+            self.assertFalse(placeholder_content_is_unlocked_for_user(placeholder, other_user))
+
+    def test_check_results_are_computed_once_per_user(self):
+        placeholders = self._placeholders()
+        other_user = self._create_user("other", is_staff=True, is_superuser=True)
+
+        with placeholder_check_cache(), patch.object(
+            Version, "is_unlocked_for_user", autospec=True, side_effect=Version.is_unlocked_for_user
+        ) as is_unlocked_for_user:
+            self._run_checks(placeholders)
+            self.assertFalse(placeholder_content_is_unlocked_for_user(placeholders[0], other_user))
+
+        self.assertEqual(is_unlocked_for_user.call_count, 2)
+
+    def test_toolbar_rendering_opens_cache(self):
+        placeholders = self._placeholders()
+        request = RequestFactory().get("/")
+        request.user = self.user
+        request.session = {}
+        request.current_page = self.version.content.page
+        toolbar = request.toolbar = CMSToolbar(request)
+        toolbar.set_object(self.version.content)
+
+        def render(context):
+            with self.assertNumQueries(1):
+                self._run_checks(placeholders)
+            return ""
+
+        toolbar.render_with_structure(SekizaiContext({"request": request}), Mock(render=render))
+
+    def test_saving_versions_clears_cache(self):
+        placeholder = self._placeholders()[0]
+
+        with placeholder_check_cache():
+            self.assertTrue(is_content_editable(placeholder, self.user))
+            Version.objects.get(pk=self.version.pk).publish(self.user)
+            self.assertFalse(is_content_editable(placeholder, self.user))
+
+    def test_unversioned_source(self):
+        placeholder = PlaceholderFactory(source=FancyPollFactory())
+        placeholder = Placeholder.objects.get(pk=placeholder.pk)
+
+        with placeholder_check_cache(), self.assertNumQueries(0):
+            self.assertTrue(is_content_editable(placeholder, self.user))
+            self.assertTrue(placeholder_content_is_unlocked_for_user(placeholder, self.user))
+
+    def test_middleware(self):
+        placeholders = self._placeholders()
+
+        def view(request):
+            with self.assertNumQueries(1):
+                self._run_checks(placeholders)
+            return HttpResponse()
+
+        PlaceholderCheckCacheMiddleware(view)(RequestFactory().get("/"))
+        # The cache does not outlive the request
+        with self.assertNumQueries(2 * 3):
+            self._run_checks(placeholders)
@@ -1,13 +1,25 @@
 import copy
+from unittest.mock import patch
 
 from cms import api
 from cms.models import PageContent, Placeholder
 from cms.test_utils.testcases import CMSTestCase
 from django.apps import apps
+from django.contrib.contenttypes.models import ContentType
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from djangocms_text.utils import plugin_to_tag
 
+from djangocms_versioning import versionables
 from djangocms_versioning.constants import ARCHIVED, PUBLISHED
-from djangocms_versioning.datastructures import VersionableItem, default_copy
+from djangocms_versioning.datastructures import (
+    PolymorphicVersionableItem,
+    VersionableItem,
+    copy_placeholder,
+    default_copy,
+)
+from djangocms_versioning.helpers import clear_content_type_cache, get_content_type_id
 from djangocms_versioning.models import Version
 from djangocms_versioning.test_utils.factories import PageContentFactory, PollVersionFactory
 from djangocms_versioning.test_utils.people.models import PersonContent
@@ -135,6 +147,40 @@ class VersionableItemTestCase(CMSTestCase):
 
         self.assertEqual(versionable.content_model_is_sideframe_editable, True)
 
+    def test_content_types_are_cached_per_process(self):
+        content_type = ContentType.objects.get_for_model(PollContent)
+        content = self.initial_version.content
+        get_content_type_id(PollContent)
+        ContentType.objects.clear_cache()
+
+        versionable = VersionableItem(
+            content_model=PollContent,
+            grouper_field_name="poll",
+            copy_function=default_copy,
+        )
+        with self.assertNumQueries(0):
+            self.assertEqual(versionable.content_types, {content_type.pk})
+            self.assertEqual(get_content_type_id(content), content_type.pk)
+
+        clear_content_type_cache()
+        with self.assertNumQueries(1):
+            self.assertEqual(get_content_type_id(PollContent), content_type.pk)
+
+    def test_polymorphic_content_models(self):
+        versionable = PolymorphicVersionableItem(
+            content_model=PageContent,
+            grouper_field_name="page",
+            copy_function=default_copy,
+        )
+
+        self.assertEqual(versionable.content_models[0], PageContent)
+        content_types = ContentType.objects.get_for_models(*versionable.content_models, for_concrete_models=False)
+        self.assertEqual(versionable.content_types, {content_type.pk for content_type in content_types.values()})
+
+    def test_content_models_computed_when_configuring_app(self):
+        for versionable in versionables._cms_extension().versionables:
+            self.assertIn("content_models", versionable.__dict__)
+
 
 class VersionableItemProxyModelTestCase(CMSTestCase):
     @classmethod
@@ -255,3 +301,92 @@ class DefaultCopyTestCase(TestCase):
         original_content = MockContent(language=self.original_content.language, page=self.original_content.page)
         new_content = default_copy(original_content)
         self.assertTrue(new_content.copy_relations_called)
+
+
+class BulkCopyTestCase(CMSTestCase):
+    def setUp(self):
+        self.original_content = PageContentFactory()
+        self.language = self.original_content.language
+        self.poll = PollVersionFactory().content.poll
+        self.content_placeholder = Placeholder.objects.create(slot="content", source=self.original_content)
+        self.sidebar_placeholder = Placeholder.objects.create(slot="sidebar", source=self.original_content)
+
+        self.parent = api.add_plugin(self.content_placeholder, "TextPlugin", self.language, body="Parent")
+        self.child = api.add_plugin(
+            self.content_placeholder, "TextPlugin", self.language, target=self.parent, body="Child"
+        )
+        self.grandchild = api.add_plugin(
+            self.content_placeholder, "PollPlugin", self.language, target=self.child, poll=self.poll
+        )
+        self.child.body = f"Child {plugin_to_tag(self.grandchild)}"
+        self.child.save()
+        api.add_plugin(self.content_placeholder, "SimpleTextPlugin", self.language, body="Simple")
+        api.add_plugin(self.sidebar_placeholder, "PollPlugin", self.language, poll=self.poll)
+        api.add_plugin(self.sidebar_placeholder, "TextPlugin", "de", body="Sidebar")
+
+    def _get_tree(self, placeholder):
+        return [
+            (
+                plugin.plugin_type,
+                plugin.language,
+                plugin.position,
+                plugin.parent.plugin_type if plugin.parent else None,
+            )
+            for plugin in placeholder.cmsplugin_set.order_by("language", "position")
+        ]
+
+    def test_bulk_copy_copies_plugin_trees(self):
+        with patch("djangocms_versioning.conf.BULK_COPY", True):
+            new_content = default_copy(self.original_content)
+
+        for slot in ("content", "sidebar"):
+            original = self.original_content.placeholders.get(slot=slot)
+            copied = new_content.placeholders.get(slot=slot)
+            self.assertNotEqual(copied.pk, original.pk)
+            self.assertEqual(copied.source, new_content)
+            self.assertEqual(self._get_tree(copied), self._get_tree(original))
+
+        new_placeholder = new_content.placeholders.get(slot="content")
+        new_plugins = {
+            plugin.pk: plugin.get_plugin_instance()[0]
+            for plugin in new_placeholder.cmsplugin_set.all()
+        }
+        self.assertFalse(set(new_plugins) & {self.parent.pk, self.child.pk, self.grandchild.pk})
+        new_child = next(plugin for plugin in new_plugins.values() if plugin.body.startswith("Child"))
+        new_grandchild = next(plugin for plugin in new_plugins.values() if plugin.plugin_type == "PollPlugin")
+        self.assertEqual(new_grandchild.parent_id, new_child.pk)
+        self.assertEqual(new_grandchild.poll, self.poll)
+        # post_copy of the text plugin refers to the copied child plugin
+        self.assertIn(f'id="{new_grandchild.pk}"', new_child.body)
+        self.assertNotIn(f'id="{self.grandchild.pk}"', new_child.body)
+        self.assertEqual(
+            new_placeholder.cmsplugin_set.get(plugin_type="SimpleTextPlugin").get_plugin_instance()[0].body,
+            "Simple",
+        )
+
+    def test_bulk_copy_is_used_when_enabled(self):
+        with patch("djangocms_versioning.conf.BULK_COPY", True):
+            with patch("djangocms_versioning.datastructures.copy_placeholder") as mocked:
+                default_copy(self.original_content)
+        mocked.assert_not_called()
+
+        with patch("djangocms_versioning.conf.BULK_COPY", True), \
+                patch("djangocms_versioning.datastructures.can_bulk_copy", return_value=False), \
+                patch("djangocms_versioning.datastructures.copy_placeholder", wraps=copy_placeholder) as mocked:
+            default_copy(self.original_content)
+        self.assertEqual(mocked.call_count, 2)
+
+    def test_bulk_copy_queries_do_not_grow_with_plugins(self):
+        def count_queries():
+            with patch("djangocms_versioning.conf.BULK_COPY", True):
+                with CaptureQueriesContext(connection) as context:
+                    default_copy(self.original_content)
+            return len(context)
+
+        count_queries()  # Warm up caches
+        queries = count_queries()
+        for i in range(10):
+            api.add_plugin(self.sidebar_placeholder, "SimpleTextPlugin", self.language, body=f"More {i}")
+            api.add_plugin(self.sidebar_placeholder, "PollPlugin", self.language, poll=self.poll)
+
+        self.assertEqual(count_queries(), queries)
@@ -1,4 +1,5 @@
 from datetime import datetime
+from unittest.mock import patch
 
 from cms.api import add_plugin
 from cms.models import Placeholder, UserSettings
@@ -18,6 +19,22 @@ class HandlersTestCase(CMSTestCase):
         pv = Version.objects.get(pk=pv.pk)
         self.assertEqual(pv.modified, dt)
 
+    def test_modified_date_for_extension(self):
+        version = factories.PageVersionFactory()
+        extension = factories.TestTitleExtensionFactory(extended_object=version.content)
+        dt = datetime(2016, 6, 6)
+        with freeze_time(dt):
+            extension.save()
+        version = Version.objects.get(pk=version.pk)
+        self.assertEqual(version.modified, dt)
+
+    def test_modified_date_handler_not_run_for_unrelated_models(self):
+        poll = factories.PollFactory()
+        with patch("djangocms_versioning.handlers._update_modified") as mocked:
+            poll.save()
+            self.get_superuser().save()
+        mocked.assert_not_called()
+
     def test_add_plugin(self):
         version = factories.PageVersionFactory()
         placeholder = factories.PlaceholderFactory(source=version.content)
@@ -268,3 +268,33 @@ class TestGetLatestAdminViewableContent(CMSTestCase):
         )
         self.assertEqual(en_content.language, "en")
         self.assertEqual(en_content.versions.first(), self.version)
+
+    def test_latest_admin_viewable_contents_for_all_languages(self):
+        """All languages are loaded with a single query"""
+        self.version.publish(user=self.get_superuser())
+        en_draft = self.version.copy(self.get_superuser())
+        de_version = factories.PageVersionFactory(content__page=self.page, content__language="de", state="published")
+        factories.PageVersionFactory(content__page=self.page, content__language="it", state="archived")
+
+        with self.assertNumQueries(1):
+            contents = helpers.get_latest_admin_viewable_contents(self.page)
+        self.assertEqual(contents, {"en": en_draft.content, "de": de_version.content})
+
+        contents = helpers.get_latest_admin_viewable_contents(self.page, include_unpublished_archived=True)
+        self.assertEqual(set(contents), {"en", "de", "it"})
+        self.assertEqual(contents["en"], en_draft.content)
+
+    def test_latest_admin_viewable_contents_with_prefetch(self):
+        de_version = factories.PageVersionFactory(content__page=self.page, content__language="de", state="archived")
+        en_content_obj = self.version.content
+        de_content_obj = de_version.content
+        en_content_obj._prefetched_versions = [self.version]
+        de_content_obj._prefetched_versions = [de_version]
+        self.page._prefetched_contents = [de_content_obj, en_content_obj]
+
+        with self.assertNumQueries(0):
+            self.assertEqual(helpers.get_latest_admin_viewable_contents(self.page), {"en": en_content_obj})
+            self.assertEqual(
+                helpers.get_latest_admin_viewable_contents(self.page, include_unpublished_archived=True),
+                {"en": en_content_obj, "de": de_content_obj},
+            )
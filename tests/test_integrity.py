@@ -0,0 +1,140 @@
+import json
+from io import StringIO
+from unittest.mock import patch
+
+from cms.test_utils.testcases import CMSTestCase
+from django.core.management import CommandError, call_command
+from django.utils import timezone
+
+from djangocms_versioning import constants, versionables
+from djangocms_versioning.integrity import check_versionable
+from djangocms_versioning.models import Version
+from djangocms_versioning.test_utils import factories
+from djangocms_versioning.test_utils.polls.models import PollContent
+
+
+class CheckVersionsTestCase(CMSTestCase):
+    def setUp(self):
+        self.versionable = versionables.for_content(PollContent)
+        self.poll = factories.PollFactory()
+
+    def _create_version(self, state, language="en", **kwargs):
+        version = factories.PollVersionFactory(
+            content__poll=self.poll, content__language=language, state=constants.ARCHIVED, **kwargs
+        )
+        # Bypass the state machine and Version.save to break the invariants
+        Version.objects.filter(pk=version.pk).update(state=state)
+        return version
+
+    def test_no_problems(self):
+        factories.PollVersionFactory(content__poll=self.poll, content__language="en")
+        factories.PollVersionFactory(content__poll=self.poll, content__language="fr", state=constants.PUBLISHED)
+
+        report = check_versionable(self.versionable, fix=True)
+
+        self.assertEqual({check["count"] for check in report.values()}, {0})
+        self.assertEqual({check["fixed"] for check in report.values()}, {0})
+
+    def test_multiple_drafts_and_published(self):
+        drafts = [self._create_version(constants.DRAFT) for _i in range(3)]
+        Version.objects.filter(pk__in=[draft.pk for draft in drafts]).update(
+            locked_by=self.get_superuser(), locked_until=timezone.now()
+        )
+        published = [self._create_version(constants.PUBLISHED, language="fr") for _i in range(2)]
+        self._create_version(constants.DRAFT, language="it")
+
+        report = check_versionable(self.versionable)
+
+        self.assertEqual(report["multiple_drafts"]["count"], 1)
+        self.assertEqual(
+            report["multiple_drafts"]["examples"], [{"poll": self.poll.pk, "language": "en", "version_count": 3}]
+        )
+        self.assertEqual(report["multiple_published"]["count"], 1)
+        self.assertNotIn("fixed", report["multiple_drafts"])
+
+        report = check_versionable(self.versionable, fix=True, batch_size=1)
+
+        self.assertEqual(report["multiple_drafts"]["fixed"], 2)
+        # Archived versions are not locked
+        self.assertFalse(
+            Version.objects.filter(pk__in=[drafts[0].pk, drafts[1].pk])
+            .exclude(locked_by=None, locked_until=None)
+            .exists()
+        )
+        self.assertEqual(report["multiple_published"]["fixed"], 1)
+        states = dict(Version.objects.values_list("pk", "state"))
+        self.assertEqual(
+            [states[version.pk] for version in drafts], [constants.ARCHIVED, constants.ARCHIVED, constants.DRAFT]
+        )
+        self.assertEqual([states[version.pk] for version in published], [constants.UNPUBLISHED, constants.PUBLISHED])
+        self.assertEqual(check_versionable(self.versionable)["multiple_drafts"]["count"], 0)
+
+    @patch("djangocms_versioning.conf.ALLOW_DELETING_VERSIONS", constants.DELETE_ANY)
+    def test_content_and_version_without_counterpart(self):
+        content = factories.PollContentFactory(poll=self.poll)
+        source = factories.PollVersionFactory(content__poll=self.poll)
+        orphan = factories.PollVersionFactory(content__poll=self.poll, source=source)
+        child = factories.PollVersionFactory(content__poll=self.poll, source=orphan)
+        # Delete without cascading to the version
+        PollContent._base_manager.filter(pk=orphan.object_id)._raw_delete(using="default")
+
+        report = check_versionable(self.versionable, fix=True)
+
+        self.assertEqual(report["content_without_version"], {"count": 1, "examples": [content.pk], "fixed": None})
+        self.assertEqual(report["version_without_content"], {"count": 1, "examples": [orphan.pk], "fixed": 1})
+        self.assertFalse(Version.objects.filter(pk=orphan.pk).exists())
+        self.assertIsNone(Version.objects.get(pk=child.pk).source)
+
+    def test_version_without_content_is_kept_unless_deleting_is_allowed(self):
+        orphan = factories.PollVersionFactory(content__poll=self.poll)
+        PollContent._base_manager.filter(pk=orphan.object_id)._raw_delete(using="default")
+
+        report = check_versionable(self.versionable, fix=True)
+
+        self.assertEqual(report["version_without_content"], {"count": 1, "examples": [orphan.pk], "fixed": None})
+        self.assertTrue(Version.objects.filter(pk=orphan.pk).exists())
+
+    def test_duplicate_numbers(self):
+        versions = [self._create_version(constants.ARCHIVED) for _i in range(4)]
+        # Numbers 1, 2, 2, 4
+        Version.objects.filter(pk=versions[2].pk).update(number="2")
+
+        report = check_versionable(self.versionable, fix=True)
+
+        self.assertEqual(report["duplicate_numbers"]["count"], 1)
+        self.assertEqual(report["duplicate_numbers"]["fixed"], 1)
+        self.assertEqual(
+            list(Version.objects.order_by("pk").values_list("number", flat=True)), ["1", "2", "5", "4"]
+        )
+
+    def test_duplicate_non_numeric_numbers(self):
+        versions = [self._create_version(constants.ARCHIVED) for _i in range(2)]
+        Version.objects.filter(pk__in=[version.pk for version in versions]).update(number="x")
+
+        report = check_versionable(self.versionable, fix=True)
+
+        self.assertEqual(report["duplicate_numbers"]["fixed"], 1)
+        self.assertEqual(list(Version.objects.order_by("pk").values_list("number", flat=True)), ["x", "1"])
+
+    def test_command_report(self):
+        self._create_version(constants.DRAFT)
+        self._create_version(constants.DRAFT)
+
+        out = StringIO()
+        call_command("check_versions", model=["polls.PollContent"], stdout=out)
+        report = json.loads(out.getvalue())
+
+        self.assertFalse(report["ok"])
+        self.assertEqual(list(report["models"]), ["polls.PollContent"])
+        self.assertEqual(report["models"]["polls.PollContent"]["multiple_drafts"]["count"], 1)
+
+        out = StringIO()
+        call_command("check_versions", fix=True, stdout=out)
+        report = json.loads(out.getvalue())
+
+        self.assertTrue(report["ok"])
+        self.assertEqual(report["models"]["polls.PollContent"]["multiple_drafts"]["fixed"], 1)
+
+    def test_command_unversioned_model(self):
+        with self.assertRaises(CommandError):
+            call_command("check_versions", model=["polls.Poll"], stdout=StringIO())
@@ -1,4 +1,8 @@
+from datetime import datetime, timedelta
+from io import StringIO
+from smtplib import SMTPException
 from unittest import skip
+from unittest.mock import Mock, patch
 
 from cms.models import PlaceholderRelationField
 from cms.test_utils.testcases import CMSTestCase
@@ -8,10 +12,14 @@ from cms.utils import get_current_site
 from django.contrib import admin
 from django.contrib.auth.models import Permission
 from django.core import mail
+from django.core.mail import get_connection
+from django.core.management import call_command
+from django.db import connection
 from django.template.loader import render_to_string
 from django.test import RequestFactory, override_settings
 from django.urls import reverse
 from django.utils.translation import gettext_lazy as _
+from freezegun import freeze_time
 
 from djangocms_versioning import (
     admin as versioning_admin,
@@ -20,13 +28,13 @@ from djangocms_versioning import (
 )
 from djangocms_versioning.cms_config import VersioningCMSConfig
 from djangocms_versioning.constants import ARCHIVED, DRAFT, PUBLISHED, UNPUBLISHED
-from djangocms_versioning.emails import get_full_url
+from djangocms_versioning.emails import get_full_url, send_queued_emails
 from djangocms_versioning.helpers import (
     create_version_lock,
     placeholder_content_is_unlocked_for_user,
     version_list_url,
 )
-from djangocms_versioning.models import Version
+from djangocms_versioning.models import QueuedEmail, Version
 from djangocms_versioning.test_utils import factories
 from djangocms_versioning.test_utils.blogpost.models import BlogPost
 from djangocms_versioning.test_utils.factories import (
@@ -753,6 +761,126 @@ class VersionLockNotificationEmailsTestCase(CMSTestCase):
         self.assertIn(expected_body, mail.outbox[0].body)
 
 
+@override_settings(DJANGOCMS_VERSIONING_LOCK_VERSIONS=True)
+class EmailOutboxTestCase(CMSTestCase):
+
+    def setUp(self):
+        import importlib
+        importlib.reload(conf)
+        importlib.reload(versioning_admin)
+
+        self.user_author = self._create_user("author", is_staff=True, is_superuser=False)
+        self.versionable = VersioningCMSConfig.versioning[0]
+
+    def _queue_email(self, **kwargs):
+        return QueuedEmail.objects.create(
+            subject="Unlocked", body="Body", from_email="cms@example.com", recipients=["author@example.com"], **kwargs
+        )
+
+    def test_unlock_notification_is_queued(self):
+        draft_version = factories.PageVersionFactory(content__template="", created_by=self.user_author)
+        draft_unlock_url = self.get_admin_url(self.versionable.version_model_proxy, "unlock", draft_version.pk)
+
+        with patch("djangocms_versioning.conf.EMAIL_OUTBOX", True):
+            with self.login_user_context(self.get_superuser()):
+                self.client.post(draft_unlock_url, follow=True)
+
+        self.assertEqual(len(mail.outbox), 0)
+        queued = QueuedEmail.objects.get()
+        self.assertEqual(queued.recipients, [self.user_author.email])
+        self.assertIn("has been unlocked by", queued.body)
+
+        out = StringIO()
+        call_command("send_queued_emails", stdout=out)
+
+        self.assertIn("Sent 1 queued emails, 0 failed", out.getvalue())
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(mail.outbox[0].subject, queued.subject)
+        self.assertEqual(mail.outbox[0].to, [self.user_author.email])
+        self.assertFalse(QueuedEmail.objects.exists())
+
+    def test_batches_reuse_one_connection(self):
+        for _i in range(5):
+            self._queue_email()
+
+        with patch("djangocms_versioning.emails.get_connection", wraps=get_connection) as mocked:
+            self.assertEqual(send_queued_emails(batch_size=3), (3, 0))
+            self.assertEqual(send_queued_emails(batch_size=3), (2, 0))
+            self.assertEqual(send_queued_emails(batch_size=3), (0, 0))
+
+        self.assertEqual(mocked.call_count, 2)
+        self.assertEqual(len(mail.outbox), 5)
+
+    def test_failed_emails_are_retried_with_backoff(self):
+        with freeze_time("2025-01-01 12:00:00") as frozen_time:
+            email = self._queue_email()
+            with patch("django.core.mail.EmailMessage.send", side_effect=SMTPException("Unavailable")):
+                self.assertEqual(send_queued_emails(backoff=60), (0, 1))
+                email = QueuedEmail.objects.get(pk=email.pk)
+                self.assertEqual(email.attempts, 1)
+                self.assertEqual(email.last_error, "Unavailable")
+                self.assertEqual(email.next_attempt, datetime(2025, 1, 1, 12, 1))
+
+                # Not due yet
+                self.assertEqual(send_queued_emails(backoff=60), (0, 0))
+                frozen_time.tick(timedelta(minutes=1))
+                self.assertEqual(send_queued_emails(backoff=60), (0, 1))
+                self.assertEqual(QueuedEmail.objects.get(pk=email.pk).next_attempt, datetime(2025, 1, 1, 12, 3))
+
+            frozen_time.tick(timedelta(minutes=2))
+            self.assertEqual(send_queued_emails(backoff=60), (1, 0))
+        self.assertEqual(len(mail.outbox), 1)
+
+    def test_emails_are_sent_outside_of_transactions_and_claimed(self):
+        self._queue_email()
+        self._queue_email()
+        atomic_blocks = len(connection.atomic_blocks)
+        seen = []
+
+        def send(message):
+            seen.append(len(connection.atomic_blocks))
+            # A concurrent worker does not get the claimed emails
+            self.assertEqual(send_queued_emails(), (0, 0))
+            return 1
+
+        with patch("django.core.mail.EmailMessage.send", autospec=True, side_effect=send):
+            self.assertEqual(send_queued_emails(), (2, 0))
+
+        self.assertEqual(seen, [atomic_blocks, atomic_blocks])
+        self.assertFalse(QueuedEmail.objects.exists())
+
+    def test_emails_of_a_stopped_worker_are_sent_after_the_lease(self):
+        with freeze_time("2025-01-01 12:00:00") as frozen_time:
+            self._queue_email()
+            with patch("django.core.mail.EmailMessage.send", side_effect=KeyboardInterrupt):
+                with self.assertRaises(KeyboardInterrupt):
+                    send_queued_emails(lease=300)
+
+            frozen_time.tick(timedelta(seconds=299))
+            self.assertEqual(send_queued_emails(lease=300), (0, 0))
+            frozen_time.tick(timedelta(seconds=1))
+            self.assertEqual(send_queued_emails(lease=300), (1, 0))
+        self.assertEqual(len(mail.outbox), 1)
+
+    def test_emails_are_given_up_after_max_attempts(self):
+        self._queue_email(attempts=5)
+
+        self.assertEqual(send_queued_emails(max_attempts=5), (0, 0))
+        self.assertEqual(QueuedEmail.objects.count(), 1)
+
+    def test_connection_errors(self):
+        self._queue_email()
+        self._queue_email()
+        connection = Mock(open=Mock(side_effect=OSError("Connection refused")))
+
+        with patch("djangocms_versioning.emails.get_connection", return_value=connection):
+            self.assertEqual(send_queued_emails(), (0, 2))
+
+        self.assertEqual(list(QueuedEmail.objects.values_list("attempts", "last_error")), [
+            (1, "Connection refused"), (1, "Connection refused"),
+        ])
+
+
 @override_settings(DJANGOCMS_VERSIONING_LOCK_VERSIONS=True)
 class TestVersionsLockTestCase(CMSTestCase):
 
@@ -1011,6 +1139,137 @@ class VersionToolbarOverrideTestCase(CMSTestCase):
         self.assertEqual(len(unlock_buttons), 1)
 
 
+class VersionLockExpiryTestCase(CMSTestCase):
+    def setUp(self):
+        for name in ("djangocms_versioning.conf.LOCK_VERSIONS", "djangocms_versioning.cms_toolbars.LOCK_VERSIONS"):
+            patcher = patch(name, True)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        patcher = patch("djangocms_versioning.conf.LOCK_TTL", 600)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.superuser = self.get_superuser()
+        self.author = self._create_user("author", is_staff=True, is_superuser=True)
+
+    def _heartbeat_url(self, version):
+        return reverse("admin:djangocms_versioning_pollcontentversion_lock_heartbeat", args=(version.pk,))
+
+    def test_new_draft_lock_expires(self):
+        with freeze_time("2024-01-01 12:00"):
+            version = factories.PollVersionFactory(created_by=self.author, locked_by=self.author)
+            self.assertEqual(version.locked_until, datetime(2024, 1, 1, 12, 10, tzinfo=version.created.tzinfo))
+            self.assertFalse(version.is_unlocked_for_user(self.superuser))
+
+        with freeze_time("2024-01-01 12:11"):
+            self.assertFalse(version.is_locked())
+            self.assertTrue(version.is_unlocked_for_user(self.superuser))
+            self.assertEqual(version.locked_message(), "")
+            self.assertTrue(version.check_edit_redirect.as_bool(self.superuser))
+
+    def test_locks_without_ttl_do_not_expire(self):
+        with patch("djangocms_versioning.conf.LOCK_TTL", None):
+            version = factories.PollVersionFactory(created_by=self.author, locked_by=self.author)
+
+        self.assertIsNone(version.locked_until)
+        with freeze_time(datetime.now() + timedelta(days=365)):
+            self.assertTrue(version.is_locked())
+
+    def test_create_version_lock_only_writes_lock_fields(self):
+        version = factories.PollVersionFactory(created_by=self.author, locked_by=None)
+
+        with self.assertNumQueries(1):
+            create_version_lock(version, self.author)
+
+        version = Version.objects.get(pk=version.pk)
+        self.assertEqual(version.locked_by, self.author)
+        self.assertIsNotNone(version.locked_until)
+
+    def test_heartbeat_renews_lock(self):
+        with freeze_time("2024-01-01 12:00"):
+            version = factories.PollVersionFactory(created_by=self.author, locked_by=self.author)
+
+        with freeze_time("2024-01-01 12:05"), self.login_user_context(self.author):
+            response = self.client.post(self._heartbeat_url(version))
+
+        self.assertEqual(response.status_code, 200)
+        version = Version.objects.get(pk=version.pk)
+        self.assertEqual(version.locked_until.replace(tzinfo=None), datetime(2024, 1, 1, 12, 15))
+        self.assertEqual(response.json(), {"locked": True, "locked_until": version.locked_until.isoformat()})
+
+    def test_heartbeat_does_not_renew_lock_of_others(self):
+        version = factories.PollVersionFactory(created_by=self.author, locked_by=self.author)
+        locked_until = version.locked_until
+
+        with self.login_user_context(self.superuser):
+            response = self.client.post(self._heartbeat_url(version))
+
+        self.assertEqual(response.json(), {"locked": False, "locked_until": None})
+        version = Version.objects.get(pk=version.pk)
+        self.assertEqual(version.locked_until, locked_until)
+
+    def test_heartbeat_does_not_renew_expired_lock(self):
+        with freeze_time("2024-01-01 12:00"):
+            version = factories.PollVersionFactory(created_by=self.author, locked_by=self.author)
+
+        with freeze_time("2024-01-01 12:11"), self.login_user_context(self.author):
+            response = self.client.post(self._heartbeat_url(version))
+
+        self.assertFalse(response.json()["locked"])
+
+    def test_heartbeat_only_supports_post(self):
+        version = factories.PollVersionFactory(created_by=self.author, locked_by=self.author)
+
+        with self.login_user_context(self.author):
+            response = self.client.get(self._heartbeat_url(version))
+
+        self.assertEqual(response.status_code, 405)
+
+    def test_heartbeat_in_edit_mode_toolbar(self):
+        version = PageVersionFactory(created_by=self.author, locked_by=self.author)
+
+        toolbar = get_toolbar(version.content, self.author, edit_mode=True)
+        toolbar.post_template_populate()
+        heartbeats = [
+            item for item in toolbar.toolbar.get_right_items()
+            if getattr(item, "template", None) == "djangocms_versioning/admin/lock_heartbeat.html"
+        ]
+
+        self.assertEqual(len(heartbeats), 1)
+        self.assertEqual(heartbeats[0].extra_context["interval"], 200)
+        self.assertIn("/lock-heartbeat/", heartbeats[0].extra_context["heartbeat_url"])
+
+    def test_no_heartbeat_for_other_users(self):
+        version = PageVersionFactory(created_by=self.author, locked_by=self.author)
+
+        toolbar = get_toolbar(version.content, self.superuser, edit_mode=True)
+        toolbar.post_template_populate()
+
+        self.assertFalse([
+            item for item in toolbar.toolbar.get_right_items()
+            if getattr(item, "template", None) == "djangocms_versioning/admin/lock_heartbeat.html"
+        ])
+
+    def test_release_expired_locks(self):
+        with freeze_time("2024-01-01 12:00"):
+            expired = factories.PollVersionFactory(created_by=self.author, locked_by=self.author)
+        with freeze_time("2024-01-01 12:08"):
+            active = factories.PollVersionFactory(created_by=self.author, locked_by=self.author)
+        out = StringIO()
+
+        with freeze_time("2024-01-01 12:11"):
+            call_command("release_expired_locks", dry_run=True, stdout=out)
+            self.assertIn("1 expired version locks would be released", out.getvalue())
+            call_command("release_expired_locks", stdout=out)
+
+        self.assertIn("Released 1 expired version locks", out.getvalue())
+        expired = Version.objects.get(pk=expired.pk)
+        active = Version.objects.get(pk=active.pk)
+        self.assertIsNone(expired.locked_by)
+        self.assertIsNone(expired.locked_until)
+        self.assertEqual(active.locked_by, self.author)
+        self.assertEqual(len(mail.outbox), 0)
+
+
 class IntegrationTestCase(CMSTestCase):
 
     def setUp(self) -> None:
@@ -1,9 +1,13 @@
+from io import StringIO
+from unittest.mock import patch
+
 from cms.test_utils.testcases import CMSTestCase
 from django.core.management import call_command
 from django.db import transaction
 
-from djangocms_versioning import constants
+from djangocms_versioning import constants, versionables
 from djangocms_versioning.models import Version
+from djangocms_versioning.test_utils import factories
 from djangocms_versioning.test_utils.blogpost.models import (
     BlogContent,
     BlogPost,
@@ -12,6 +16,19 @@ from djangocms_versioning.test_utils.polls.models import Poll, PollContent
 
 
 class CreateVersionsTestCase(CMSTestCase):
+    def _create_unversioned_content(self, content_models_by_language):
+        with transaction.atomic():
+            post = BlogPost(name="my multi-lingual blog post")
+            post.save()
+            poll = Poll()
+            poll.save()
+            for language, cnt in content_models_by_language.items():
+                for _i in range(cnt):
+                    # Use save NOT objects.create to avoid creating Version object
+                    BlogContent(blogpost=post, language=language).save()
+                    PollContent(poll=poll, language=language).save()
+        return post, poll
+
     def test_create_versions(self):
         content_models_by_language = {"en": 5, "de": 2, "nl": 7}
 
@@ -57,3 +74,114 @@ class CreateVersionsTestCase(CMSTestCase):
             self.assertEqual(poll_contents[0].versions.first().state, constants.DRAFT)
             for cont in poll_contents[1:]:
                 self.assertEqual(cont.versions.first().state, constants.ARCHIVED)
+
+    def test_create_versions_bulk_matches_serial(self):
+        self._create_unversioned_content({"en": 5, "de": 2, "nl": 7})
+        # One existing draft: its grouping must only receive archived versions
+        existing = PollContent(poll=Poll.objects.create(), language="en")
+        existing.save()
+        Version.objects.create(content=existing, created_by=self.get_superuser(), state=constants.DRAFT)
+        PollContent(poll=existing.poll, language="en").save()
+
+        def snapshot():
+            return sorted(
+                Version.objects.values_list("content_type", "object_id", "state", "number")
+            )
+
+        call_command("create_versions", userid=self.get_superuser().pk, state=constants.DRAFT, stdout=StringIO())
+        serial = snapshot()
+        Version.objects.exclude(pk=existing.versions.first().pk).delete()
+
+        out = StringIO()
+        call_command(
+            "create_versions", userid=self.get_superuser().pk, state=constants.DRAFT,
+            bulk=True, batch_size=4, stdout=out,
+        )
+
+        self.assertEqual(snapshot(), serial)
+        self.assertIn("Created 15/15 version objects for PollContent", out.getvalue())
+        self.assertIn("PollContent: 3 draft, 12 archived", out.getvalue())
+
+    def test_create_versions_bulk_sets_author_sort_key(self):
+        for username in ("Zoe", "alice"):
+            self._create_unversioned_content({"en": 1})
+            user = factories.UserFactory(username=username)
+            call_command(
+                "create_versions", userid=user.pk, state=constants.DRAFT, bulk=True, stdout=StringIO()
+            )
+
+        authors = Version.objects.order_by("author_sort_key", "pk").values_list("created_by__username", flat=True)
+        self.assertEqual(list(authors), ["alice", "alice", "Zoe", "Zoe"])
+
+    @patch("djangocms_versioning.management.commands.create_versions.LOCK_VERSIONS", True)
+    @patch("djangocms_versioning.conf.LOCK_TTL", 600)
+    def test_create_versions_bulk_locks_expire(self):
+        self._create_unversioned_content({"en": 2})
+
+        call_command(
+            "create_versions", userid=self.get_superuser().pk, state=constants.DRAFT, bulk=True, stdout=StringIO()
+        )
+
+        drafts = Version.objects.filter(state=constants.DRAFT)
+        self.assertEqual(drafts.count(), 2)
+        self.assertFalse(drafts.filter(locked_until__isnull=True).exists())
+        self.assertFalse(
+            Version.objects.filter(state=constants.ARCHIVED).exclude(locked_by=None, locked_until=None).exists()
+        )
+
+    def test_create_versions_bulk_dry_run(self):
+        self._create_unversioned_content({"en": 3})
+
+        out = StringIO()
+        call_command(
+            "create_versions", userid=self.get_superuser().pk, state=constants.PUBLISHED,
+            bulk=True, dry_run=True, stdout=out,
+        )
+
+        self.assertEqual(Version.objects.count(), 0)
+        self.assertIn("Checked 3/3 version objects for BlogContent", out.getvalue())
+        self.assertIn("BlogContent: 1 published, 2 archived", out.getvalue())
+
+    def test_create_versions_jobs_match_serial(self):
+        for _i in range(5):
+            self._create_unversioned_content({"en": 3, "de": 1})
+
+        def snapshot():
+            return sorted(
+                Version.objects.values_list("content_type", "object_id", "state", "number")
+            )
+
+        call_command("create_versions", userid=self.get_superuser().pk, state=constants.DRAFT, stdout=StringIO())
+        serial = snapshot()
+        Version.objects.all().delete()
+
+        for bulk in (False, True):
+            with self.subTest(bulk=bulk):
+                out = StringIO()
+                call_command(
+                    "create_versions", userid=self.get_superuser().pk, state=constants.DRAFT,
+                    jobs=2, bulk=bulk, stdout=out,
+                )
+
+                self.assertEqual(snapshot(), serial)
+                # Uncommitted test data: jobs run in this process
+                self.assertIn("running jobs in this process", out.getvalue())
+                # 5 groupers of each model are split into chunks of 1 grouper each
+                self.assertIn("[10/10]", out.getvalue())
+                Version.objects.all().delete()
+
+    def test_create_versions_grouper_chunks(self):
+        from djangocms_versioning.management.commands.create_versions import Command
+
+        polls = [self._create_unversioned_content({"en": 2})[1] for _i in range(10)]
+        versionable = versionables.for_content(PollContent)
+
+        chunks = Command.get_grouper_chunks(versionable, PollContent.admin_manager.all(), jobs=2)
+
+        self.assertEqual(chunks, [
+            (polls[0].pk, polls[1].pk),
+            (polls[2].pk, polls[3].pk),
+            (polls[4].pk, polls[5].pk),
+            (polls[6].pk, polls[7].pk),
+            (polls[8].pk, polls[9].pk),
+        ])
@@ -0,0 +1,106 @@
+import socket
+from unittest.mock import Mock, patch
+
+from cms.test_utils.testcases import CMSTestCase
+from django_fsm import TransitionNotAllowed
+
+from djangocms_versioning import constants, metrics
+from djangocms_versioning.helpers import create_version_lock, remove_version_lock
+from djangocms_versioning.test_utils import factories
+from djangocms_versioning.test_utils.polls.models import Poll
+
+IN_MEMORY = "djangocms_versioning.metrics.InMemoryMetricsBackend"
+
+
+class MetricsTestCase(CMSTestCase):
+    def setUp(self):
+        patcher = patch("djangocms_versioning.conf.METRICS_BACKEND", IN_MEMORY)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.backend = metrics.get_metrics_backend()
+        self.user = self.get_superuser()
+        self.version = factories.PollVersionFactory(content__language="en")
+        self.backend.reset()
+
+    def test_backend_is_shared(self):
+        self.assertIsInstance(self.backend, metrics.InMemoryMetricsBackend)
+        self.assertIs(metrics.get_metrics_backend(), self.backend)
+
+    def test_no_backend(self):
+        with patch("djangocms_versioning.conf.METRICS_BACKEND", None):
+            self.assertIsNone(metrics.get_metrics_backend())
+            self.version.publish(self.user)
+
+        self.assertEqual(self.backend.records, [])
+
+    def test_operations_are_measured(self):
+        self.version.publish(self.user)
+        draft = self.version.copy(self.user)
+        draft.archive(self.user)
+        self.version.unpublish(self.user)
+
+        for operation in ("publish", "copy", "draft", "archive", "unpublish"):
+            with self.subTest(operation):
+                durations = self.backend.values(
+                    "versioning.operation.duration", operation=operation, content_type="polls.pollcontent"
+                )
+                self.assertEqual(len(durations), 1)
+                self.assertGreater(durations[0], 0)
+                self.assertGreater(
+                    self.backend.values("versioning.operation.queries", operation=operation)[0], 0
+                )
+
+    def test_locks_are_measured(self):
+        create_version_lock(self.version, self.user)
+        remove_version_lock(self.version)
+
+        self.assertEqual(len(self.backend.values("versioning.operation.duration", operation="lock")), 1)
+        self.assertEqual(len(self.backend.values("versioning.operation.duration", operation="unlock")), 1)
+
+    def test_hooks_are_measured(self):
+        versionable = self.version.versionable
+        with patch.object(versionable, "on_publish", lambda version: Poll.objects.count()):
+            self.version.publish(self.user)
+
+        self.assertEqual(self.backend.values("versioning.hook.queries", hook="on_publish"), [1])
+
+    def test_signals_are_measured(self):
+        self.version.publish(self.user)
+
+        for signal in ("pre_version_operation", "post_version_operation"):
+            with self.subTest(signal):
+                self.assertEqual(
+                    len(self.backend.values(
+                        "versioning.signal.duration", signal=signal, operation=constants.OPERATION_PUBLISH
+                    )),
+                    1,
+                )
+
+    def test_failed_operations_are_measured(self):
+        with self.assertRaises(TransitionNotAllowed):
+            self.version.unpublish(self.user)  # Draft versions cannot be unpublished
+
+        self.assertEqual(len(self.backend.values("versioning.operation.duration", operation="unpublish")), 1)
+
+
+class StatsdMetricsBackendTestCase(CMSTestCase):
+    def test_statsd_lines(self):
+        server = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        server.bind(("127.0.0.1", 0))
+        server.settimeout(5)
+        self.addCleanup(server.close)
+        backend = metrics.StatsdMetricsBackend(port=server.getsockname()[1], host="127.0.0.1", prefix="cms.")
+
+        backend.timing("versioning.operation.duration", 12.5, {"operation": "publish"})
+        backend.histogram("versioning.operation.queries", 7, {})
+
+        self.assertEqual(server.recv(1024), b"cms.versioning.operation.duration:12.5|ms|#operation:publish")
+        self.assertEqual(server.recv(1024), b"cms.versioning.operation.queries:7|h")
+
+    def test_send_errors_are_ignored(self):
+        backend = metrics.StatsdMetricsBackend()
+        backend.socket = Mock(sendto=Mock(side_effect=OSError))
+
+        backend.timing("versioning.operation.duration", 1, {})
+
+        backend.socket.sendto.assert_called_once()
@@ -2,12 +2,16 @@ from unittest.mock import Mock, patch
 
 from cms.test_utils.testcases import CMSTestCase
 from django.apps import apps
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.utils.timezone import now
 from freezegun import freeze_time
 
+from djangocms_versioning import constants
 from djangocms_versioning.constants import DRAFT, PUBLISHED
 from djangocms_versioning.datastructures import VersionableItem, default_copy
-from djangocms_versioning.models import Version, VersionQuerySet
+from djangocms_versioning.models import StateTracking, Version, VersionQuerySet
+from djangocms_versioning.signals import post_version_operation
 from djangocms_versioning.test_utils import factories
 from djangocms_versioning.test_utils.polls.cms_config import PollsCMSConfig
 from djangocms_versioning.test_utils.polls.models import Poll, PollContent
@@ -493,3 +497,135 @@ class TestVersionModelSource(CMSTestCase):
             new_version = original_version.copy(user)
 
         self.assertEqual(original_version, new_version.source)
+
+
+class AuthorSortKeyTestCase(CMSTestCase):
+    def test_sort_key_is_set_on_creation(self):
+        user = factories.UserFactory(username="Alice")
+
+        version = factories.PollVersionFactory(created_by=user)
+
+        self.assertEqual(Version.objects.get(pk=version.pk).author_sort_key, "alice")
+
+    def test_sort_key_follows_author(self):
+        version = factories.PollVersionFactory(created_by=factories.UserFactory(username="Alice"))
+        version = Version.objects.get(pk=version.pk)
+
+        version.created_by = factories.UserFactory(username="Bob")
+        version.save(update_fields=["created_by"])
+
+        self.assertEqual(Version.objects.get(pk=version.pk).author_sort_key, "bob")
+
+    def test_saving_without_author_change_does_not_load_author(self):
+        version = Version.objects.get(pk=factories.PollVersionFactory().pk)
+
+        with self.assertNumQueries(1):
+            version.save(update_fields=["modified"])
+        with self.assertNumQueries(1):
+            version.save()
+
+    def test_sort_key_follows_user_rename(self):
+        user = factories.UserFactory(username="Alice")
+        version = factories.PollVersionFactory(created_by=user)
+
+        user.username = "Zoe"
+        user.save()
+
+        self.assertEqual(Version.objects.get(pk=version.pk).author_sort_key, "zoe")
+
+    def test_saving_other_user_fields_does_not_update_versions(self):
+        user = factories.UserFactory(username="Alice")
+        factories.PollVersionFactory(created_by=user)
+
+        with CaptureQueriesContext(connection) as ctx:
+            user.last_login = now()
+            user.save(update_fields=["last_login"])
+
+        self.assertFalse([query for query in ctx.captured_queries if "djangocms_versioning_version" in query["sql"]])
+
+
+class RollbackTestCase(CMSTestCase):
+    def setUp(self):
+        patcher = patch("djangocms_versioning.conf.INSTANT_ROLLBACK", True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.user = factories.UserFactory()
+        self.poll = factories.PollFactory()
+
+    def _version(self, state):
+        return factories.PollVersionFactory(content__poll=self.poll, content__language="en", state=state)
+
+    def test_rollback_publishes_version_without_copying(self):
+        previous = self._version(constants.UNPUBLISHED)
+        current = self._version(PUBLISHED)
+
+        with freeze_time("2999-01-11"):
+            previous.rollback(self.user)
+
+        self.assertEqual(Version.objects.count(), 2)
+        self.assertEqual(PollContent._base_manager.count(), 2)
+        previous = Version.objects.get(pk=previous.pk)
+        self.assertEqual(previous.state, PUBLISHED)
+        self.assertEqual(previous.modified.year, 2999)
+        self.assertEqual(Version.objects.get(pk=current.pk).state, constants.UNPUBLISHED)
+        self.assertQuerySetEqual(
+            StateTracking.objects.order_by("pk").values_list("version", "old_state", "new_state", "user"),
+            [
+                (previous.pk, constants.UNPUBLISHED, PUBLISHED, self.user.pk),
+                (current.pk, PUBLISHED, constants.UNPUBLISHED, self.user.pk),
+            ],
+            transform=tuple,
+            ordered=False,
+        )
+
+    def test_rollback_from_archived_keeps_draft(self):
+        archived = self._version(constants.ARCHIVED)
+        draft = self._version(DRAFT)
+
+        archived.rollback(self.user)
+
+        self.assertEqual(Version.objects.get(pk=archived.pk).state, PUBLISHED)
+        self.assertEqual(Version.objects.get(pk=draft.pk).state, DRAFT)
+        tracking = StateTracking.objects.get()
+        self.assertEqual((tracking.old_state, tracking.new_state), (constants.ARCHIVED, PUBLISHED))
+
+    def test_rollback_calls_on_publish_and_sends_publish_signals(self):
+        previous = self._version(constants.UNPUBLISHED)
+        current = self._version(PUBLISHED)
+        versionable = PollsCMSConfig.versioning[0]
+        receiver = Mock()
+        post_version_operation.connect(receiver, sender=PollContent)
+        self.addCleanup(post_version_operation.disconnect, receiver, sender=PollContent)
+
+        with patch.object(versionable, "on_publish") as on_publish:
+            previous.rollback(self.user)
+
+        on_publish.assert_called_once_with(previous)
+        publish_calls = [
+            call.kwargs for call in receiver.call_args_list if call.kwargs["operation"] == constants.OPERATION_PUBLISH
+        ]
+        self.assertEqual(len(publish_calls), 1)
+        self.assertTrue(publish_calls[0]["rollback"])
+        self.assertEqual(publish_calls[0]["unpublished"], [current])
+
+    def test_failing_on_publish_rolls_back_state_change(self):
+        previous = self._version(constants.UNPUBLISHED)
+        current = self._version(PUBLISHED)
+        versionable = PollsCMSConfig.versioning[0]
+
+        with patch.object(versionable, "on_publish", side_effect=ValueError), self.assertRaises(ValueError):
+            previous.rollback(self.user)
+
+        self.assertEqual(Version.objects.get(pk=previous.pk).state, constants.UNPUBLISHED)
+        self.assertEqual(Version.objects.get(pk=current.pk).state, PUBLISHED)
+        self.assertFalse(StateTracking.objects.exists())
+
+    def test_check_rollback(self):
+        unpublished = self._version(constants.UNPUBLISHED)
+        user = self.get_superuser()
+
+        self.assertTrue(unpublished.check_rollback.as_bool(user))
+        self.assertFalse(self._version(DRAFT).check_rollback.as_bool(user))
+        self.assertFalse(unpublished.check_rollback.as_bool(self.user))
+        with patch("djangocms_versioning.conf.INSTANT_ROLLBACK", False):
+            self.assertFalse(unpublished.check_rollback.as_bool(user))
@@ -9,6 +9,7 @@ assertion would pass vacuously.
 """
 from contextlib import contextmanager
 from unittest import skipIf
+from unittest.mock import patch
 
 from django.contrib import admin as django_admin
 from django.contrib.admin.sites import AdminSite
@@ -20,6 +21,7 @@ from django.test.utils import CaptureQueriesContext
 from djangocms_versioning import conf
 from djangocms_versioning.admin import ExtendedVersionAdminMixin
 from djangocms_versioning.cms_toolbars import VersioningToolbar
+from djangocms_versioning.constants import DRAFT, PUBLISHED
 from djangocms_versioning.indicators import content_indicator
 from djangocms_versioning.models import Version
 from djangocms_versioning.test_utils.factories import (
@@ -140,6 +142,26 @@ class ToolbarPerformanceTestCase(PerformanceTestMixin, TestCase):
             f"{len(version_queries)}; suggests an N+1 in the toolbar version lookup.",
         )
 
+    def test_toolbar_state_is_loaded_with_one_query(self):
+        """The version, the draft and published versions of its grouping and the
+        source version are loaded together."""
+        published = self.poll_content.versions.first()
+        published.publish(self.user)
+        draft = published.copy(self.user)
+        content = draft.content
+        self._clear_version_cache(content)
+        toolbar = self._create_toolbar(content, edit_mode=True)
+
+        with self.assertNumQueries(1):
+            state = toolbar._load_toolbar_state()
+            version = toolbar._get_version()
+            self.assertEqual(version.source, published)
+            self.assertEqual(version.get_latest_draft_version(), draft)
+
+        self.assertEqual(version, draft)
+        self.assertEqual(state[DRAFT], draft)
+        self.assertEqual(state[PUBLISHED], published)
+
 
 class MenuPerformanceTestCase(PerformanceTestMixin, TestCase):
     """Test that menu rendering prefetches versions instead of an N+1 loop."""
@@ -310,4 +332,49 @@ class ModelPerformanceTestCase(PerformanceTestMixin, TestCase):
             draft.publish(self.user)
 
 
+class HandlerPerformanceTestCase(PerformanceTestMixin, TestCase):
+    """Test that saving models unrelated to versioning does not pay for versioning."""
+
+    def test_bulk_save_of_unrelated_models(self):
+        """Saving unversioned models neither queries nor calls the modified date handler."""
+        polls = [PollFactory() for _ in range(50)]
+
+        with patch("djangocms_versioning.handlers._update_modified") as mocked:
+            with self.assertNumQueries(len(polls)):
+                for poll in polls:
+                    poll.save()
+        mocked.assert_not_called()
+
+
+class BenchmarkSuiteTestCase(TestCase):
+    """Test that the benchmark suite (``python -m tests.benchmark``) runs on a tiny dataset."""
+
+    def test_run_benchmarks(self):
+        from tests.benchmark import BENCHMARKS, run_benchmarks
+
+        results = run_benchmarks(groupers=5, languages=2, versions=3, pages=2, plugins=1, repeat=1, batch_size=2)
+
+        self.assertEqual(results["dataset"]["groupers"], 5)
+        self.assertEqual(list(results["benchmarks"]), list(BENCHMARKS))
+        for name, result in results["benchmarks"].items():
+            with self.subTest(name):
+                self.assertEqual(set(result), {"runs", "wall_time", "queries", "peak_memory"})
+                self.assertGreater(result["queries"], 0)
+                self.assertGreater(result["peak_memory"], 0)
+
+    def test_run_benchmarks_without_pages(self):
+        from tests.benchmark import run_benchmarks
+
+        results = run_benchmarks(groupers=2, versions=1, pages=0, repeat=1, names=["publish", "menu"])
+
+        self.assertIsNone(results["benchmarks"]["menu"])
+        self.assertEqual(results["benchmarks"]["publish"]["runs"], 1)
+
+    def test_unknown_benchmark(self):
+        from tests.benchmark import run_benchmarks
+
+        with self.assertRaises(ValueError):
+            run_benchmarks(groupers=1, names=["unknown"])
+
+
 # Run tests with: python -m pytest tests/test_performance.py -v
@@ -0,0 +1,85 @@
+from unittest.mock import patch
+
+from cms.test_utils.testcases import CMSTestCase
+from django.http import HttpResponse
+from django.test import RequestFactory
+
+from djangocms_versioning import constants
+from djangocms_versioning.indicators import content_indicator
+from djangocms_versioning.profiling import QueryProfileMiddleware, profile_queries
+from djangocms_versioning.test_utils import factories
+from djangocms_versioning.test_utils.polls.models import Poll, PollContent
+
+
+class QueryProfileTestCase(CMSTestCase):
+    def setUp(self):
+        self.version = factories.PollVersionFactory(content__language="en")
+
+    def test_queries_are_attributed_to_subsystems(self):
+        with profile_queries() as profile:
+            list(Poll.objects.all())
+            PollContent.admin_manager.latest_content().first()
+            content_indicator(PollContent.admin_manager.get(pk=self.version.content.pk))
+
+        self.assertEqual(profile.subsystems["other"]["count"], 1)
+        self.assertEqual(profile.subsystems["managers"]["count"], 2)
+        self.assertEqual(profile.subsystems["indicators"]["count"], 1)
+        self.assertEqual(profile.total["count"], 3)
+
+    def test_outermost_subsystem_is_used(self):
+        # Publishing calls other parts of versioning (e.g., the handlers)
+        with profile_queries() as profile:
+            self.version.publish(self.get_superuser())
+
+        self.assertEqual(set(profile.subsystems) - {"other"}, {"models"})
+
+    def test_summary(self):
+        with profile_queries("label", budgets={"managers": 5}) as profile:
+            PollContent.admin_manager.current_content().first()
+
+        summary = profile.summary()
+
+        self.assertEqual(summary["label"], "label")
+        self.assertEqual(summary["total"]["count"], 1)
+        self.assertEqual(list(summary["subsystems"]), ["managers"])
+        self.assertEqual(summary["exceeded"], {})
+
+    def test_exceeded_budgets_are_logged(self):
+        with patch("djangocms_versioning.conf.QUERY_BUDGETS", {"managers": 0, "total": 1, "toolbar": 0}):
+            with self.assertLogs("djangocms_versioning.profiling", "WARNING") as logs:
+                with profile_queries("label") as profile:
+                    PollContent.admin_manager.current_content().first()
+                    PollContent.admin_manager.latest_content().first()
+
+        self.assertEqual(profile.exceeded_budgets(), {"managers": (2, 0), "total": (2, 1)})
+        self.assertEqual(logs.output, [
+            "WARNING:djangocms_versioning.profiling:label: 2 managers queries exceed the budget of 0",
+            "WARNING:djangocms_versioning.profiling:label: 2 total queries exceed the budget of 1",
+        ])
+
+    def test_profiling_stops_after_block(self):
+        with profile_queries() as profile:
+            pass
+        PollContent.admin_manager.current_content().first()
+
+        self.assertEqual(profile.total["count"], 0)
+
+    def test_middleware_adds_server_timing(self):
+        def view(request):
+            PollContent.admin_manager.filter(versions__state=constants.DRAFT).count()
+            list(Poll.objects.all())
+            response = HttpResponse()
+            response["Server-Timing"] = "app;dur=1"
+            return response
+
+        request = RequestFactory().get("/")
+        with self.assertLogs("djangocms_versioning.profiling", "DEBUG") as logs:
+            response = QueryProfileMiddleware(view)(request)
+
+        self.assertRegex(response["Server-Timing"], r'^app;dur=1, versioning-managers;desc="1 queries";dur=[\d.]+$')
+        self.assertIn("GET /: 1 versioning queries", logs.output[0])
+
+    def test_middleware_without_versioning_queries(self):
+        response = QueryProfileMiddleware(lambda request: HttpResponse())(RequestFactory().get("/"))
+
+        self.assertFalse(response.has_header("Server-Timing"))
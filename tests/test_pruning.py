@@ -0,0 +1,270 @@
+from datetime import datetime, timedelta
+from io import StringIO
+from unittest.mock import patch
+
+from cms.models import CMSPlugin, PageContent, Placeholder
+from cms.operations import ADD_PLUGIN
+from cms.test_utils.testcases import CMSTestCase
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.db.models import F
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from freezegun import freeze_time
+
+from djangocms_versioning import constants, versionables
+from djangocms_versioning.handlers import update_modified_date_for_placeholder_source
+from djangocms_versioning.helpers import create_version_lock
+from djangocms_versioning.models import Version
+from djangocms_versioning.pruning import (
+    discard_unchanged_drafts,
+    get_prunable_versions,
+    get_unchanged_drafts,
+    prune_versions,
+)
+from djangocms_versioning.test_utils import factories
+from djangocms_versioning.test_utils.polls.models import PollContent
+
+
+@patch("djangocms_versioning.conf.ALLOW_DELETING_VERSIONS", constants.DELETE_ANY)
+class PruneVersionsTestCase(CMSTestCase):
+    def setUp(self):
+        self.versionable = versionables.for_content(PollContent)
+        self.poll = factories.PollFactory()
+        # Five archived versions (oldest first) followed by a draft
+        self.archived = []
+        for day in range(1, 6):
+            with freeze_time(datetime(2020, 1, day)):
+                self.archived.append(factories.PollVersionFactory(
+                    content__poll=self.poll, content__language="en", state=constants.ARCHIVED
+                ))
+        self.draft = factories.PollVersionFactory(content__poll=self.poll, content__language="en")
+
+    def test_keep_last_n(self):
+        prunable = get_prunable_versions(self.versionable, keep=2)
+
+        self.assertQuerySetEqual(prunable, self.archived[:3], ordered=False)
+
+    def test_older_than(self):
+        with freeze_time(datetime(2020, 1, 10)):
+            prunable = get_prunable_versions(self.versionable, older_than=timedelta(days=7))
+
+        self.assertQuerySetEqual(prunable, self.archived[:2], ordered=False)
+
+    def test_keep_and_older_than(self):
+        with freeze_time(datetime(2020, 1, 10)):
+            prunable = get_prunable_versions(self.versionable, keep=4, older_than=timedelta(days=7))
+
+        self.assertQuerySetEqual(prunable, self.archived[:1], ordered=False)
+
+    def test_groupings_are_separate(self):
+        other = factories.PollVersionFactory(
+            content__poll=self.poll, content__language="fr", state=constants.ARCHIVED
+        )
+        factories.PollVersionFactory(content__poll=self.poll, content__language="fr", state=constants.ARCHIVED)
+
+        prunable = get_prunable_versions(self.versionable, keep=1)
+
+        self.assertQuerySetEqual(prunable, [*self.archived[:4], other], ordered=False)
+
+    def test_latest_version_of_grouping_is_kept(self):
+        self.draft.delete()
+
+        prunable = get_prunable_versions(self.versionable, keep=0)
+
+        self.assertQuerySetEqual(prunable, self.archived[:4], ordered=False)
+
+    def test_source_of_published_version_is_kept(self):
+        published = self.archived[0].copy(self.get_superuser())
+        published.publish(self.get_superuser())
+
+        prunable = get_prunable_versions(self.versionable, keep=0)
+
+        self.assertNotIn(self.archived[0], prunable)
+        self.assertIn(self.archived[1], prunable)
+
+    def test_only_archived_or_unpublished_can_be_pruned(self):
+        with self.assertRaises(ValueError):
+            get_prunable_versions(self.versionable, keep=1, states=[constants.DRAFT])
+        with self.assertRaises(ValueError):
+            get_prunable_versions(self.versionable)
+
+    def test_prune_versions_in_batches(self):
+        # The draft is a copy of an archived version
+        self.draft.source = self.archived[0]
+        self.draft.save()
+        progress = []
+
+        with CaptureQueriesContext(connection) as ctx:
+            deleted = prune_versions(self.versionable, keep=1, batch_size=2, callback=progress.append)
+
+        # A fixed number of queries per batch (depending on the delete signal receivers)
+        self.assertLessEqual(len(ctx.captured_queries), 1 + 2 * 16)
+
+        self.assertEqual(deleted, 4)
+        self.assertEqual(progress, [2, 4])
+        self.assertQuerySetEqual(Version.objects.all(), [self.archived[4], self.draft], ordered=False)
+        self.assertEqual(PollContent._base_manager.filter(poll=self.poll).count(), 2)
+        self.assertIsNone(Version.objects.get(pk=self.draft.pk).source)
+
+    def test_prune_versions_dry_run(self):
+        self.assertEqual(prune_versions(self.versionable, keep=1, dry_run=True), 4)
+        self.assertEqual(Version.objects.count(), 6)
+
+    def test_prune_versions_deletes_placeholders_and_plugins(self):
+        user = self.get_superuser()
+        page_versions = [factories.PageVersionFactory(created_by=user)]
+        for _i in range(2):
+            placeholder = factories.PlaceholderFactory(source=page_versions[-1].content)
+            factories.TextPluginFactory(placeholder=placeholder)
+            page_versions.append(page_versions[-1].copy(user))
+            page_versions[-2].archive(user)
+        versionable = versionables.for_content(PageContent)
+
+        deleted = prune_versions(versionable, keep=0)
+
+        self.assertEqual(deleted, 2)
+        self.assertQuerySetEqual(Version.objects.filter(content_type__in=versionable.content_types),
+                                 [page_versions[-1]])
+        self.assertEqual(Placeholder.objects.count(), 2)
+        self.assertEqual(CMSPlugin.objects.count(), 2)
+        self.assertTrue(all(
+            placeholder.source == page_versions[-1].content for placeholder in Placeholder.objects.all()
+        ))
+
+    def test_prune_versions_requires_deleting_versions(self):
+        with patch("djangocms_versioning.conf.ALLOW_DELETING_VERSIONS", False):
+            with self.assertRaises(ImproperlyConfigured):
+                prune_versions(self.versionable, keep=1)
+        self.assertEqual(Version.objects.count(), 6)
+
+    def test_prune_versions_command(self):
+        out = StringIO()
+        call_command("prune_versions", keep=3, model=["polls.PollContent"], stdout=out)
+
+        self.assertIn("Successfully deleted 2 versions of PollContent", out.getvalue())
+        self.assertQuerySetEqual(Version.objects.all(), [*self.archived[2:], self.draft], ordered=False)
+
+    def test_prune_versions_command_dry_run(self):
+        out = StringIO()
+        with freeze_time(datetime(2020, 1, 10)):
+            call_command("prune_versions", older_than=7, dry_run=True, stdout=out)
+
+        self.assertIn("2 versions of PollContent would be deleted", out.getvalue())
+        self.assertEqual(Version.objects.count(), 6)
+
+    def test_prune_versions_command_errors(self):
+        with self.assertRaises(CommandError):
+            call_command("prune_versions", stdout=StringIO())
+        with self.assertRaises(CommandError):
+            call_command("prune_versions", keep=1, model=["polls.Poll"], stdout=StringIO())
+        with patch("djangocms_versioning.conf.ALLOW_DELETING_VERSIONS", constants.DELETE_NONE):
+            with self.assertRaises(CommandError):
+                call_command("prune_versions", keep=1, stdout=StringIO())
+
+
+@patch("djangocms_versioning.conf.ALLOW_DELETING_VERSIONS", constants.DELETE_ANY)
+class DiscardUnchangedDraftsTestCase(CMSTestCase):
+    def setUp(self):
+        self.user = self.get_superuser()
+        self.versionable = versionables.for_content(PageContent)
+        with freeze_time(datetime(2020, 1, 1)):
+            self.published = factories.PageVersionFactory(created_by=self.user, state=constants.PUBLISHED)
+            placeholder = factories.PlaceholderFactory(source=self.published.content)
+            factories.TextPluginFactory(placeholder=placeholder)
+
+    def _edit(self, version):
+        """Clicks "Edit" on the content of a version"""
+        url = self.get_admin_url(self.versionable.version_model_proxy, "edit_redirect", version.pk)
+        with self.login_user_context(self.user):
+            self.client.post(url)
+        return Version.objects.get(state=constants.DRAFT)
+
+    def test_draft_created_by_editing_is_unchanged(self):
+        with freeze_time(datetime(2020, 1, 2)):
+            draft = self._edit(self.published)
+
+        self.assertEqual(Placeholder.objects.filter(object_id=draft.object_id).count(), 1)
+        self.assertQuerySetEqual(get_unchanged_drafts(self.versionable), [draft])
+
+    def test_changed_drafts_are_kept(self):
+        draft = self._edit(self.published)
+        for change in (
+            draft.content.save,
+            lambda: update_modified_date_for_placeholder_source(
+                None, operation=ADD_PLUGIN, placeholder=draft.content.placeholders.get()
+            ),
+        ):
+            Version.objects.filter(pk=draft.pk).update(modified=F("created"))
+            change()
+
+            self.assertFalse(get_unchanged_drafts(self.versionable).exists())
+
+    def test_locked_drafts_are_kept(self):
+        draft = self._edit(self.published)
+        create_version_lock(draft, self.user)
+
+        with freeze_time(timezone.now() + timedelta(days=2)):
+            self.assertFalse(get_unchanged_drafts(self.versionable, older_than=timedelta(days=1)).exists())
+            self.assertEqual(discard_unchanged_drafts(self.versionable), 0)
+        self.assertTrue(Version.objects.filter(pk=draft.pk).exists())
+
+        # Expired locks do not protect a draft
+        Version.objects.filter(pk=draft.pk).update(locked_until=timezone.now() - timedelta(seconds=1))
+        self.assertQuerySetEqual(get_unchanged_drafts(self.versionable), [draft])
+
+    def test_only_drafts_copied_from_published_versions(self):
+        factories.PageVersionFactory(created_by=self.user)
+        archived = factories.PageVersionFactory(created_by=self.user, state=constants.ARCHIVED)
+        archived.copy(self.user)
+
+        self.assertFalse(get_unchanged_drafts(self.versionable).exists())
+
+    def test_older_than(self):
+        with freeze_time(datetime(2020, 1, 2)):
+            draft = self._edit(self.published)
+
+        with freeze_time(datetime(2020, 1, 2, 12)):
+            self.assertFalse(get_unchanged_drafts(self.versionable, older_than=timedelta(days=1)).exists())
+        with freeze_time(datetime(2020, 1, 3, 12)):
+            self.assertQuerySetEqual(get_unchanged_drafts(self.versionable, older_than=timedelta(days=1)), [draft])
+
+    def test_discard_unchanged_drafts(self):
+        self._edit(self.published)
+
+        self.assertEqual(discard_unchanged_drafts(self.versionable, dry_run=True), 1)
+        self.assertEqual(discard_unchanged_drafts(self.versionable), 1)
+
+        self.assertQuerySetEqual(Version.objects.all(), [self.published])
+        placeholders = Placeholder.objects.filter(content_type__in=self.versionable.content_types)
+        self.assertQuerySetEqual(placeholders, [self.published.content.placeholders.get()])
+        self.assertEqual(CMSPlugin.objects.count(), 1)
+        # Editing the published content again creates a new draft
+        self.assertNotEqual(self._edit(self.published).pk, self.published.pk)
+
+    def test_discard_unchanged_drafts_requires_deleting_versions(self):
+        self._edit(self.published)
+
+        with patch("djangocms_versioning.conf.ALLOW_DELETING_VERSIONS", False):
+            with self.assertRaises(ImproperlyConfigured):
+                discard_unchanged_drafts(self.versionable)
+        self.assertEqual(Version.objects.count(), 2)
+
+    def test_discard_unchanged_drafts_command(self):
+        with freeze_time(datetime(2020, 1, 2)):
+            self._edit(self.published)
+
+        out = StringIO()
+        with freeze_time(datetime(2020, 1, 2, 12)):
+            call_command("discard_unchanged_drafts", stdout=out)
+        self.assertIn("Successfully deleted 0 unchanged drafts of PageContent", out.getvalue())
+
+        out = StringIO()
+        with freeze_time(datetime(2020, 1, 2, 12)):
+            call_command("discard_unchanged_drafts", older_than=6, model=["cms.PageContent"], dry_run=True, stdout=out)
+        self.assertIn("1 unchanged drafts of PageContent would be deleted", out.getvalue())
+        self.assertEqual(Version.objects.count(), 2)
+
+        with self.assertRaises(CommandError):
+            call_command("discard_unchanged_drafts", model=["cms.Page"], stdout=StringIO())
@@ -0,0 +1,168 @@
+import time
+from unittest.mock import patch
+
+from cms.test_utils.testcases import CMSTestCase
+from django.db import connections, router
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+from djangocms_versioning import versionables
+from djangocms_versioning.models import Version
+from djangocms_versioning.routing import (
+    SESSION_KEY,
+    ReadReplicaPinningMiddleware,
+    _state,
+    get_read_database,
+    is_pinned_to_primary,
+    pin_to_primary,
+    read_routing_scope,
+)
+from djangocms_versioning.test_utils import factories
+from djangocms_versioning.test_utils.polls.models import PollContent
+
+
+def _reset_routing_state(testcase):
+    token = _state.set(None)
+    testcase.addCleanup(_state.reset, token)
+
+
+@override_settings(DATABASE_ROUTERS=["djangocms_versioning.routing.ReadReplicaRouter"])
+class ReadReplicaRouterTestCase(SimpleTestCase):
+    def setUp(self):
+        _reset_routing_state(self)
+        patcher = patch("djangocms_versioning.conf.READ_REPLICA", "replica")
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _content_from_replica(self):
+        content = PollContent(pk=1, poll_id=1, language="en")
+        content._state.db = "replica"
+        return content
+
+    def test_published_reads_use_replica(self):
+        self.assertEqual(PollContent.objects.all().db, "replica")
+        self.assertEqual(PollContent.objects.filter(language="en").db, "replica")
+
+    def test_other_reads_use_primary(self):
+        self.assertEqual(PollContent.admin_manager.all().db, "default")
+        self.assertEqual(PollContent._base_manager.all().db, "default")
+        self.assertEqual(Version.objects.all().db, "default")
+
+    def test_no_replica_configured(self):
+        with patch("djangocms_versioning.conf.READ_REPLICA", None):
+            self.assertIsNone(get_read_database())
+            self.assertEqual(PollContent.objects.all().db, "default")
+
+    def test_versions_of_content_read_from_replica(self):
+        content = self._content_from_replica()
+
+        self.assertEqual(router.db_for_read(Version, instance=content), "replica")
+
+    def test_objects_read_from_replica_are_written_to_primary(self):
+        content = self._content_from_replica()
+
+        self.assertEqual(router.db_for_write(PollContent, instance=content), "default")
+        self.assertEqual(router.db_for_write(Version, instance=content), "default")
+        other = PollContent(pk=2)
+        other._state.db = "default"
+        self.assertTrue(router.allow_relation(content, other))
+
+    def test_pinned_reads_use_primary(self):
+        with read_routing_scope():
+            pin_to_primary()
+
+            self.assertTrue(is_pinned_to_primary())
+            self.assertEqual(PollContent.objects.all().db, "default")
+            self.assertEqual(router.db_for_read(Version, instance=self._content_from_replica()), "default")
+        self.assertEqual(PollContent.objects.all().db, "replica")
+
+    def test_reads_in_transactions_use_primary(self):
+        with patch.object(connections["default"], "in_atomic_block", True):
+            self.assertEqual(PollContent.objects.all().db, "default")
+
+    def test_using_grouping_values(self):
+        versionable = versionables.for_content(PollContent)
+        # Avoid looking up content types in the database
+        patcher = patch.dict(versionable.__dict__, {"content_types": {1}})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.assertEqual(versionable.for_grouping_values(poll=1).db, "default")
+        self.assertEqual(versionable.for_grouping_values(using="replica", poll=1).db, "replica")
+        self.assertEqual(
+            versionable.for_content_grouping_values(self._content_from_replica(), using="replica").db, "replica"
+        )
+        self.assertEqual(Version.objects.filter_by_grouping_values(versionable, using="replica", poll=1).db, "replica")
+        self.assertEqual(
+            Version.objects.using("replica").filter_by_content_grouping_values(self._content_from_replica()).db,
+            "replica",
+        )
+
+
+class ReadReplicaPinningMiddlewareTestCase(SimpleTestCase):
+    def setUp(self):
+        _reset_routing_state(self)
+        patcher = patch("djangocms_versioning.conf.READ_REPLICA", "replica")
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _get(self, session, view):
+        request = RequestFactory().get("/")
+        request.session = session
+        return ReadReplicaPinningMiddleware(view)(request)
+
+    def test_session_sticks_to_primary_after_change(self):
+        databases = []
+
+        def read(request):
+            databases.append(get_read_database())
+            return HttpResponse()
+
+        def change(request):
+            pin_to_primary()
+            return read(request)
+
+        session = {}
+        self._get(session, read)
+        self._get(session, change)
+        self._get(session, read)
+        self._get({}, read)
+
+        self.assertEqual(databases, ["replica", None, None, "replica"])
+        self.assertGreater(session[SESSION_KEY], time.time())
+        # The request's state does not leak into the context
+        self.assertFalse(is_pinned_to_primary())
+
+    def test_pin_expires(self):
+        databases = []
+
+        def read(request):
+            databases.append(get_read_database())
+            return HttpResponse()
+
+        with patch("djangocms_versioning.conf.READ_REPLICA_PIN_SECONDS", -1):
+            session = {}
+            self._get(session, lambda request: pin_to_primary() or HttpResponse())
+            self._get(session, read)
+
+        self.assertEqual(databases, ["replica"])
+
+
+class VersionSavePinsTestCase(CMSTestCase):
+    def setUp(self):
+        _reset_routing_state(self)
+
+    def test_saving_versions_pins_reads_to_primary(self):
+        with read_routing_scope():
+            self.assertFalse(is_pinned_to_primary())
+
+            factories.PollVersionFactory()
+
+            self.assertTrue(is_pinned_to_primary())
+        # The pin ends with the scope
+        self.assertFalse(is_pinned_to_primary())
+
+    def test_saving_versions_outside_of_scopes_does_not_pin(self):
+        factories.PollVersionFactory()
+
+        self.assertFalse(is_pinned_to_primary())
@@ -1,9 +1,15 @@
+import threading
+from unittest.mock import Mock, call, patch
+
 from cms.models import PageContent
 from cms.test_utils.testcases import CMSTestCase
 from cms.test_utils.util.context_managers import signal_tester
+from django.db import transaction
 from django.dispatch import receiver
 
 from djangocms_versioning import constants
+from djangocms_versioning.helpers import create_version_lock
+from djangocms_versioning.operations import dispatch
 from djangocms_versioning.signals import (
     post_version_operation,
     pre_version_operation,
@@ -229,3 +235,102 @@ class TestVersioningSignals(CMSTestCase):
         self.assertEqual(len(signal_hits), 2)
         self.assertEqual(signal_hits[0].get("state"), constants.PUBLISHED)
         self.assertEqual(signal_hits[1].get("state"), constants.UNPUBLISHED)
+
+
+@patch("djangocms_versioning.conf.DEFER_POST_OPERATION_SIGNALS", True)
+class TestDeferredVersioningSignals(CMSTestCase):
+    def setUp(self):
+        self.superuser = self.get_superuser()
+
+    def test_post_signal_is_sent_after_commit(self):
+        version = factories.PollVersionFactory(state=constants.DRAFT)
+
+        with signal_tester(pre_version_operation, post_version_operation) as env:
+            with self.captureOnCommitCallbacks(execute=True):
+                version.publish(self.superuser)
+                # Only the pre operation signal has been sent within the transaction
+                self.assertEqual(env.call_count, 1)
+
+            self.assertEqual(env.call_count, 2)
+            self.assertEqual(env.calls[1][1]["operation"], constants.OPERATION_PUBLISH)
+            self.assertEqual(env.calls[1][1]["obj"], version)
+            self.assertEqual(env.calls[0][1]["token"], env.calls[1][1]["token"])
+
+    def test_post_signal_is_dropped_on_rollback(self):
+        version = factories.PollVersionFactory(state=constants.DRAFT)
+
+        with signal_tester(post_version_operation) as env:
+            with self.captureOnCommitCallbacks(execute=True) as callbacks:
+                try:
+                    with transaction.atomic():
+                        version.publish(self.superuser)
+                        raise ValueError
+                except ValueError:
+                    pass
+
+        self.assertEqual(callbacks, [])
+        self.assertEqual(env.call_count, 0)
+
+    def test_deferred_calls_are_deduplicated(self):
+        func = Mock()
+
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            dispatch("key", func, 1)
+            dispatch("key", func, 2)
+            dispatch("other", func, 3)
+
+        self.assertEqual(len(callbacks), 2)
+        self.assertEqual(func.call_args_list, [call(1), call(3)])
+
+    def test_content_change_is_emitted_once(self):
+        version = factories.PollVersionFactory(state=constants.PUBLISHED)
+        emit_content_change = Mock()
+
+        with patch("djangocms_versioning.models.emit_content_change", emit_content_change):
+            with self.captureOnCommitCallbacks(execute=True):
+                draft = version.copy(self.superuser)
+                draft.publish(self.superuser)
+                emit_content_change.assert_not_called()
+
+        self.assertEqual(emit_content_change.call_args_list, [
+            call(draft.content, created=True),
+            call(version.content),
+        ])
+
+    def test_content_change_is_emitted_for_lock_holder_changes_only(self):
+        version = factories.PollVersionFactory(state=constants.DRAFT)
+        emit_content_change = Mock()
+
+        with (
+            patch("djangocms_versioning.models.emit_content_change", emit_content_change),
+            patch("djangocms_versioning.helpers.emit_content_change", emit_content_change),
+        ):
+            with self.captureOnCommitCallbacks(execute=True):
+                create_version_lock(version, self.superuser)
+            self.assertEqual(emit_content_change.call_args_list, [call(version.content)])
+            emit_content_change.reset_mock()
+
+            # Renewing the lock of the same holder is no change
+            with self.captureOnCommitCallbacks(execute=True):
+                create_version_lock(version, self.superuser)
+
+        emit_content_change.assert_not_called()
+
+    @patch("djangocms_versioning.conf.POST_OPERATION_WORKERS", 1)
+    @patch.dict("djangocms_versioning.operations._executors", clear=True)
+    def test_post_signal_is_sent_from_worker_thread(self):
+        version = factories.PollVersionFactory(state=constants.DRAFT)
+        sent = threading.Event()
+        threads = []
+
+        def receiver(*args, **kwargs):
+            threads.append(threading.current_thread())
+            sent.set()
+
+        post_version_operation.connect(receiver)
+        self.addCleanup(post_version_operation.disconnect, receiver)
+        with self.captureOnCommitCallbacks(execute=True):
+            version.publish(self.superuser)
+
+        self.assertTrue(sent.wait(5))
+        self.assertNotEqual(threads, [threading.current_thread()])
@@ -0,0 +1,176 @@
+from io import StringIO
+from unittest.mock import patch
+
+from cms.test_utils.testcases import CMSTestCase
+from django.contrib import admin
+from django.core.management import call_command
+from django.test import RequestFactory
+
+from djangocms_versioning import constants, versionables
+from djangocms_versioning.integrity import check_versionable
+from djangocms_versioning.models import Version, VersionSummary
+from djangocms_versioning.pruning import prune_versions
+from djangocms_versioning.test_utils import factories
+from djangocms_versioning.test_utils.blogpost.models import BlogPost
+from djangocms_versioning.test_utils.polls.models import Poll, PollContent
+
+
+class VersionSummaryTestCase(CMSTestCase):
+    def setUp(self):
+        patcher = patch("djangocms_versioning.conf.VERSION_SUMMARY", True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.versionable = versionables.for_content(PollContent)
+        self.user = factories.UserFactory()
+        self.poll = factories.PollFactory()
+
+    def _summary(self, language="en"):
+        return VersionSummary.objects.for_grouping_values(self.versionable, poll=self.poll, language=language).get()
+
+    def test_draft_creation(self):
+        draft = factories.PollVersionFactory(content__poll=self.poll, content__language="en", created_by=self.user)
+
+        summary = self._summary()
+        self.assertEqual(summary.draft, draft)
+        self.assertIsNone(summary.published)
+        self.assertEqual(summary.state, constants.DRAFT)
+        self.assertEqual(summary.created_by, self.user)
+        self.assertEqual(summary.modified, draft.modified)
+        self.assertEqual(summary.version_count, 1)
+
+    def test_state_transitions(self):
+        published = factories.PollVersionFactory(content__poll=self.poll, content__language="en")
+        published.publish(self.user)
+        summary = self._summary()
+        self.assertEqual((summary.draft, summary.published, summary.state), (None, published, constants.PUBLISHED))
+
+        draft = published.copy(self.user)
+        summary = self._summary()
+        self.assertEqual((summary.draft, summary.published, summary.state), (draft, published, constants.DRAFT))
+        self.assertEqual(summary.created_by, self.user)
+        self.assertEqual(summary.version_count, 2)
+
+        draft.publish(self.user)
+        summary = self._summary()
+        self.assertEqual((summary.draft, summary.published, summary.state), (None, draft, constants.PUBLISHED))
+
+        Version.objects.get(pk=draft.pk).unpublish(self.user)
+        summary = self._summary()
+        # The latest version is shown if there is neither a draft nor a published version
+        self.assertEqual((summary.draft, summary.published, summary.state), (None, None, constants.UNPUBLISHED))
+
+    def test_archiving(self):
+        draft = factories.PollVersionFactory(content__poll=self.poll, content__language="en")
+        draft.archive(self.user)
+
+        summary = self._summary()
+        self.assertIsNone(summary.draft)
+        self.assertEqual(summary.state, constants.ARCHIVED)
+
+    def test_groupings_are_separate(self):
+        factories.PollVersionFactory(content__poll=self.poll, content__language="en")
+        factories.PollVersionFactory(content__poll=self.poll, content__language="fr", state=constants.PUBLISHED)
+
+        self.assertEqual(self._summary("en").state, constants.DRAFT)
+        self.assertEqual(self._summary("fr").state, constants.PUBLISHED)
+
+    @patch("djangocms_versioning.conf.ALLOW_DELETING_VERSIONS", constants.DELETE_ANY)
+    def test_deleting_versions(self):
+        archived = factories.PollVersionFactory(
+            content__poll=self.poll, content__language="en", state=constants.ARCHIVED
+        )
+        draft = factories.PollVersionFactory(content__poll=self.poll, content__language="en")
+        self.assertEqual(self._summary().version_count, 2)
+
+        Version.objects.get(pk=archived.pk).delete()
+        self.assertEqual(self._summary().version_count, 1)
+
+        Version.objects.get(pk=draft.pk).delete()
+        self.assertFalse(VersionSummary.objects.exists())
+
+    @patch("djangocms_versioning.conf.ALLOW_DELETING_VERSIONS", constants.DELETE_ANY)
+    def test_pruning(self):
+        for _ in range(3):
+            factories.PollVersionFactory(content__poll=self.poll, content__language="en", state=constants.ARCHIVED)
+
+        prune_versions(self.versionable, keep=1)
+
+        self.assertEqual(self._summary().version_count, 1)
+
+    def test_check_versions_fix_refreshes_summaries(self):
+        versions = [
+            factories.PollVersionFactory(content__poll=self.poll, content__language="en", state=constants.ARCHIVED)
+            for _ in range(2)
+        ]
+        # Break the invariant without refreshing the summary
+        Version.objects.filter(pk__in=[version.pk for version in versions]).update(state=constants.PUBLISHED)
+        self.assertEqual(self._summary().state, constants.ARCHIVED)
+
+        check_versionable(self.versionable, fix=True)
+
+        summary = self._summary()
+        self.assertEqual((summary.published, summary.state), (versions[1], constants.PUBLISHED))
+        self.assertEqual(summary.version_count, 2)
+
+    @patch("djangocms_versioning.conf.ALLOW_DELETING_VERSIONS", constants.DELETE_ANY)
+    def test_check_versions_fix_refreshes_summaries_of_versions_without_content(self):
+        archived = factories.PollVersionFactory(
+            content__poll=self.poll, content__language="en", state=constants.ARCHIVED
+        )
+        draft = factories.PollVersionFactory(content__poll=self.poll, content__language="en")
+        PollContent._base_manager.filter(pk=draft.object_id)._raw_delete(using="default")
+
+        check_versionable(self.versionable, fix=True)
+
+        summary = self._summary()
+        self.assertIsNone(summary.draft)
+        self.assertEqual((summary.state, summary.version_count), (constants.ARCHIVED, 1))
+        self.assertEqual(Version.objects.get().pk, archived.pk)
+
+    def test_bulk_create_versions_refreshes_summaries(self):
+        poll = Poll.objects.create()
+        for _ in range(2):
+            # Use save NOT objects.create to avoid creating Version object
+            PollContent(poll=poll, language="en").save()
+
+        call_command(
+            "create_versions", userid=self.user.pk, state=constants.DRAFT, bulk=True, batch_size=1, stdout=StringIO()
+        )
+
+        summary = VersionSummary.objects.for_grouping_values(self.versionable, poll=poll, language="en").get()
+        self.assertEqual((summary.state, summary.version_count), (constants.DRAFT, 2))
+
+    def test_not_kept_by_default(self):
+        with patch("djangocms_versioning.conf.VERSION_SUMMARY", False):
+            factories.PollVersionFactory(content__poll=self.poll, content__language="en")
+
+        self.assertFalse(VersionSummary.objects.exists())
+
+    def test_rebuild_command(self):
+        with patch("djangocms_versioning.conf.VERSION_SUMMARY", False):
+            draft = factories.PollVersionFactory(content__poll=self.poll, content__language="en")
+            factories.PollVersionFactory(content__poll=self.poll, content__language="fr", state=constants.ARCHIVED)
+        out = StringIO()
+
+        call_command("rebuild_version_summaries", model=["polls.PollContent"], stdout=out)
+
+        self.assertIn("Rebuilt 2 version summaries of PollContent", out.getvalue())
+        self.assertEqual(self._summary("en").draft, draft)
+        self.assertEqual(self._summary("fr").state, constants.ARCHIVED)
+
+    def test_grouper_admin_reads_summary(self):
+        version = factories.BlogPostVersionFactory(state=constants.PUBLISHED, created_by=self.user)
+        model_admin = admin.site._registry[BlogPost]
+        request = RequestFactory().get("/")
+        request.user = self.get_superuser()
+
+        with self.assertNumQueries(1):
+            with patch("djangocms_versioning.conf.VERSION_SUMMARY", False):
+                expected = model_admin.get_queryset(request).prefetch_related(None).get(pk=version.content.blogpost_id)
+        with self.assertNumQueries(1):
+            obj = model_admin.get_queryset(request).prefetch_related(None).get(pk=version.content.blogpost_id)
+
+        for attr in ("content_created_by", "content_created_by_sort", "content_state", "content_modified"):
+            self.assertEqual(getattr(obj, attr), getattr(expected, attr))
+        self.assertEqual(obj.content_state, constants.PUBLISHED)
+        self.assertEqual(obj.content_created_by, self.user.username)
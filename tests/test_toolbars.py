@@ -4,11 +4,14 @@ from unittest.mock import patch
 
 from cms import __version__
 from cms.cms_toolbars import LANGUAGE_MENU_IDENTIFIER, PlaceholderToolbar
+from cms.models import PageContent
 from cms.test_utils.testcases import CMSTestCase
 from cms.toolbar.utils import get_object_edit_url, get_object_preview_url
 from cms.utils.urlutils import admin_reverse
 from django.contrib.auth.models import Permission
+from django.db import connection
 from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
 from django.utils.text import slugify
 from packaging.version import Version
 
@@ -404,6 +407,34 @@ class VersioningToolbarTestCase(CMSTestCase):
 
         self.assertFalse(toolbar_button_exists("View Published", toolbar.toolbar))
 
+    def test_toolbar_state_loaded_with_one_query_in_edit_mode(self):
+        """The draft, its published sibling and its source are loaded with one query"""
+        user = self.get_superuser()
+        published_version = PageVersionFactory(content__language="en", state=PUBLISHED)
+        PageUrlFactory(
+            page=published_version.content.page,
+            language=published_version.content.language,
+            path=slugify("test_page"),
+            slug=slugify("test_page"),
+        )
+        draft_version = published_version.copy(user)
+        content = PageContent.admin_manager.get(pk=draft_version.object_id)
+        toolbar = get_toolbar(content, user=user, edit_mode=True)
+
+        with CaptureQueriesContext(connection) as ctx:
+            toolbar.post_template_populate()
+
+        version_queries = [
+            query for query in ctx.captured_queries if 'FROM "djangocms_versioning_version"' in query["sql"]
+        ]
+        self.assertEqual(len(version_queries), 1, "\n".join(q["sql"] for q in version_queries))
+        self.assertTrue(toolbar_button_exists("View Published", toolbar.toolbar))
+        versioning_menu = toolbar.toolbar.get_menu(cms_toolbars.VERSIONING_MENU_IDENTIFIER)
+        self.assertIn(
+            f"Compare to {published_version.short_name()}",
+            [item.name for item in versioning_menu.get_items() if hasattr(item, "name")],
+        )
+
     def test_view_published_not_in_toolbar_in_preview_mode_for_draft_page(self):
         """
         The 'View Published' control is only relevant for pages that
@@ -713,6 +744,40 @@ class VersioningPageToolbarTestCase(CMSTestCase):
         self.assertEqual(de_item.url, de_preview_url)
         self.assertEqual(it_item.url, it_preview_url)
 
+    def test_language_menus_load_page_contents_once(self):
+        en_version = PageVersionFactory(content__language="en")
+        page = en_version.content.page
+        de_content = PageContentWithVersionFactory(page=page, language="de", version__state=PUBLISHED)
+        it_content = PageContentWithVersionFactory(page=page, language="it", version__state=ARCHIVED)
+
+        with patch.object(
+            cms_toolbars,
+            "get_latest_admin_viewable_contents",
+            wraps=cms_toolbars.get_latest_admin_viewable_contents,
+        ) as mocked_loader:
+            request = self.get_page_request(
+                page=page,
+                path=get_object_edit_url(en_version.content),
+                user=self.get_superuser(),
+            )
+            request.toolbar.set_object(en_version.content)
+            request.toolbar.populate()
+            request.toolbar.post_template_populate()
+            page_toolbar = next(
+                toolbar for toolbar in request.toolbar.toolbars.values() if isinstance(toolbar, VersioningPageToolbar)
+            )
+            with self.assertNumQueries(0):
+                contents = page_toolbar.get_admin_contents()
+                self.assertEqual(page_toolbar.get_page_content("de"), de_content)
+                self.assertEqual(page.get_admin_content("it"), it_content)
+
+        mocked_loader.assert_called_once()
+        self.assertEqual(contents, {"en": en_version.content, "de": de_content, "it": it_content})
+        language_menu = request.toolbar.get_menu(LANGUAGE_MENU_IDENTIFIER)
+        self.assertEqual(
+            self._get_toolbar_item_by_name(language_menu, "Italiano").url, get_object_preview_url(it_content, "it")
+        )
+
     @override_settings(USE_I18N=False)
     def test_page_toolbar_wo_language_menu(self):
         from django.utils.translation import gettext as _